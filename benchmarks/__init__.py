@@ -0,0 +1 @@
+"""Offline benchmarks for the mybag.aero client and parser."""
@@ -0,0 +1,49 @@
+"""Fixture corpus: anonymised manageLogin responses and a catalog snapshot."""
+
+from __future__ import annotations
+
+from functools import cache
+import json
+from pathlib import Path
+from typing import Any, NamedTuple
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RECORDS_DIR = FIXTURES_DIR / "records"
+
+
+class RecordFixture(NamedTuple):
+    """One recorded WTR_ReadRecordRS response body and the state it must produce."""
+
+    name: str
+    body: bytes
+    expected_state: str
+
+
+@cache
+def load_records() -> dict[str, RecordFixture]:
+    """Return every record fixture by name, in manifest order."""
+    manifest = json.loads((RECORDS_DIR / "manifest.json").read_text())
+    return {
+        name: RecordFixture(name, (RECORDS_DIR / f"{name}.json").read_bytes(), entry["expected_state"])
+        for name, entry in manifest.items()
+    }
+
+
+@cache
+def load_catalog_body() -> bytes:
+    """Return the dynamic-messages catalog snapshot as served by mybag.aero."""
+    return (FIXTURES_DIR / "catalog.json").read_bytes()
+
+
+def load_catalog() -> dict[str, Any]:
+    """Return the ``dynamicMessages`` section of the catalog snapshot."""
+    return json.loads(load_catalog_body())["dynamicMessages"]
+
+
+def multi_bag_body(count: int) -> bytes:
+    """Return the multi-bag record with its bags repeated to ``count`` bags."""
+    response = json.loads(load_records()["multi_bag"].body)
+    delayed_bags = response["WTR_ReadRecordRS"]["WTR_DelayedBagRecReadRS"]["DelayedBagGroup"]["DelayedBags"]
+    template = delayed_bags["DelayedBag"]
+    delayed_bags["DelayedBag"] = [{**template[index % len(template)], "Seq": index + 1} for index in range(count)]
+    return json.dumps(response).encode()
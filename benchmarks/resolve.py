@@ -0,0 +1,55 @@
+"""Reference copy of the per-poll status message resolver, for the catalog microbenchmark.
+
+Before the catalog built its tracing-status index, the client ran this on every
+poll. ``benchmarks.run`` times it against the index lookup on the catalog
+snapshot and checks that both give the same messages.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+
+def resolve_per_poll(
+    bag_status: dict[str, Any], notification: dict[str, Any], tracing_status: str | None
+) -> tuple[list[str] | None, str | None, str | None]:
+    """Resolve one tracing status by scanning its catalog entry, as each poll used to."""
+    if not tracing_status:
+        return None, None, None
+
+    status_entry = bag_status.get(tracing_status)
+    if not isinstance(status_entry, dict):
+        return None, None, None
+
+    open_heads: list[tuple[int, str]] = []
+    for key, value in status_entry.items():
+        if not (key.startswith("BTS_ACCopen_") and key.endswith("_head")):
+            continue
+        if not isinstance(value, str) or not value.strip():
+            continue
+        match = re.search(r"BTS_ACCopen_(\d+)_head", key)
+        order = int(match.group(1)) if match else 999
+        open_heads.append((order, value.strip()))
+
+    open_heads.sort(key=lambda item: item[0])
+    steps: list[str] = []
+    for _, value in open_heads:
+        if value not in steps:
+            steps.append(value)
+
+    current_status_text = status_entry.get("BTS_ACCclose_head")
+    if isinstance(current_status_text, str):
+        current_status_text = current_status_text.strip() or None
+    else:
+        current_status_text = None
+    if not current_status_text and steps:
+        current_status_text = steps[-1]
+
+    status_body = (notification.get(tracing_status, {})).get("delayed", {}).get("body")
+    if isinstance(status_body, str):
+        status_body = status_body.strip() or None
+    else:
+        status_body = None
+
+    return (steps or None), current_status_text, status_body
@@ -0,0 +1,256 @@
+"""Run the offline benchmarks and write machine-readable results.
+
+Usage (from the repository root, in a Home Assistant development environment)::
+
+    python -m benchmarks.run --output benchmarks/results/latest.json
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+Metric names end in their unit. ``*_per_second`` metrics are better when higher,
+every other metric is better when lower. With ``--compare`` the run exits with
+status 1 when a metric regresses by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+import gc
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from aiohttp import ClientSession
+
+from custom_components.mybag_aero_tracker.api import MyBagApiClient, _decode_login_response
+from custom_components.mybag_aero_tracker.catalog import MyBagStatusCatalog, build_status_index
+from custom_components.mybag_aero_tracker.metrics import PHASE_CONNECT
+from custom_components.mybag_aero_tracker.parser import parse_delayed_record
+from custom_components.mybag_aero_tracker.session import create_session
+
+from .corpus import load_catalog, load_records, multi_bag_body
+from .resolve import resolve_per_poll
+from .stub import StubServer, reference_for
+
+DEFAULT_CONCURRENCY = (1, 10, 100, 1000)
+MULTI_BAG_COUNTS = (1, 10, 100)
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "latest.json"
+
+Results = dict[str, float]
+
+
+def bench_parse(repeat: int) -> Results:
+    """Time decoding plus parsing of every record fixture and the memory one call needs."""
+    results: Results = {}
+    for name, fixture in load_records().items():
+
+        def parse(body: bytes = fixture.body) -> Any:
+            delayed_record, _ = _decode_login_response(body)
+            return parse_delayed_record(delayed_record)
+
+        results[f"parse.{name}.median_us"] = _median_call_us(parse, repeat)
+        results[f"parse.{name}.peak_alloc_bytes"] = _peak_alloc_bytes(parse)
+    # Every bag is parsed in the same walk, so the cost should grow with the bags, not faster.
+    for count in MULTI_BAG_COUNTS:
+        body = multi_bag_body(count)
+        results[f"parse.bags_{count}.median_us"] = _median_call_us(
+            lambda body=body: parse_delayed_record(_decode_login_response(body)[0]), repeat
+        )
+    return results
+
+
+def bench_catalog(repeat: int) -> Results:
+    """Time building the catalog index and resolving every tracing status in it.
+
+    ``catalog.resolve_per_poll`` times the resolver each poll ran before the index
+    existed, on the same statuses, for comparison with ``catalog.resolve``.
+    """
+    catalog = load_catalog()
+    bag_status, notification = catalog["bag_status"], catalog["notification_mszs"]
+    index = build_status_index(bag_status, notification)
+    codes = list(index)
+    for code in codes:
+        steps, current_status_text, status_body = resolve_per_poll(bag_status, notification, code)
+        if (tuple(steps) if steps else None, current_status_text, status_body) != index[code]:
+            raise RuntimeError(f"{code}: the index disagrees with the per-poll resolver")
+
+    def resolve_all() -> None:
+        for code in codes:
+            index.get(code)
+
+    def resolve_all_per_poll() -> None:
+        for code in codes:
+            resolve_per_poll(bag_status, notification, code)
+
+    return {
+        "catalog.build_index.median_us": _median_call_us(lambda: build_status_index(bag_status, notification), repeat),
+        "catalog.build_index.peak_alloc_bytes": _peak_alloc_bytes(lambda: build_status_index(bag_status, notification)),
+        "catalog.resolve.median_us": _median_call_us(resolve_all, repeat) / len(codes),
+        "catalog.resolve_per_poll.median_us": _median_call_us(resolve_all_per_poll, repeat) / len(codes),
+    }
+
+
+async def bench_client(repeat: int, concurrency: tuple[int, ...]) -> Results:
+    """Time async_check_status end to end against the local stub.
+
+    The session is the integration's keep-alive pool, sized so every concurrent
+    check can hold a connection. Each fleet size runs a warm-up round first; the
+    measured round reports how many new connections (TLS handshakes against the
+    real host) each check still needed.
+    """
+    results: Results = {}
+    records = list(load_records().values())
+    async with StubServer() as server, create_session(limit_per_host=max(concurrency, default=1), limit=0) as session:
+        catalog = MyBagStatusCatalog(session, url=server.catalog_url)
+        for index, fixture in enumerate(records):
+            client = _client(session, catalog, server, index)
+            status = await client.async_check_status()
+            if status.state != fixture.expected_state:
+                raise RuntimeError(f"{fixture.name}: expected {fixture.expected_state}, got {status.state}")
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await client.async_check_status()
+                timings.append(time.perf_counter() - started)
+            results[f"check.{fixture.name}.median_us"] = statistics.median(timings) * 1e6
+
+        for size in concurrency:
+            clients = [_client(session, catalog, server, index) for index in range(size)]
+            latencies: list[float] = []
+
+            async def timed_check(client: MyBagApiClient, latencies: list[float] = latencies) -> None:
+                started = time.perf_counter()
+                await client.async_check_status()
+                latencies.append(time.perf_counter() - started)
+
+            await asyncio.gather(*(client.async_check_status() for client in clients))
+            connects = _connect_count(clients)
+            started = time.perf_counter()
+            await asyncio.gather(*(timed_check(client) for client in clients))
+            elapsed = time.perf_counter() - started
+            latencies.sort()
+            results[f"fleet.{size}.checks_per_second"] = size / elapsed
+            results[f"fleet.{size}.connections_per_check"] = (_connect_count(clients) - connects) / size
+            results[f"fleet.{size}.p50_ms"] = latencies[len(latencies) // 2] * 1e3
+            results[f"fleet.{size}.p99_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3
+        await catalog.async_close()
+    return results
+
+
+def compare(current: Results, baseline: Results, tolerance: float) -> list[str]:
+    """Return a line per metric that regressed by more than ``tolerance`` (a fraction)."""
+    regressions = []
+    for name, value in current.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = (value - reference) / reference
+        if name.endswith("_per_second"):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{name}: {reference:.3f} -> {value:.3f} ({change:+.0%} worse)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks; return the process exit status."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression as a fraction (default 0.2)")
+    parser.add_argument("--repeat", type=int, default=200, help="iterations per latency measurement")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: tuple(int(part) for part in value.split(",")),
+        default=DEFAULT_CONCURRENCY,
+        help="comma-separated fleet sizes (default 1,10,100,1000)",
+    )
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    results.update(bench_parse(args.repeat))
+    results.update(bench_catalog(args.repeat))
+    results.update(asyncio.run(bench_client(max(1, args.repeat // 10), args.concurrency)))
+    results = {name: round(value, 3) for name, value in results.items()}
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"meta": run_metadata(), "results": results}, indent=2) + "\n")
+    width = max(map(len, results))
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:>12.3f}")
+    print(f"Results written to {args.output}")
+
+    if args.compare is None:
+        return 0
+    regressions = compare(results, json.loads(args.compare.read_text())["results"], args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def _client(session: ClientSession, catalog: MyBagStatusCatalog, server: StubServer, index: int) -> MyBagApiClient:
+    return MyBagApiClient(
+        session,
+        "austrian",
+        reference_for(index),
+        "Doe",
+        "https://mybag.aero",
+        catalog=catalog,
+        api_base_url=server.base_url,
+    )
+
+
+def _connect_count(clients: list[MyBagApiClient]) -> int:
+    return sum(
+        histogram.count for client in clients if (histogram := client.metrics.phases.get(PHASE_CONNECT)) is not None
+    )
+
+
+def _median_call_us(func: Any, repeat: int) -> float:
+    func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def _peak_alloc_bytes(func: Any) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return float(peak - baseline)
+
+
+def run_metadata() -> dict[str, Any]:
+    """Return details about the commit and machine the results come from."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Scale harness: many config entries in one Home Assistant instance against the local stand-in.
+
+Usage (from the repository root, in a Home Assistant development environment)::
+
+    python -m benchmarks.scale --entries 1000 --output benchmarks/results/scale.json
+
+The harness boots a bare Home Assistant core in a temporary config directory, sets
+up the integration pointed at ``benchmarks.stub`` and adds ``--entries`` config
+entries. It reports the setup duration, the RSS growth per entry and the
+event-loop lag (p50/p99) while every entry is refreshed at once. The run exits
+with status 1 when a metric exceeds its threshold (or regresses against
+``--compare`` by more than ``--tolerance``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+from pathlib import Path
+import resource
+import sys
+import tempfile
+import time
+
+from homeassistant import config_entries, loader
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    issue_registry as ir,
+)
+from homeassistant.setup import async_setup_component
+
+from custom_components.mybag_aero_tracker.const import (
+    CONF_AIRLINE,
+    CONF_API_BASE_URL,
+    CONF_DYNAMIC_MESSAGES_URL,
+    CONF_FAMILY_NAME,
+    CONF_MAX_CONCURRENT_CHECKS,
+    CONF_REFERENCE_NUMBER,
+    CONF_REQUEST_BURST,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SCAN_INTERVAL_MINUTES,
+    DOMAIN,
+)
+
+from .run import Results, compare, run_metadata
+from .stub import StubServer, reference_for
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "scale.json"
+
+# Upper bounds for a passing run; generous enough for a loaded CI machine.
+THRESHOLDS: dict[str, float] = {
+    "setup.ms_per_entry": 20.0,
+    "memory.rss_kib_per_entry": 200.0,
+    "storm.loop_lag_p50_ms": 20.0,
+    "storm.loop_lag_p99_ms": 150.0,
+}
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up a task that sleeps for ``interval``."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.samples: list[float] = []
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Return a lag percentile in milliseconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))] * 1000
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+
+async def async_run_scale(entries: int, latency_ms: float, max_concurrent_checks: int) -> Results:
+    """Set up ``entries`` config entries, refresh them all at once and return the metrics."""
+    script = {"default": {"latency": {"distribution": "lognormal", "median_ms": latency_ms, "sigma": 0.5}}}
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(REPO_ROOT / "custom_components", Path(config_dir) / "custom_components")
+        async with StubServer(script) as server:
+            hass = await _async_start_hass(config_dir)
+            try:
+                if not await async_setup_component(
+                    hass,
+                    DOMAIN,
+                    {
+                        DOMAIN: {
+                            CONF_API_BASE_URL: server.base_url,
+                            CONF_DYNAMIC_MESSAGES_URL: server.catalog_url,
+                            CONF_MAX_CONCURRENT_CHECKS: max_concurrent_checks,
+                            CONF_REQUESTS_PER_MINUTE: 6000,
+                            CONF_REQUEST_BURST: 1000,
+                        }
+                    },
+                ):
+                    raise RuntimeError(f"{DOMAIN} could not be set up")
+                return await _async_measure(hass, server, entries)
+            finally:
+                await hass.async_stop(force=True)
+
+
+async def _async_measure(hass: HomeAssistant, server: StubServer, entries: int) -> Results:
+    gc.collect()
+    rss_before = _rss_kib()
+    started = time.perf_counter()
+    await asyncio.gather(*(hass.config_entries.async_add(_config_entry(index)) for index in range(entries)))
+    await hass.async_block_till_done()
+    setup_seconds = time.perf_counter() - started
+    gc.collect()
+    rss_after = _rss_kib()
+
+    if (loaded := len(hass.data.get(DOMAIN, {}))) != entries:
+        raise RuntimeError(f"only {loaded} of {entries} entries were set up")
+
+    logins_before = server.login_requests
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in hass.data[DOMAIN].values()))
+    storm_seconds = time.perf_counter() - started
+    await monitor.async_stop()
+    # A storm answered from cached results would pass the loop-lag thresholds without measuring anything.
+    if (logins := server.login_requests - logins_before) < entries:
+        raise RuntimeError(f"the refresh storm sent only {logins} logins for {entries} entries")
+
+    return {
+        "setup.seconds": setup_seconds,
+        "setup.ms_per_entry": setup_seconds * 1000 / entries,
+        "memory.rss_kib_per_entry": max(0.0, rss_after - rss_before) / entries,
+        "storm.seconds": storm_seconds,
+        "storm.checks_per_second": entries / storm_seconds,
+        "storm.login_requests": logins,
+        "storm.loop_lag_p50_ms": monitor.percentile_ms(0.5),
+        "storm.loop_lag_p99_ms": monitor.percentile_ms(0.99),
+        "storm.loop_lag_max_ms": monitor.percentile_ms(1.0),
+    }
+
+
+async def _async_start_hass(config_dir: str) -> HomeAssistant:
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config.set_time_zone("UTC")
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    await asyncio.gather(ar.async_load(hass), dr.async_load(hass), er.async_load(hass), ir.async_load(hass))
+    hass.state = CoreState.running
+    return hass
+
+
+def _config_entry(index: int) -> config_entries.ConfigEntry:
+    reference_number = reference_for(index)
+    return config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=reference_number,
+        data={
+            CONF_AIRLINE: "austrian",
+            CONF_REFERENCE_NUMBER: reference_number,
+            CONF_FAMILY_NAME: "Doe",
+            CONF_SCAN_INTERVAL_MINUTES: 30,
+        },
+        source=config_entries.SOURCE_USER,
+        unique_id=f"austrian_{reference_number}",
+    )
+
+
+def _rss_kib() -> float:
+    """Return the current resident set size (falls back to the peak outside Linux)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError):
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the scale harness; return the process exit status."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.scale", description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="median stand-in latency")
+    parser.add_argument("--max-concurrent-checks", type=int, default=16)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed regression as a fraction (default 0.5)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    results = asyncio.run(async_run_scale(args.entries, args.latency_ms, args.max_concurrent_checks))
+    results = {name: round(value, 3) for name, value in results.items()}
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    meta = {**run_metadata(), "entries": args.entries, "latency_ms": args.latency_ms}
+    args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+    width = max(map(len, results))
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:>12.3f}")
+    print(f"Results written to {args.output}")
+
+    failures = [
+        f"{name}: {results[name]:.3f} exceeds {limit:.3f}"
+        for name, limit in THRESHOLDS.items()
+        if results.get(name, 0.0) > limit
+    ]
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())["results"]
+        failures += compare({name: results[name] for name in THRESHOLDS if name in results}, baseline, args.tolerance)
+    for line in failures:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Local stand-in for the mybag.aero endpoints, with fault and latency injection.
+
+The server implements ``POST /manageLogin`` and the dynamic-messages catalog with
+the request and response shapes ``MyBagApiClient`` uses, so the client (or a whole
+Home Assistant instance via ``api_base_url`` / ``dynamic_messages_url``) can be
+pointed at it.
+
+Behaviour is scripted per file reference; each request advances that reference
+through its ``outcomes`` list (the last outcome repeats)::
+
+    {
+      "default": {"outcomes": ["ok"], "latency": {"distribution": "lognormal", "median_ms": 150, "sigma": 0.5}},
+      "references": {
+        "VIEOS00001": {"outcomes": [401]},
+        "VIEOS00002": {"outcomes": [503, 503, "ok"], "retry_after": 2},
+        "VIEOS00003": {"outcomes": ["reset", "ok"]},
+        "VIEOS00004": {"outcomes": ["slow_body"], "slow_body": {"chunk_bytes": 512, "chunk_delay_ms": 50}},
+        "VIEOS00005": {"record": "multi_bag", "accepted_validators": [0], "wrong_validator_status": 490}
+      },
+      "catalog": {"outcomes": ["ok"], "latency": {"distribution": "fixed", "ms": 20}}
+    }
+
+Outcomes are ``"ok"``, ``"slow_body"``, ``"reset"`` (the connection is dropped
+without a response) or any HTTP status. Without an explicit ``record`` the fixture
+is picked from the reference number modulo the corpus size, so ``VIEOS00003``
+gets the fourth record. Run it standalone with ``python -m benchmarks.stub``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import random
+from typing import Any
+
+from aiohttp import web
+
+from .corpus import load_catalog_body, load_records
+
+CATALOG_PATH = "/dynamic-messages.json"
+CATALOG_ETAG = '"benchmark-catalog"'
+
+OUTCOME_OK = "ok"
+OUTCOME_SLOW_BODY = "slow_body"
+OUTCOME_RESET = "reset"
+
+
+@dataclass(frozen=True, slots=True)
+class Latency:
+    """Delay distribution applied before a response is sent."""
+
+    distribution: str = "fixed"
+    ms: float = 0.0
+    low_ms: float = 0.0
+    high_ms: float = 0.0
+    median_ms: float = 0.0
+    sigma: float = 0.5
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> Latency:
+        """Build a latency model from its script form."""
+        return cls(**(data or {}))
+
+    def sample(self) -> float:
+        """Return one delay in seconds."""
+        if self.distribution == "uniform":
+            value = random.uniform(self.low_ms, self.high_ms)
+        elif self.distribution == "lognormal":
+            value = random.lognormvariate(0, self.sigma) * self.median_ms
+        elif self.distribution == "exponential":
+            value = random.expovariate(1 / self.ms) if self.ms > 0 else 0.0
+        elif self.distribution == "fixed":
+            value = self.ms
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        return max(0.0, value) / 1000
+
+
+@dataclass(frozen=True, slots=True)
+class Behaviour:
+    """Scripted responses for one file reference (or the catalog)."""
+
+    outcomes: tuple[str | int, ...] = (OUTCOME_OK,)
+    latency: Latency = Latency()
+    record: str | None = None
+    retry_after: float | None = None
+    accepted_validators: frozenset[int] = frozenset({0, 1})
+    wrong_validator_status: int = 489
+    chunk_bytes: int = 1024
+    chunk_delay_ms: float = 100.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None, base: Behaviour | None = None) -> Behaviour:
+        """Build a behaviour from its script form; missing keys come from ``base``."""
+        base = base or cls()
+        data = data or {}
+        slow_body = data.get("slow_body") or {}
+        return cls(
+            outcomes=tuple(data.get("outcomes", base.outcomes)) or (OUTCOME_OK,),
+            latency=Latency.from_dict(data["latency"]) if "latency" in data else base.latency,
+            record=data.get("record", base.record),
+            retry_after=data.get("retry_after", base.retry_after),
+            accepted_validators=frozenset(data.get("accepted_validators", base.accepted_validators)),
+            wrong_validator_status=data.get("wrong_validator_status", base.wrong_validator_status),
+            chunk_bytes=slow_body.get("chunk_bytes", base.chunk_bytes),
+            chunk_delay_ms=slow_body.get("chunk_delay_ms", base.chunk_delay_ms),
+        )
+
+
+@dataclass(slots=True)
+class Script:
+    """Behaviour of the whole server."""
+
+    default: Behaviour = field(default_factory=Behaviour)
+    references: dict[str, Behaviour] = field(default_factory=dict)
+    catalog: Behaviour = field(default_factory=Behaviour)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> Script:
+        """Build a script from its JSON form (see the module docstring)."""
+        data = data or {}
+        default = Behaviour.from_dict(data.get("default"))
+        return cls(
+            default=default,
+            references={
+                reference.upper(): Behaviour.from_dict(behaviour, default)
+                for reference, behaviour in (data.get("references") or {}).items()
+            },
+            catalog=Behaviour.from_dict(data.get("catalog")),
+        )
+
+
+class StubServer:
+    """aiohttp server standing in for wtss-api.mybag.aero and the mybag.aero catalog."""
+
+    def __init__(
+        self,
+        script: Script | dict[str, Any] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.script = script if isinstance(script, Script) else Script.from_dict(script)
+        self._host = host
+        self._requested_port = port
+        self._records = {name: fixture.body for name, fixture in load_records().items()}
+        self._bodies = list(self._records.values())
+        self._progress: Counter[str] = Counter()
+        self._runner: web.AppRunner | None = None
+        self.port = 0
+        self.login_requests = 0
+        self.catalog_requests = 0
+        self.outcomes: Counter[str] = Counter()
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to use as ``api_base_url``."""
+        return f"http://{self._host}:{self.port}"
+
+    @property
+    def catalog_url(self) -> str:
+        """Return the URL to use as ``dynamic_messages_url``."""
+        return f"{self.base_url}{CATALOG_PATH}"
+
+    async def __aenter__(self) -> StubServer:
+        app = web.Application()
+        app.router.add_post("/manageLogin", self._handle_login)
+        app.router.add_get(CATALOG_PATH, self._handle_catalog)
+        self._runner = web.AppRunner(app, access_log=None, handle_signals=False)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._requested_port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _next_outcome(self, key: str, behaviour: Behaviour) -> str | int:
+        step = self._progress[key]
+        self._progress[key] += 1
+        outcome = behaviour.outcomes[min(step, len(behaviour.outcomes) - 1)]
+        self.outcomes[str(outcome)] += 1
+        return outcome
+
+    async def _handle_login(self, request: web.Request) -> web.StreamResponse:
+        self.login_requests += 1
+        try:
+            _, _, encoded = request.headers["Authorization"].partition(" ")
+            reference = str(json.loads(base64.b64decode(encoded))["fileRef"]).upper()
+            validator = (await request.json())["WTR_ReadRecordRQ"]["Validator"]
+        except (KeyError, TypeError, ValueError):
+            return web.Response(status=400, text="malformed manageLogin request")
+
+        behaviour = self.script.references.get(reference, self.script.default)
+        await asyncio.sleep(behaviour.latency.sample())
+        if validator not in behaviour.accepted_validators:
+            self.outcomes[str(behaviour.wrong_validator_status)] += 1
+            return web.json_response({"Msg": "Validation failed"}, status=behaviour.wrong_validator_status)
+        outcome = self._next_outcome(reference, behaviour)
+        return await self._respond(request, outcome, behaviour, lambda: self._record_body(reference, behaviour))
+
+    async def _handle_catalog(self, request: web.Request) -> web.StreamResponse:
+        self.catalog_requests += 1
+        behaviour = self.script.catalog
+        await asyncio.sleep(behaviour.latency.sample())
+        outcome = self._next_outcome(CATALOG_PATH, behaviour)
+        if outcome == OUTCOME_OK and request.headers.get("If-None-Match") == CATALOG_ETAG:
+            return web.Response(status=304)
+        return await self._respond(request, outcome, behaviour, load_catalog_body, {"ETag": CATALOG_ETAG})
+
+    async def _respond(
+        self,
+        request: web.Request,
+        outcome: str | int,
+        behaviour: Behaviour,
+        body: Any,
+        headers: dict[str, str] | None = None,
+    ) -> web.StreamResponse:
+        if outcome == OUTCOME_RESET:
+            if request.transport is not None:
+                request.transport.abort()
+            raise asyncio.CancelledError
+        if outcome == OUTCOME_SLOW_BODY:
+            data = body()
+            response = web.StreamResponse(headers={"Content-Type": "application/json", **(headers or {})})
+            response.content_length = len(data)
+            await response.prepare(request)
+            for start in range(0, len(data), behaviour.chunk_bytes):
+                await response.write(data[start : start + behaviour.chunk_bytes])
+                await asyncio.sleep(behaviour.chunk_delay_ms / 1000)
+            await response.write_eof()
+            return response
+        if outcome == OUTCOME_OK:
+            return web.Response(body=body(), content_type="application/json", headers=headers)
+        status = int(outcome)
+        error_headers = {"Retry-After": f"{behaviour.retry_after:g}"} if behaviour.retry_after is not None else None
+        return web.json_response({"Msg": f"HTTP {status}"}, status=status, headers=error_headers)
+
+    def _record_body(self, reference: str, behaviour: Behaviour) -> bytes:
+        if behaviour.record is not None:
+            return self._records[behaviour.record]
+        try:
+            index = int(reference[5:])
+        except ValueError:
+            index = 0
+        return self._bodies[index % len(self._bodies)]
+
+
+def reference_for(index: int) -> str:
+    """Return the file reference the stub maps to record ``index`` by default."""
+    return f"VIEOS{index:05d}"
+
+
+async def _async_serve(script: Script, host: str, port: int) -> None:
+    async with StubServer(script, host, port) as server:
+        print(f"api_base_url: {server.base_url}")
+        print(f"dynamic_messages_url: {server.catalog_url}", flush=True)
+        await asyncio.Event().wait()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve the stand-in until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stub", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--script", type=Path, help="JSON behaviour script")
+    args = parser.parse_args(argv)
+    script = Script.from_dict(json.loads(args.script.read_text()) if args.script else None)
+    try:
+        asyncio.run(_async_serve(script, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,36 +2,300 @@
 
 from __future__ import annotations
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import asyncio
+from collections import Counter
+import logging
+from typing import Any
+from urllib.parse import urlparse
+
+from aiohttp import ClientSession
+import voluptuous as vol
+
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import ssl as ssl_util
 
 from .api import MyBagApiClient
-from .const import AIRLINE_URLS, CONF_AIRLINE, CONF_FAMILY_NAME, CONF_REFERENCE_NUMBER, CONF_SCAN_INTERVAL_MINUTES, DOMAIN
+from .batch import BatchRow, async_check_rows, parse_batch_rows
+from .catalog import MyBagStatusCatalog
+from .coalesce import RequestCoalescer
+from .const import (
+    AIRLINE_URLS,
+    API_BASE_URL,
+    ATTR_CSV,
+    ATTR_ENTRY_ID,
+    ATTR_ROWS,
+    CATALOG_META_STORAGE_KEY,
+    CATALOG_STORAGE_KEY,
+    CATALOG_STORAGE_VERSION,
+    CONF_AIRLINE,
+    CONF_API_BASE_URL,
+    CONF_DYNAMIC_MESSAGES_URL,
+    CONF_FAMILY_NAME,
+    CONF_MAX_CONCURRENT_CHECKS,
+    CONF_REFERENCE_NUMBER,
+    CONF_REQUEST_BURST,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SCAN_INTERVAL_MINUTES,
+    CONF_TRAFFIC_MAX_MB,
+    CONF_TRAFFIC_MODE,
+    DATA_BREAKERS,
+    DATA_CATALOG,
+    DATA_COALESCER,
+    DATA_CONFIG,
+    DATA_IMPORT_SEEDS,
+    DATA_LIMITER,
+    DATA_SCHEDULER,
+    DATA_SESSION,
+    DATA_STATUS_STORE,
+    DATA_TIMELINE_STORE,
+    DATA_TRAFFIC,
+    DATA_VALIDATORS,
+    DEFAULT_MAX_CONCURRENT_CHECKS,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SCAN_INTERVAL_MINUTES,
+    DEFAULT_TRAFFIC_MAX_MB,
+    DOMAIN,
+    DYNAMIC_MESSAGES_URL,
+    SERVICE_IMPORT,
+    SERVICE_REFRESH,
+    TRAFFIC_DIRECTORY,
+    TRAFFIC_MODE_OFF,
+    TRAFFIC_MODE_RECORD,
+    TRAFFIC_MODE_REPLAY,
+    VALIDATOR_STORAGE_KEY,
+    VALIDATOR_STORAGE_VERSION,
+)
 from .coordinator import MyBagDataUpdateCoordinator
+from .models import BaggageStatus
+from .ratelimit import PRIORITY_USER, TokenBucketLimiter
+from .resilience import CircuitBreakerRegistry
+from .scheduler import MyBagFleetScheduler
+from .session import create_session
+from .state import STATE_ERROR, STATE_NOT_FOUND
+from .status_store import MyBagStatusStore, MyBagTimelineStore
+from .traffic import ReplaySession, TrafficArchive
+from .validator import ValidatorMemory
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN, default={}): vol.Schema(
+            {
+                vol.Optional(CONF_MAX_CONCURRENT_CHECKS, default=DEFAULT_MAX_CONCURRENT_CHECKS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=64)
+                ),
+                vol.Optional(CONF_REQUESTS_PER_MINUTE, default=DEFAULT_REQUESTS_PER_MINUTE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.1, max=6000)
+                ),
+                vol.Optional(CONF_REQUEST_BURST, default=DEFAULT_REQUEST_BURST): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+                # Redirect the integration to a local stand-in, e.g. for load tests.
+                vol.Optional(CONF_API_BASE_URL, default=API_BASE_URL): cv.url,
+                vol.Optional(CONF_DYNAMIC_MESSAGES_URL, default=DYNAMIC_MESSAGES_URL): cv.url,
+                # Capture complete API exchanges for debugging, or serve checks from such a capture.
+                vol.Optional(CONF_TRAFFIC_MODE, default=TRAFFIC_MODE_OFF): vol.In(
+                    [TRAFFIC_MODE_OFF, TRAFFIC_MODE_RECORD, TRAFFIC_MODE_REPLAY]
+                ),
+                vol.Optional(CONF_TRAFFIC_MAX_MB, default=DEFAULT_TRAFFIC_MAX_MB): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+SERVICE_REFRESH_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string])})
+SERVICE_IMPORT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CSV): cv.string,
+            vol.Optional(ATTR_ROWS): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(CONF_SCAN_INTERVAL_MINUTES, default=DEFAULT_SCAN_INTERVAL_MINUTES): vol.All(
+                vol.Coerce(int), vol.Range(min=5, max=720)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_CSV, ATTR_ROWS),
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Store the domain-wide settings from configuration.yaml."""
+    hass.data[DATA_CONFIG] = domain_config = config.get(DOMAIN, {})
+    if (mode := domain_config.get(CONF_TRAFFIC_MODE, TRAFFIC_MODE_OFF)) != TRAFFIC_MODE_OFF:
+        _LOGGER.warning(
+            "Traffic %s mode is on, using %s; recorded exchanges contain personal data",
+            mode,
+            hass.config.path(TRAFFIC_DIRECTORY),
+        )
+
+    async def _async_close_session(event: Event) -> None:
+        if traffic := hass.data.pop(DATA_TRAFFIC, None):
+            await traffic.async_flush()
+        if session := hass.data.pop(DATA_SESSION, None):
+            await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+
+    async def _async_refresh(call: ServiceCall) -> None:
+        coordinators: dict[str, MyBagDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+        entry_ids = call.data.get(ATTR_ENTRY_ID) or list(coordinators)
+        if unknown := [entry_id for entry_id in entry_ids if entry_id not in coordinators]:
+            raise ServiceValidationError(f"No loaded {DOMAIN} entry with ID {', '.join(unknown)}")
+        await asyncio.gather(*(coordinators[entry_id].async_request_refresh() for entry_id in entry_ids))
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, _async_refresh, schema=SERVICE_REFRESH_SCHEMA)
+
+    async def _async_import(call: ServiceCall) -> ServiceResponse:
+        results = await _async_import_rows(
+            hass,
+            [*call.data.get(ATTR_CSV, "").splitlines(), *call.data.get(ATTR_ROWS, [])],
+            call.data[CONF_SCAN_INTERVAL_MINUTES],
+        )
+        return {"results": results, "summary": dict(Counter(result["result"] for result in results))}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT,
+        _async_import,
+        schema=SERVICE_IMPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
+
+
+async def _async_import_rows(hass: HomeAssistant, lines: list[str], interval_minutes: int) -> list[dict[str, Any]]:
+    """Check import rows concurrently and create an entry for every file that was found.
+
+    Rows are checked at most max_concurrent_checks at a time through the shared
+    request budget. Files that are not found or could not be checked are reported
+    and left out; the others are created together, each seeded with the status
+    fetched here so its setup makes no request of its own.
+    """
+    try:
+        rows, row_errors = parse_batch_rows(lines)
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+
+    results: list[dict[str, Any]] = [
+        {"line": row_error.line, "input": row_error.text, "result": "invalid", "message": row_error.error}
+        for row_error in row_errors
+    ]
+    configured = {entry.unique_id: entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)}
+    to_check: list[BatchRow] = []
+    for row in rows:
+        if (entry_id := configured.get(f"{row.airline}_{row.reference_number}")) is not None:
+            results.append({**_import_result(row, "already_configured"), ATTR_ENTRY_ID: entry_id})
+        else:
+            to_check.append(row)
+
+    async def _async_check(row: BatchRow) -> BaggageStatus:
+        client = _async_create_client(hass, row.airline, row.reference_number, row.family_name)
+        return await client.async_check_status(priority=PRIORITY_USER)
+
+    found: list[tuple[BatchRow, BaggageStatus]] = []
+    concurrency = hass.data.get(DATA_CONFIG, {}).get(CONF_MAX_CONCURRENT_CHECKS, DEFAULT_MAX_CONCURRENT_CHECKS)
+    async for row, status in async_check_rows(to_check, _async_check, concurrency):
+        if status.state in (STATE_NOT_FOUND, STATE_ERROR):
+            results.append({**_import_result(row, status.state), "message": status.message})
+        else:
+            found.append((row, status))
+
+    # Seeds are keyed by unique ID and shared with overlapping imports; each call removes only its own.
+    own_seeds = {f"{row.airline}_{row.reference_number}": status for row, status in found}
+    seeds: dict[str, BaggageStatus] = hass.data.setdefault(DATA_IMPORT_SEEDS, {})
+    seeds.update(own_seeds)
+    try:
+        flows = await asyncio.gather(
+            *(
+                hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": SOURCE_IMPORT},
+                    data={
+                        CONF_AIRLINE: row.airline,
+                        CONF_REFERENCE_NUMBER: row.reference_number,
+                        CONF_FAMILY_NAME: row.family_name,
+                        CONF_SCAN_INTERVAL_MINUTES: interval_minutes,
+                    },
+                )
+                for row, _ in found
+            )
+        )
+    finally:
+        # Setup consumes its seed; drop those of flows that did not create an entry.
+        for unique_id, status in own_seeds.items():
+            if seeds.get(unique_id) is status:
+                del seeds[unique_id]
+        if not seeds:
+            hass.data.pop(DATA_IMPORT_SEEDS, None)
+
+    for (row, status), flow in zip(found, flows):
+        if flow["type"] == FlowResultType.CREATE_ENTRY:
+            entry_id = flow["result"].entry_id
+            results.append({**_import_result(row, "created"), ATTR_ENTRY_ID: entry_id, "state": status.state})
+        else:
+            results.append(_import_result(row, flow.get("reason", "not_created")))
+
+    if not hass.data.get(DOMAIN):
+        # Nothing was set up; the helpers created for the checks are not needed.
+        await _async_release_shared(hass)
+    results.sort(key=lambda result: result["line"])
+    _LOGGER.info(
+        "Imported %d of %d rows", sum(result["result"] == "created" for result in results), len(results)
+    )
+    return results
+
+
+def _import_result(row: BatchRow, result: str) -> dict[str, Any]:
+    return {"line": row.line, CONF_AIRLINE: row.airline, CONF_REFERENCE_NUMBER: row.reference_number, "result": result}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up MyBag Tracker from a config entry."""
-    airline = entry.data[CONF_AIRLINE]
-    reference_number = entry.data[CONF_REFERENCE_NUMBER]
-    family_name = entry.data[CONF_FAMILY_NAME]
     interval_minutes = entry.options.get(CONF_SCAN_INTERVAL_MINUTES, entry.data[CONF_SCAN_INTERVAL_MINUTES])
-    session = async_get_clientsession(hass)
-
-    client = MyBagApiClient(
-        session=session,
-        airline=airline,
-        reference_number=reference_number,
-        family_name=family_name,
-        url=AIRLINE_URLS[airline],
+    client = _async_create_client(
+        hass, entry.data[CONF_AIRLINE], entry.data[CONF_REFERENCE_NUMBER], entry.data[CONF_FAMILY_NAME]
     )
 
-    coordinator = MyBagDataUpdateCoordinator(hass, client, interval_minutes)
-    await coordinator.async_config_entry_first_refresh()
+    status_store = await _async_get_status_store(hass)
+    coordinator = MyBagDataUpdateCoordinator(
+        hass,
+        client,
+        interval_minutes,
+        _async_get_scheduler(hass),
+        entry.entry_id,
+        status_store,
+        await _async_get_timeline_store(hass),
+    )
+    entry.async_on_unload(coordinator.async_unregister)
+    if (seeded := hass.data.get(DATA_IMPORT_SEEDS, {}).pop(entry.unique_id, None)) is not None:
+        # Checked by the import service moments ago; start from that instead of asking again.
+        status_store.async_save_status(entry.entry_id, seeded)
+    if (restored := status_store.get(entry.entry_id)) is not None:
+        # Entities come up with the last known status; its poll decision schedules the next check.
+        coordinator.async_restore(restored)
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -50,4 +314,158 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            await _async_release_shared(hass)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the saved status, timeline and validator memory of a removed entry."""
+    status_store = await _async_get_status_store(hass)
+    status_store.async_remove(entry.entry_id)
+    timeline_store = await _async_get_timeline_store(hass)
+    timeline_store.async_remove(entry.entry_id)
+    await _async_get_validator_memory(hass).async_forget(entry.data[CONF_AIRLINE], entry.data[CONF_REFERENCE_NUMBER])
+
+
+async def _async_release_shared(hass: HomeAssistant) -> None:
+    """Tear down domain-level helpers once the last entry is gone."""
+    if scheduler := hass.data.pop(DATA_SCHEDULER, None):
+        await scheduler.async_shutdown()
+    if catalog := hass.data.pop(DATA_CATALOG, None):
+        await catalog.async_close()
+    if validators := hass.data.pop(DATA_VALIDATORS, None):
+        await validators.async_flush()
+    hass.data.pop(DATA_BREAKERS, None)
+    hass.data.pop(DATA_LIMITER, None)
+    hass.data.pop(DATA_COALESCER, None)
+    if traffic := hass.data.pop(DATA_TRAFFIC, None):
+        await traffic.async_flush()
+    if session := hass.data.pop(DATA_SESSION, None):
+        await session.close()
+
+
+@callback
+def _async_create_client(
+    hass: HomeAssistant, airline: str, reference_number: str, family_name: str
+) -> MyBagApiClient:
+    """Return an API client for one file, wired to the integration's shared helpers."""
+    api_base_url = hass.data.get(DATA_CONFIG, {}).get(CONF_API_BASE_URL, API_BASE_URL)
+    return MyBagApiClient(
+        session=_async_get_session(hass),
+        airline=airline,
+        reference_number=reference_number,
+        family_name=family_name,
+        url=AIRLINE_URLS[airline],
+        catalog=_async_get_catalog(hass),
+        validators=_async_get_validator_memory(hass),
+        breaker=hass.data.setdefault(DATA_BREAKERS, CircuitBreakerRegistry()).get(urlparse(api_base_url).netloc),
+        limiter=_async_get_limiter(hass),
+        api_base_url=api_base_url,
+        traffic=_async_get_traffic(hass),
+        coalescer=hass.data.setdefault(DATA_COALESCER, RequestCoalescer()),
+    )
+
+
+@callback
+def _async_get_catalog(hass: HomeAssistant) -> MyBagStatusCatalog:
+    """Return the dynamic-messages catalog shared by all config entries."""
+    catalog: MyBagStatusCatalog | None = hass.data.get(DATA_CATALOG)
+    if catalog is None:
+        catalog = MyBagStatusCatalog(
+            _async_get_session(hass),
+            url=hass.data.get(DATA_CONFIG, {}).get(CONF_DYNAMIC_MESSAGES_URL, DYNAMIC_MESSAGES_URL),
+            store=Store(hass, CATALOG_STORAGE_VERSION, CATALOG_STORAGE_KEY),
+            meta_store=Store(hass, CATALOG_STORAGE_VERSION, CATALOG_META_STORAGE_KEY),
+            limiter=_async_get_limiter(hass),
+            traffic=_async_get_traffic(hass),
+        )
+        hass.data[DATA_CATALOG] = catalog
+    return catalog
+
+
+async def _async_get_status_store(hass: HomeAssistant) -> MyBagStatusStore:
+    """Return the loaded store of last known statuses."""
+    status_store: MyBagStatusStore | None = hass.data.get(DATA_STATUS_STORE)
+    if status_store is None:
+        status_store = hass.data[DATA_STATUS_STORE] = MyBagStatusStore(hass)
+    await status_store.async_load()
+    return status_store
+
+
+async def _async_get_timeline_store(hass: HomeAssistant) -> MyBagTimelineStore:
+    """Return the loaded store of transition timelines."""
+    timeline_store: MyBagTimelineStore | None = hass.data.get(DATA_TIMELINE_STORE)
+    if timeline_store is None:
+        timeline_store = hass.data[DATA_TIMELINE_STORE] = MyBagTimelineStore(hass)
+    await timeline_store.async_load()
+    return timeline_store
+
+
+@callback
+def _async_get_session(hass: HomeAssistant) -> ClientSession:
+    """Return the keep-alive session shared by every request of the integration."""
+    session: ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is None:
+        config = hass.data.get(DATA_CONFIG, {})
+        if config.get(CONF_TRAFFIC_MODE) == TRAFFIC_MODE_REPLAY:
+            # Duck-typed stand-in: answers from the recorded archive, never touches the network.
+            session = ReplaySession(hass.config.path(TRAFFIC_DIRECTORY))  # type: ignore[assignment]
+        else:
+            session = create_session(
+                limit_per_host=config.get(CONF_MAX_CONCURRENT_CHECKS, DEFAULT_MAX_CONCURRENT_CHECKS),
+                ssl=ssl_util.get_default_context(),
+            )
+        hass.data[DATA_SESSION] = session
+    return session
+
+
+@callback
+def _async_get_traffic(hass: HomeAssistant) -> TrafficArchive | None:
+    """Return the traffic archive when record mode is on."""
+    config = hass.data.get(DATA_CONFIG, {})
+    if config.get(CONF_TRAFFIC_MODE) != TRAFFIC_MODE_RECORD:
+        return None
+    traffic: TrafficArchive | None = hass.data.get(DATA_TRAFFIC)
+    if traffic is None:
+        traffic = TrafficArchive(
+            hass.config.path(TRAFFIC_DIRECTORY),
+            max_bytes=config.get(CONF_TRAFFIC_MAX_MB, DEFAULT_TRAFFIC_MAX_MB) * 1024 * 1024,
+        )
+        hass.data[DATA_TRAFFIC] = traffic
+    return traffic
+
+
+@callback
+def _async_get_limiter(hass: HomeAssistant) -> TokenBucketLimiter:
+    """Return the request budget shared by every outbound request."""
+    limiter: TokenBucketLimiter | None = hass.data.get(DATA_LIMITER)
+    if limiter is None:
+        config = hass.data.get(DATA_CONFIG, {})
+        limiter = TokenBucketLimiter(
+            config.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE),
+            config.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+        )
+        hass.data[DATA_LIMITER] = limiter
+    return limiter
+
+
+@callback
+def _async_get_validator_memory(hass: HomeAssistant) -> ValidatorMemory:
+    """Return the validator memory shared by all config entries."""
+    validators: ValidatorMemory | None = hass.data.get(DATA_VALIDATORS)
+    if validators is None:
+        validators = ValidatorMemory(Store(hass, VALIDATOR_STORAGE_VERSION, VALIDATOR_STORAGE_KEY))
+        hass.data[DATA_VALIDATORS] = validators
+    return validators
+
+
+@callback
+def _async_get_scheduler(hass: HomeAssistant) -> MyBagFleetScheduler:
+    """Return the scheduler that polls all config entries."""
+    scheduler: MyBagFleetScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        config = hass.data.get(DATA_CONFIG, {})
+        scheduler = MyBagFleetScheduler(config.get(CONF_MAX_CONCURRENT_CHECKS, DEFAULT_MAX_CONCURRENT_CHECKS))
+        hass.data[DATA_SCHEDULER] = scheduler
+    return scheduler
@@ -2,15 +2,54 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import logging
 import re
+import time
 from datetime import UTC, datetime
+from typing import Any, TypeVar
+from urllib.parse import urlparse
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - Home Assistant always ships orjson
+    orjson = None
 
 from . import const as integration_const
+from .catalog import NO_STATUS_MESSAGES, MyBagStatusCatalog, StatusMessages
+from .coalesce import RequestCoalescer
+from .metrics import PHASE_BODY, PHASE_PARSE, PHASE_TTFB, CheckMetrics
 from .models import BaggageStatus
+from .parser import BagRecord, parse_delayed_record
+from .ratelimit import PRIORITY_BACKGROUND, TokenBucketLimiter
+from .resilience import (
+    BREAKER_CLOSED,
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+)
+from .state import (
+    STATE_DELIVERED,
+    STATE_ERROR,
+    STATE_SEARCHING,
+    classify_text,
+    most_advanced,
+)
+from .traffic import TrafficArchive
+from .validator import ValidatorMemory
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_FILE_REFERENCE_RE = re.compile(r"([A-Z]{3})([A-Z0-9]{2})([A-Z0-9]+)")
 
 
 class MyBagApiClient:
@@ -23,448 +62,358 @@ class MyBagApiClient:
         reference_number: str,
         family_name: str,
         url: str,
+        catalog: MyBagStatusCatalog | None = None,
+        validators: ValidatorMemory | None = None,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+        limiter: TokenBucketLimiter | None = None,
+        api_base_url: str | None = None,
+        traffic: TrafficArchive | None = None,
+        coalescer: RequestCoalescer[BaggageStatus] | None = None,
     ) -> None:
         self._session = session
         self._airline = airline
         self._reference_number = reference_number.strip().upper()
         self._family_name = family_name.strip().upper()
         self._url = url
-        self._bag_status_catalog: dict[str, dict] | None = None
-        self._notification_catalog: dict[str, dict] | None = None
+        api_base_url = api_base_url or API_BASE_URL
+        self._login_url = f"{api_base_url.rstrip('/')}{MANAGE_LOGIN_ENDPOINT}"
+        # Shared per Home Assistant instance when provided; standalone clients keep their own.
+        self._catalog = catalog or MyBagStatusCatalog(session)
+        self._validators = validators or ValidatorMemory()
+        self._breaker = breaker or CircuitBreaker(urlparse(api_base_url).netloc)
+        self._retry = retry or RetryPolicy()
+        self._limiter = limiter
+        self._traffic = traffic
+        self._coalescer = coalescer
+        self._last_good: BaggageStatus | None = None
+        self.login_requests = 0
+        self.http_retries = 0
+        self.validator_retries = 0
+        self.last_validator: int | None = None
+        self.last_rate_limit_wait = 0.0
+        self.metrics = CheckMetrics()
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the breaker guarding the API host."""
+        return self._breaker
+
+    def restore_status(self, status: BaggageStatus) -> None:
+        """Seed the last good status, e.g. from storage after a restart."""
+        if status.state != STATE_ERROR:
+            self._last_good = status
+
+    async def async_check_status(self, *, priority: int = PRIORITY_BACKGROUND) -> BaggageStatus:
+        """Check baggage status via HTTP APIs.
+
+        ``priority`` selects the rate-limiter lane used for the requests of this check.
+        With a coalescer, clients of the same file share one in-flight check.
+        """
+        if self._coalescer is None:
+            return await self._async_check(priority)
+        status = await self._coalescer.async_run(
+            (self._airline, self._reference_number, self._family_name), lambda: self._async_check(priority)
+        )
+        if status.state != STATE_ERROR:
+            self._last_good = status
+        return status
 
-    async def async_check_status(self) -> BaggageStatus:
-        """Check baggage status via HTTP APIs."""
+    async def _async_check(self, priority: int) -> BaggageStatus:
+        started = time.perf_counter()
         try:
-            station_code, airline_code, short_reference = self._parse_file_reference(self._reference_number)
-            expected_airline = AIRLINE_CODES[self._airline]
-            if airline_code != expected_airline:
-                return self._error_status(
-                    f"Reference '{self._reference_number}' is for airline code {airline_code}, "
-                    f"but selected airline expects {expected_airline}."
-                )
+            status = await self._async_fetch_status(priority)
+        except CircuitOpenError:
+            self.metrics.record_error("circuit_open")
+            # The API host is failing for everyone; serve the last good answer instead of piling on.
+            status = self._last_good or self._error_status(
+                "mybag API is unavailable, checks are paused by the circuit breaker."
+            )
+            failed = True
+        except Exception as err:
+            self.metrics.record_error("exception")
+            status = self._error_status(f"Check failed: {err}")
+            failed = True
+        else:
+            failed = status.state == STATE_ERROR
+            if not failed:
+                self._last_good = status
+        self.metrics.record_check(time.perf_counter() - started, failed)
+        return status
+
+    async def _async_fetch_status(self, priority: int) -> BaggageStatus:
+        station_code, airline_code, short_reference = self._parse_file_reference(self._reference_number)
+        expected_airline = AIRLINE_CODES[self._airline]
+        if airline_code != expected_airline:
+            return self._error_status(
+                f"Reference '{self._reference_number}' is for airline code {airline_code}, "
+                f"but selected airline expects {expected_airline}."
+            )
 
-            auth_payload = {
-                "fileRef": self._reference_number,
-                "lastName": self._family_name,
-                "epic": "DELAYED",
-                "airline": airline_code,
-            }
-            auth_encoded = base64.b64encode(json.dumps(auth_payload, separators=(",", ":")).encode()).decode()
-
-            headers = {
-                "Accept": "application/json, text/plain, */*",
-                "Content-Type": "application/json",
-                "X-Api-Key": API_KEY,
-                "Authorization": f"{airline_code} {auth_encoded}",
-                "User-Agent": USER_AGENT,
-            }
-            response_status = 0
-            response_text = ""
-            for validator in (1, 0):
-                payload = {
-                    "WTR_ReadRecordRQ": {
-                        "RecordID": {
-                            "RecordType": "DELAYED",
-                            "RecordReference": {
-                                "ReferenceNumber": short_reference,
-                                "StationCode": station_code,
-                                "AirlineCode": airline_code,
-                                "LastName": self._family_name,
-                            },
+        auth_payload = {
+            "fileRef": self._reference_number,
+            "lastName": self._family_name,
+            "epic": "DELAYED",
+            "airline": airline_code,
+        }
+        auth_encoded = base64.b64encode(json.dumps(auth_payload, separators=(",", ":")).encode()).decode()
+
+        headers = {
+            "Accept": "application/json, text/plain, */*",
+            "Content-Type": "application/json",
+            "X-Api-Key": API_KEY,
+            "Authorization": f"{airline_code} {auth_encoded}",
+            "User-Agent": USER_AGENT,
+        }
+        response_status = 0
+        response_body = b""
+        validator_order = await self._validators.async_order(self._airline, self._reference_number)
+        for validator in validator_order:
+            payload = {
+                "WTR_ReadRecordRQ": {
+                    "RecordID": {
+                        "RecordType": "DELAYED",
+                        "RecordReference": {
+                            "ReferenceNumber": short_reference,
+                            "StationCode": station_code,
+                            "AirlineCode": airline_code,
+                            "LastName": self._family_name,
                         },
-                        "AgentID": "GUEST",
-                        "Version": 0.1,
-                        "Validator": validator,
-                        "LoginAfterTimeInDays": 21,
-                        "captchaResponse": "",
-                    }
+                    },
+                    "AgentID": "GUEST",
+                    "Version": 0.1,
+                    "Validator": validator,
+                    "LoginAfterTimeInDays": 21,
+                    "captchaResponse": "",
                 }
+            }
 
-                async with self._session.post(
-                    f"{API_BASE_URL}{MANAGE_LOGIN_ENDPOINT}",
-                    json=payload,
-                    headers=headers,
-                ) as response:
-                    response_text = await response.text()
-                    response_status = response.status
-
-                # 200 is success.
-                if response_status == 200:
-                    break
-                # 401 is a hard "not found", no need to retry.
-                if response_status == 401:
-                    return BaggageStatus(
-                        state="not_found",
-                        checked_at=datetime.now(UTC),
-                        airline=self._airline,
-                        reference_number=self._reference_number,
-                        family_name=self._family_name,
-                        url=self._url,
-                        message="No record found for reference number and family name.",
-                    )
-                # 489/490/492 can happen based on validator behavior; try the fallback validator.
-                if response_status not in (489, 490, 492):
-                    break
-
-            if response_status != 200:
-                return self._error_status(
-                    f"mybag API returned HTTP {response_status}: {response_text[:300]}"
+            response_status, response_body = await self._async_post_login(payload, headers, priority)
+            self.login_requests += 1
+            if validator != validator_order[0]:
+                self.validator_retries += 1
+
+            # 200 is success.
+            if response_status == 200:
+                self.last_validator = validator
+                self._validators.remember(self._airline, self._reference_number, validator)
+                break
+            # 401 is a hard "not found", no need to retry.
+            if response_status == 401:
+                return BaggageStatus(
+                    state="not_found",
+                    checked_at=datetime.now(UTC),
+                    airline=self._airline,
+                    reference_number=self._reference_number,
+                    family_name=self._family_name,
+                    url=self._url,
+                    message="No record found for reference number and family name.",
                 )
+            # 489/490/492 can happen based on validator behavior; try the fallback validator.
+            if response_status not in (489, 490, 492):
+                break
 
-            response_json = json.loads(response_text)
-            delayed_record = response_json.get("WTR_ReadRecordRS", {}).get("WTR_DelayedBagRecReadRS")
-            if not isinstance(delayed_record, dict):
-                msg = response_json.get("Msg") or response_json.get("message") or "Unexpected API response format."
-                return self._error_status(msg)
-
-            delayed_group = delayed_record.get("DelayedBagGroup", {})
-            delayed_bags = delayed_group.get("DelayedBags", {})
-            bag_items = delayed_bags.get("DelayedBag", []) or []
-
-            tracing_statuses: list[str] = []
-            for item in bag_items:
-                status = item.get("tracingStatus")
-                if isinstance(status, str) and status.strip():
-                    tracing_statuses.append(status.strip())
-            primary_tracing_status = tracing_statuses[0] if tracing_statuses else None
-            status_steps, current_status_text, status_body = await self._resolve_status_messages(
-                primary_tracing_status
+        if response_status != 200:
+            return self._error_status(
+                f"mybag API returned HTTP {response_status}: {_excerpt(response_body, 300)}"
             )
 
-            no_of_bags_updated = delayed_bags.get("noOfBagsUpdated", 0)
-            if not isinstance(no_of_bags_updated, int):
-                try:
-                    no_of_bags_updated = int(no_of_bags_updated)
-                except (TypeError, ValueError):
-                    no_of_bags_updated = 0
+        raw_excerpt = _excerpt(response_body, 1000) if _LOGGER.isEnabledFor(logging.DEBUG) else None
+        parse_started = time.perf_counter()
+        delayed_record, msg = _decode_login_response(response_body)
+        del response_body
+        if delayed_record is None:
+            self.metrics.record_error("unexpected_response")
+            return self._error_status(msg or "Unexpected API response format.")
+
+        record = parse_delayed_record(delayed_record)
+        self.metrics.record_phase(PHASE_PARSE, time.perf_counter() - parse_started)
+        # Unchanged sub-objects are taken over from the previous status instead of keeping copies.
+        previous = self._last_good
+        tracing_statuses = _reuse(previous and previous.tracing_statuses, record.tracing_statuses)
+        primary_tracing_status = tracing_statuses[0] if tracing_statuses else None
+        status_steps, current_status_text, status_body = await self._resolve_status_messages(
+            primary_tracing_status, priority
+        )
 
-            is_searching = self._is_searching_state(no_of_bags_updated, tracing_statuses)
+        no_of_bags_updated = record.no_of_bags_updated
+        is_searching = self._is_searching_state(no_of_bags_updated, tracing_statuses)
 
-            first_bag = bag_items[0] if bag_items else {}
-            bag_title = self._build_bag_title(first_bag)
-            delivery_details = self._extract_delivery_details(delayed_record)
+        first_bag = record.bags[0] if record.bags else None
+        bag_title = first_bag.title if first_bag else None
+        delivery_details = _reuse(previous and previous.delivery_details, record.delivery_details)
 
-            headline = (
-                SEARCHING_TEXT
-                if is_searching
-                else current_status_text or "BAGGAGE STATUS UPDATED"
-            )
-            details = (
-                "Please check back later"
-                if is_searching
-                else status_body or "Status changed from SEARCHING FOR YOUR BAGGAGE"
-            )
-            message = (
-                "Still searching for your baggage."
-                if is_searching
-                else status_body or "Good news: baggage status changed."
-            )
-            state = self._derive_state(
-                no_of_bags_updated=no_of_bags_updated,
-                tracing_statuses=tracing_statuses,
-                current_status_text=current_status_text,
-                status_body=status_body,
-                delivery_details=delivery_details,
-            )
+        headline = (
+            SEARCHING_TEXT
+            if is_searching
+            else current_status_text or "BAGGAGE STATUS UPDATED"
+        )
+        details = (
+            "Please check back later"
+            if is_searching
+            else status_body or "Status changed from SEARCHING FOR YOUR BAGGAGE"
+        )
+        message = (
+            "Still searching for your baggage."
+            if is_searching
+            else status_body or "Good news: baggage status changed."
+        )
+        state = self._derive_state(
+            no_of_bags_updated=no_of_bags_updated,
+            tracing_statuses=tracing_statuses,
+            primary_tracing_status=primary_tracing_status,
+            current_status_text=current_status_text,
+            status_body=status_body,
+            delivery_state=first_bag.delivery_state if first_bag else None,
+        )
 
-            return BaggageStatus(
-                state=state,
-                checked_at=datetime.now(UTC),
-                airline=self._airline,
-                reference_number=self._reference_number,
-                family_name=self._family_name,
-                url=self._url,
-                message=message,
-                bag_title=bag_title,
-                headline=headline,
-                details=details,
-                tracing_statuses=tracing_statuses,
-                primary_tracing_status=primary_tracing_status,
-                status_steps=status_steps,
-                current_status_text=current_status_text,
-                status_body=status_body,
-                delivery_details=delivery_details,
-                no_of_bags_updated=no_of_bags_updated,
-                record_status=delayed_record.get("RecordStatus"),
-                raw_excerpt=response_text[:1000],
-            )
-        except Exception as err:
-            return self._error_status(f"Check failed: {err}")
+        return BaggageStatus(
+            state=state,
+            checked_at=datetime.now(UTC),
+            airline=self._airline,
+            reference_number=self._reference_number,
+            family_name=self._family_name,
+            url=self._url,
+            message=message,
+            bag_title=bag_title,
+            headline=headline,
+            details=details,
+            tracing_statuses=tracing_statuses,
+            primary_tracing_status=primary_tracing_status,
+            status_steps=status_steps,
+            current_status_text=current_status_text,
+            status_body=status_body,
+            delivery_details=delivery_details,
+            bags=_reuse(previous and previous.bags, tuple(self._describe_bag(bag) for bag in record.bags) or None),
+            no_of_bags_updated=no_of_bags_updated,
+            record_status=record.record_status,
+            raw_excerpt=raw_excerpt,
+        )
+
+    async def _async_post_login(
+        self, payload: dict[str, Any], headers: dict[str, str], priority: int
+    ) -> tuple[int, bytes]:
+        """POST to manageLogin with jittered backoff on transient failures, guarded by the breaker."""
+        attempt = 0
+        while True:
+            if self._limiter is not None:
+                self.last_rate_limit_wait = await self._limiter.async_acquire(priority)
+            if not self._breaker.allow_request():
+                raise CircuitOpenError
+            retry_after: float | None = None
+            try:
+                sent = time.perf_counter()
+                async with self._session.post(
+                    self._login_url,
+                    json=payload,
+                    headers=headers,
+                    trace_request_ctx=self.metrics,
+                ) as response:
+                    headers_received = time.perf_counter()
+                    response_body = await response.read()
+                    self.metrics.record_phase(PHASE_TTFB, headers_received - sent)
+                    self.metrics.record_phase(PHASE_BODY, time.perf_counter() - headers_received)
+                    response_status = response.status
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if self._traffic is not None:
+                        self._traffic.record(
+                            "POST", self._login_url, payload, response_status, response.headers, response_body
+                        )
+            except (ClientError, TimeoutError) as err:
+                self.metrics.record_error("timeout" if isinstance(err, TimeoutError) else "client_error")
+                if not self._record_failed_attempt(attempt):
+                    raise
+                _LOGGER.debug("manageLogin request failed (%s), retrying", err)
+            except BaseException:
+                self._breaker.release_probe()
+                raise
+            else:
+                if response_status >= 400:
+                    self.metrics.record_error(f"http_{response_status}")
+                if response_status not in RETRYABLE_STATUSES:
+                    self._breaker.record_success()
+                    return response_status, response_body
+                if retry_after is not None and retry_after > self._retry.max_delay:
+                    # The server asks for a longer pause than we are willing to wait inline.
+                    self._breaker.record_failure(cooldown=retry_after)
+                    return response_status, response_body
+                if not self._record_failed_attempt(attempt):
+                    return response_status, response_body
+            await asyncio.sleep(self._retry.delay(attempt, retry_after))
+            attempt += 1
+            self.http_retries += 1
+
+    def _record_failed_attempt(self, attempt: int) -> bool:
+        """Count a failed attempt against the breaker; return whether to retry.
+
+        A check counts as one failure, once its retries are used up, so a single
+        failing file cannot open the shared breaker for everyone. A failed
+        half-open probe re-opens it at once.
+        """
+        retry = attempt < self._retry.attempts
+        if not retry or self._breaker.state != BREAKER_CLOSED:
+            self._breaker.record_failure()
+        return retry
 
     def _derive_state(
         self,
         *,
         no_of_bags_updated: int,
-        tracing_statuses: list[str],
+        tracing_statuses: tuple[str, ...],
+        primary_tracing_status: str | None,
         current_status_text: str | None,
         status_body: str | None,
-        delivery_details: dict | None,
+        delivery_state: str | None,
     ) -> str:
         if self._is_searching_state(no_of_bags_updated, tracing_statuses):
-            return "searching"
-
-        # Delivery timestamp is the strongest signal for terminal state.
-        if (delivery_details or {}).get("delivered_datetime_local"):
-            return "delivered"
+            return STATE_SEARCHING
+
+        # Delivery timestamps are the strongest signal for terminal state.
+        if delivery_state == STATE_DELIVERED:
+            return delivery_state
+
+        tracing_state = self._catalog.state_for(primary_tracing_status) if primary_tracing_status else None
+        if tracing_state is None:
+            # Unknown code (or no catalog yet): fall back to the text heuristics.
+            tracing_state = classify_text(current_status_text, status_body)
+        return most_advanced(tracing_state, delivery_state) or tracing_state
+
+    def _describe_bag(self, bag: BagRecord) -> dict:
+        """Return per-bag attributes, including the state of that bag alone."""
+        description = bag.as_dict()
+        tracing_statuses = (bag.tracing_status,) if bag.tracing_status else ()
+        if bag.delivery_state is None and self._is_searching_state(0, tracing_statuses):
+            description["state"] = STATE_SEARCHING
+        else:
+            _, current_status_text, status_body = (
+                self._catalog.resolve(bag.tracing_status) if bag.tracing_status else NO_STATUS_MESSAGES
+            )
+            description["state"] = self._derive_state(
+                no_of_bags_updated=1,
+                tracing_statuses=tracing_statuses,
+                primary_tracing_status=bag.tracing_status,
+                current_status_text=current_status_text,
+                status_body=status_body,
+                delivery_state=bag.delivery_state,
+            )
+        return description
 
-        text = " ".join(
-            [part.strip().upper() for part in [current_status_text or "", status_body or ""] if part and part.strip()]
-        )
-        if "DELIVERED" in text:
-            return "delivered"
-        if "SCHEDULED FOR DELIVERY" in text or "OUT FOR DELIVERY" in text:
-            return "scheduled_for_delivery"
-        if "WE HAVE RECEIVED YOUR BAGGAGE" in text:
-            return "received"
-        if "HAS BEEN LOCATED" in text:
-            return "located"
-
-        # Non-searching but unmatched detailed text.
-        return "located"
-
-    def _is_searching_state(self, no_of_bags_updated: int, tracing_statuses: list[str]) -> bool:
+    def _is_searching_state(self, no_of_bags_updated: int, tracing_statuses: tuple[str, ...]) -> bool:
         if no_of_bags_updated > 0:
             return False
         if not tracing_statuses:
             return True
         return all(status.startswith("BTS_1") for status in tracing_statuses)
 
-    async def _load_status_catalog(self) -> None:
-        if self._bag_status_catalog is not None and self._notification_catalog is not None:
-            return
-        self._bag_status_catalog = {}
-        self._notification_catalog = {}
-        try:
-            async with self._session.get(DYNAMIC_MESSAGES_URL, headers={"User-Agent": USER_AGENT}) as response:
-                if response.status != 200:
-                    return
-                payload = json.loads(await response.text())
-            dynamic = payload.get("dynamicMessages", {})
-            bag_status = dynamic.get("bag_status", {})
-            notification = dynamic.get("notification_mszs", {})
-            if isinstance(bag_status, dict):
-                self._bag_status_catalog = bag_status
-            if isinstance(notification, dict):
-                self._notification_catalog = notification
-        except Exception:
-            # Keep integration resilient if static message lookup fails.
-            self._bag_status_catalog = {}
-            self._notification_catalog = {}
-
-    async def _resolve_status_messages(self, tracing_status: str | None) -> tuple[list[str] | None, str | None, str | None]:
+    async def _resolve_status_messages(self, tracing_status: str | None, priority: int) -> StatusMessages:
         if not tracing_status:
-            return None, None, None
-        await self._load_status_catalog()
-
-        status_entry = (self._bag_status_catalog or {}).get(tracing_status)
-        if not isinstance(status_entry, dict):
-            return None, None, None
-
-        open_heads: list[tuple[int, str]] = []
-        for key, value in status_entry.items():
-            if not (key.startswith("BTS_ACCopen_") and key.endswith("_head")):
-                continue
-            if not isinstance(value, str) or not value.strip():
-                continue
-            match = re.search(r"BTS_ACCopen_(\d+)_head", key)
-            order = int(match.group(1)) if match else 999
-            open_heads.append((order, value.strip()))
-
-        open_heads.sort(key=lambda item: item[0])
-        steps: list[str] = []
-        for _, value in open_heads:
-            if value not in steps:
-                steps.append(value)
-
-        current_status_text = status_entry.get("BTS_ACCclose_head")
-        if isinstance(current_status_text, str):
-            current_status_text = current_status_text.strip() or None
-        else:
-            current_status_text = None
-        if not current_status_text and steps:
-            current_status_text = steps[-1]
-
-        status_body = (
-            ((self._notification_catalog or {}).get(tracing_status, {})).get("delayed", {}).get("body")
-        )
-        if isinstance(status_body, str):
-            status_body = status_body.strip() or None
-        else:
-            status_body = None
-
-        return (steps or None), current_status_text, status_body
-
-    def _build_bag_title(self, bag_item: dict) -> str | None:
-        seq = bag_item.get("Seq")
-        tag_sequence = bag_item.get("BagTag", {}).get("TagSequence")
-        if tag_sequence is None:
-            return None
-
-        tag_text = str(tag_sequence).strip()
-        if tag_text.isdigit():
-            tag_text = tag_text.zfill(10)
-
-        if seq is None:
-            return f"DELAYED BAGGAGE - {tag_text}"
-        return f"DELAYED BAGGAGE {seq} - {tag_text}"
-
-    def _extract_delivery_details(self, delayed_record: dict) -> dict | None:
-        details: dict[str, str] = {}
-
-        delayed_group = delayed_record.get("DelayedBagGroup", {})
-        delayed_bags = delayed_group.get("DelayedBags", {})
-        bag_items = delayed_bags.get("DelayedBag", []) or []
-        first_bag = bag_items[0] if bag_items else {}
-
-        # Structured bag delivery timestamps
-        bag_delivery = first_bag.get("BagDelivery", {})
-        status = bag_delivery.get("Status", {})
-        pickup = ((status.get("TrackingUpdate") or {}).get("value") or "").strip()
-        scheduled = ((status.get("OutForDelivery") or {}).get("value") or "").strip()
-        delivered = (
-            ((status.get("Delivered") or {}).get("value") or "")
-            or ((status.get("DeliveryComplete") or {}).get("value") or "")
-            or ((status.get("DeliveredToCustomer") or {}).get("value") or "")
-        ).strip()
-
-        # Fallback: different airlines/environments may expose delivered time under
-        # another key in BagDelivery.Status.
-        if not delivered and isinstance(status, dict):
-            for key, value in status.items():
-                if "delivered" not in str(key).lower():
-                    continue
-                if not isinstance(value, dict):
-                    continue
-                candidate = (value.get("value") or "").strip()
-                if candidate:
-                    delivered = candidate
-                    break
-
-        if pickup:
-            details["pickup_datetime_local"] = pickup
-        if scheduled:
-            details["scheduled_delivery_local"] = scheduled
-        if delivered:
-            details["delivered_datetime_local"] = delivered
-
-        # Passenger/contact details
-        passenger = delayed_record.get("Passengers", {})
-        contact = passenger.get("ContactInfo", {})
-        permanent = contact.get("PermanentAddress", {})
-        last_name = (((passenger.get("Names") or {}).get("Name") or [{}])[0].get("value") or "").strip()
-        if last_name:
-            details["passenger_name"] = last_name
-        phone = ((((contact.get("CellPhones") or {}).get("Phone")) or [{}])[0].get("value") or "").strip()
-        if phone:
-            details["telephone_number"] = phone
-
-        addr_line = (((permanent.get("AddressLine") or [{}])[0].get("value")) or "").strip()
-        city = ((permanent.get("City") or {}).get("value") or "").strip()
-        state = ((permanent.get("State") or {}).get("value") or "").strip()
-        postal = ((permanent.get("PostalCode") or {}).get("value") or "").strip()
-        country_obj = permanent.get("Country") or {}
-        country = (country_obj.get("value") or "").strip()
-        country_code = (country_obj.get("Code") or "").strip().upper()
-        if not country and country_code:
-            country = {"DE": "Germany", "AT": "Austria", "CH": "Switzerland"}.get(country_code, country_code)
-        address_parts = [x for x in [addr_line, city, state, postal, country] if x]
-        if address_parts:
-            details["delivery_address"] = ", ".join(address_parts)
-
-        # Bag details
-        tag = first_bag.get("BagTag", {})
-        airline_tag = (tag.get("AirlineCode") or "").strip()
-        tag_seq = (tag.get("TagSequence") or "").strip()
-        if airline_tag and tag_seq:
-            details["tag_details"] = f"{airline_tag}{tag_seq}"
-        color_code = (((first_bag.get("ColorTypeDesc") or {}).get("ColorCode")) or "").strip().upper()
-        if color_code:
-            details["baggage_colour"] = {
-                "GY": "Grey",
-                "BL": "Blue",
-                "BK": "Black",
-                "RD": "Red",
-                "WH": "White",
-            }.get(color_code, color_code)
-
-        if bag_items:
-            details["number_of_baggage_in_delivery"] = str(len(bag_items))
-
-        # Encoded delivery details block (source for courier website and commission date)
-        delivery_info_text = ""
-        ai = delayed_record.get("AdditionalInfo", {})
-        delivery_info = ai.get("DeliveryInfo", {}) if isinstance(ai, dict) else {}
-        if isinstance(delivery_info, dict):
-            text_list = delivery_info.get("Text", [])
-            if isinstance(text_list, list) and text_list:
-                first_text = text_list[0]
-                if isinstance(first_text, dict):
-                    delivery_info_text = (first_text.get("value") or "").strip()
-
-        if delivery_info_text:
-            for line in [ln.strip() for ln in delivery_info_text.splitlines()]:
-                if line.startswith("DS "):
-                    parts = [p.strip() for p in line[3:].split(" - ") if p.strip()]
-                    if len(parts) >= 2:
-                        details["delivery_reference"] = parts[0]
-                        details["delivery_service"] = parts[1]
-                elif line.startswith("CW "):
-                    raw = line[3:].strip()
-                    site = raw.replace("/D/", ".").strip("/")
-                    if site:
-                        details["courier_website"] = site
-                        details["courier_tracking_url"] = (
-                            site if site.lower().startswith(("http://", "https://")) else f"https://{site}"
-                        )
-                elif line.startswith("ZP "):
-                    # Example: ZP 14476 .DD 18FEB .DW ...
-                    match = re.search(r"\.DD\s+([A-Z0-9]+)", line)
-                    if match:
-                        details["commission_date"] = match.group(1).strip()
-                elif line.startswith("CT01 ") and "baggage_type" not in details:
-                    details["baggage_type"] = line[5:].strip()
-
-        # Email fallback for human-readable baggage type and note text.
-        email_info = delayed_record.get("EmailInfo", {})
-        text_items = email_info.get("Text", []) if isinstance(email_info, dict) else []
-        candidate = None
-        if isinstance(text_items, list):
-            for item in reversed(text_items):
-                if not isinstance(item, dict):
-                    continue
-                value = item.get("value")
-                if isinstance(value, str) and "Baggage Delivery Order Created" in value:
-                    candidate = value
-                    break
-
-        if candidate:
-            marker = "ADVICE TO CUSTOMER - PLEASE NOTE"
-            if marker in candidate and "note" not in details:
-                details["note"] = candidate.split(marker, 1)[1].strip()
-
-            if "baggage_type" not in details:
-                bag_type_match = re.search(
-                    r"Bag\s*-\s*\d+\s*Type\s*\d+\s*:\s*(.+)",
-                    candidate,
-                    re.IGNORECASE,
-                )
-                if bag_type_match:
-                    details["baggage_type"] = bag_type_match.group(1).strip()
-
-            created_match = re.search(
-                r"Baggage Delivery Order Created by\s+([^\n]+)",
-                candidate,
-                re.IGNORECASE,
-            )
-            if created_match:
-                details["created_by"] = created_match.group(1).strip()
-
-        cleaned = {k: v for k, v in details.items() if v}
-        return cleaned or None
+            return NO_STATUS_MESSAGES
+        await self._catalog.async_ensure_loaded(priority)
+        return self._catalog.resolve(tracing_status)
 
     def _parse_file_reference(self, reference: str) -> tuple[str, str, str]:
-        compact = re.sub(r"\s+", "", reference.upper())
-        match = re.fullmatch(r"([A-Z]{3})([A-Z0-9]{2})([A-Z0-9]+)", compact)
+        compact = _WHITESPACE_RE.sub("", reference.upper())
+        match = _FILE_REFERENCE_RE.fullmatch(compact)
         if not match:
             raise ValueError(
                 "Reference must be in file-reference format, e.g. ABCOS12345 (station+airline+number)."
@@ -481,15 +430,36 @@ class MyBagApiClient:
             url=self._url,
             message=message,
         )
+
+
+def _decode_login_response(body: bytes) -> tuple[dict[str, Any] | None, str | None]:
+    """Decode a manageLogin body, keeping only the delayed record and message fields.
+
+    The bytes are decoded once (with orjson when available) and everything outside
+    WTR_DelayedBagRecReadRS is released as soon as this returns.
+    """
+    response_json = orjson.loads(body) if orjson is not None else json.loads(body)
+    if not isinstance(response_json, dict):
+        return None, None
+    read_record = response_json.get("WTR_ReadRecordRS")
+    delayed_record = read_record.get("WTR_DelayedBagRecReadRS") if isinstance(read_record, dict) else None
+    if isinstance(delayed_record, dict):
+        return delayed_record, None
+    return None, response_json.get("Msg") or response_json.get("message")
+
+
+def _reuse(previous: _T | None, current: _T) -> _T:
+    """Return ``previous`` when it equals ``current``, so unchanged values are shared."""
+    return previous if previous is not None and previous == current else current
+
+
+def _excerpt(body: bytes, limit: int) -> str:
+    return body[:limit].decode("utf-8", errors="replace")
+
+
 AIRLINE_CODES = integration_const.AIRLINE_CODES
 API_BASE_URL = integration_const.API_BASE_URL
 API_KEY = integration_const.API_KEY
 MANAGE_LOGIN_ENDPOINT = integration_const.MANAGE_LOGIN_ENDPOINT
 SEARCHING_TEXT = integration_const.SEARCHING_TEXT
 USER_AGENT = integration_const.USER_AGENT
-# Backward-safe fallback in case HA has a stale const.py during update.
-DYNAMIC_MESSAGES_URL = getattr(
-    integration_const,
-    "DYNAMIC_MESSAGES_URL",
-    "https://mybag.aero/baggage/assets/static/common-dynamic-messages/en-gb.json",
-)
@@ -0,0 +1,121 @@
+"""Batch input parsing and bounded concurrent checks for many file references."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+import csv
+import re
+from typing import NamedTuple, TypeVar
+
+from .const import AIRLINE_CODES
+
+_REFERENCE_RE = re.compile(r"[A-Z]{3}[A-Z0-9]{2}[A-Z0-9]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_AIRLINE_BY_CODE = {code: airline for airline, code in AIRLINE_CODES.items()}
+_HEADER_NAMES = {"airline", "reference", "reference_number", "family_name", "last_name"}
+
+_T = TypeVar("_T")
+
+
+class BatchRow(NamedTuple):
+    """One validated airline/reference/family-name row."""
+
+    line: int
+    airline: str
+    reference_number: str
+    family_name: str
+
+
+class BatchRowError(NamedTuple):
+    """A row that could not be used, with the reason."""
+
+    line: int
+    text: str
+    error: str
+
+
+def parse_batch_rows(lines: Iterable[str]) -> tuple[list[BatchRow], list[BatchRowError]]:
+    """Parse CSV rows of airline, reference number and family name.
+
+    A header row naming the columns is optional; without one the columns are taken
+    in that order. Airlines may be given by name (``austrian``) or code (``OS``).
+    Blank lines and lines starting with ``#`` are skipped; duplicates are reported
+    as errors. Raises ValueError when a header row lacks one of the columns.
+    """
+    rows: list[BatchRow] = []
+    errors: list[BatchRowError] = []
+    columns = (0, 1, 2)
+    seen: set[tuple[str, str]] = set()
+    for line_number, cells in enumerate(csv.reader(lines), start=1):
+        cells = [cell.strip() for cell in cells]
+        if not any(cells) or cells[0].startswith("#"):
+            continue
+        if not rows and not errors and _HEADER_NAMES.intersection(cell.lower() for cell in cells):
+            columns = _header_columns([cell.lower() for cell in cells])
+            continue
+        text = ",".join(cells)
+        try:
+            airline, reference_number, family_name = (cells[index] for index in columns)
+        except IndexError:
+            errors.append(BatchRowError(line_number, text, "Expected airline, reference number and family name."))
+            continue
+
+        airline = _normalize_airline(airline)
+        reference_number = _WHITESPACE_RE.sub("", reference_number.upper())
+        family_name = family_name.strip().upper()
+        if airline is None:
+            error = f"Unknown airline, expected one of {sorted(AIRLINE_CODES)}."
+            errors.append(BatchRowError(line_number, text, error))
+        elif not _REFERENCE_RE.fullmatch(reference_number):
+            error = "Reference must be in file-reference format, e.g. ABCOS12345."
+            errors.append(BatchRowError(line_number, text, error))
+        elif not family_name:
+            errors.append(BatchRowError(line_number, text, "Family name is required."))
+        elif (airline, reference_number) in seen:
+            errors.append(BatchRowError(line_number, text, "Duplicate reference."))
+        else:
+            seen.add((airline, reference_number))
+            rows.append(BatchRow(line_number, airline, reference_number, family_name))
+    return rows, errors
+
+
+async def async_check_rows(
+    rows: Iterable[BatchRow],
+    check: Callable[[BatchRow], Awaitable[_T]],
+    concurrency: int,
+) -> AsyncIterator[tuple[BatchRow, _T]]:
+    """Run ``check`` for every row, at most ``concurrency`` at a time, yielding results as they finish."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _async_run(row: BatchRow) -> tuple[BatchRow, _T]:
+        async with semaphore:
+            return row, await check(row)
+
+    tasks = [asyncio.ensure_future(_async_run(row)) for row in rows]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _header_columns(header: list[str]) -> tuple[int, int, int]:
+    def _find(*names: str) -> int:
+        for name in names:
+            if name in header:
+                return header.index(name)
+        raise ValueError(f"Header is missing the {names[0]} column")
+
+    return (
+        _find("airline"),
+        _find("reference_number", "reference"),
+        _find("family_name", "last_name"),
+    )
+
+
+def _normalize_airline(value: str) -> str | None:
+    if value.lower() in AIRLINE_CODES:
+        return value.lower()
+    return _AIRLINE_BY_CODE.get(value.upper())
@@ -6,10 +6,10 @@ from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import MyBagDataUpdateCoordinator
+from .entity import MyBagStatusEntity
 
 
 async def async_setup_entry(
@@ -22,7 +22,7 @@ async def async_setup_entry(
     async_add_entities([MyBagFoundBinarySensor(coordinator, entry)])
 
 
-class MyBagFoundBinarySensor(CoordinatorEntity[MyBagDataUpdateCoordinator], BinarySensorEntity):
+class MyBagFoundBinarySensor(MyBagStatusEntity, BinarySensorEntity):
     """True when baggage no longer appears as searching."""
 
     _attr_has_entity_name = True
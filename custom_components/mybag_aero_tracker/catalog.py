@@ -0,0 +1,361 @@
+"""Shared dynamic-messages catalog for mybag.aero status texts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, Protocol
+
+from aiohttp import ClientSession
+
+from .const import (
+    CATALOG_RETRY_SECONDS,
+    CATALOG_TTL_SECONDS,
+    DYNAMIC_MESSAGES_URL,
+    TRACING_STATUS_STATES,
+    USER_AGENT,
+)
+from .ratelimit import PRIORITY_BACKGROUND, TokenBucketLimiter
+from .state import build_tracing_status_states, tracing_status_state
+from .traffic import TrafficArchive
+
+_LOGGER = logging.getLogger(__name__)
+
+_OPEN_HEAD_RE = re.compile(r"BTS_ACCopen_(\d+)_head")
+
+StatusMessages = tuple[tuple[str, ...] | None, str | None, str | None]
+"""Resolved ``(status_steps, current_status_text, status_body)`` for one tracing status."""
+
+NO_STATUS_MESSAGES: StatusMessages = (None, None, None)
+
+
+class DataStore(Protocol):
+    """Persistence backend (compatible with Home Assistant's Store)."""
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return previously saved data, if any."""
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Persist data."""
+
+    def async_delay_save(self, data_func: Callable[[], dict[str, Any]], delay: float = 0) -> None:
+        """Persist the data returned by ``data_func`` after ``delay`` seconds."""
+
+
+class MyBagStatusCatalog:
+    """Dynamic-messages catalog shared by all clients of one Home Assistant instance.
+
+    The catalog is restored from ``store`` on first use and revalidated in the
+    background with ETag/If-Modified-Since once it is older than the TTL. When a
+    download fails the last known copy keeps being served and the download is retried
+    after a short delay. A revalidation that returns 304 only writes the validators
+    and fetch time, to ``meta_store`` when one is given.
+
+    Each load also precomputes the tracingStatus -> state table; ``state_overrides``
+    are applied on top of it.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        *,
+        store: DataStore | None = None,
+        meta_store: DataStore | None = None,
+        url: str = DYNAMIC_MESSAGES_URL,
+        ttl_seconds: float = CATALOG_TTL_SECONDS,
+        retry_seconds: float = CATALOG_RETRY_SECONDS,
+        state_overrides: Mapping[str, str] | None = None,
+        limiter: TokenBucketLimiter | None = None,
+        traffic: TrafficArchive | None = None,
+    ) -> None:
+        self._session = session
+        self._store = store
+        self._meta_store = meta_store
+        self._url = url
+        self._ttl_seconds = ttl_seconds
+        self._retry_seconds = retry_seconds
+        self._limiter = limiter
+        self._traffic = traffic
+        self._state_overrides = dict(TRACING_STATUS_STATES if state_overrides is None else state_overrides)
+        self._bag_status: dict[str, dict] = {}
+        self._notification: dict[str, dict] = {}
+        self._index: dict[str, StatusMessages] = {}
+        self._states: dict[str, str] = dict(self._state_overrides)
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._fetched_at: float | None = None
+        self._next_check: float = 0.0
+        self._restored = False
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.downloads = 0
+        self.not_modified = 0
+        self.failed_downloads = 0
+
+    @property
+    def bag_status(self) -> dict[str, dict]:
+        """Return the ``bag_status`` section of the catalog."""
+        return self._bag_status
+
+    @property
+    def notification(self) -> dict[str, dict]:
+        """Return the ``notification_mszs`` section of the catalog."""
+        return self._notification
+
+    @property
+    def has_data(self) -> bool:
+        """Return whether any catalog content is available."""
+        return bool(self._bag_status or self._notification)
+
+    def resolve(self, tracing_status: str) -> StatusMessages:
+        """Return the precomputed status messages for a tracing status."""
+        return self._index.get(tracing_status, NO_STATUS_MESSAGES)
+
+    def state_for(self, tracing_status: str) -> str | None:
+        """Return the tracker state mapped to a tracing status, if known."""
+        state = self._states.get(tracing_status)
+        # Codes of a known family need no catalog entry.
+        return state if state is not None else tracing_status_state(tracing_status)
+
+    async def async_ensure_loaded(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Make the catalog available, revalidating it in the background when stale.
+
+        ``priority`` is the rate-limiter lane used when the caller has to wait for a download.
+        """
+        if not self._restored or not self.has_data:
+            self.cache_misses += 1
+            async with self._lock:
+                if not self._restored:
+                    await self._async_restore()
+                    self._restored = True
+                # Without any cached copy the caller has nothing to serve, so wait for the download.
+                if not self.has_data and time.monotonic() >= self._next_check:
+                    await self._async_revalidate(priority)
+                return
+
+        self.cache_hits += 1
+        if time.monotonic() < self._next_check:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._async_background_revalidate())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache and download counters for diagnostics."""
+        return {
+            "statuses": len(self._index),
+            "fetched_at": self._fetched_at,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "downloads": self.downloads,
+            "not_modified": self.not_modified,
+            "failed_downloads": self.failed_downloads,
+        }
+
+    async def async_close(self) -> None:
+        """Cancel a pending background revalidation."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _async_background_revalidate(self) -> None:
+        async with self._lock:
+            if time.monotonic() >= self._next_check:
+                await self._async_revalidate(PRIORITY_BACKGROUND)
+
+    async def _async_restore(self) -> None:
+        if self._store is None:
+            return
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.debug("Could not restore dynamic messages catalog: %s", err)
+            return
+        if not isinstance(stored, dict):
+            return
+        if not self._apply(stored.get("bag_status"), stored.get("notification_mszs")):
+            return
+        self._etag = stored.get("etag")
+        self._last_modified = stored.get("last_modified")
+        fetched_at = stored.get("fetched_at")
+        self._fetched_at = float(fetched_at) if isinstance(fetched_at, (int, float)) else None
+        await self._async_restore_meta()
+        age = time.time() - self._fetched_at if self._fetched_at is not None else self._ttl_seconds
+        self._next_check = time.monotonic() + max(0.0, self._ttl_seconds - age)
+
+    async def _async_restore_meta(self) -> None:
+        if self._meta_store is None:
+            return
+        try:
+            meta = await self._meta_store.async_load()
+        except Exception as err:
+            _LOGGER.debug("Could not restore dynamic messages catalog metadata: %s", err)
+            return
+        if not isinstance(meta, dict):
+            return
+        # Only a 304 for the saved copy (same validators) proves it was still current later on.
+        if meta.get("etag") != self._etag or meta.get("last_modified") != self._last_modified:
+            return
+        fetched_at = meta.get("fetched_at")
+        if isinstance(fetched_at, (int, float)) and (self._fetched_at is None or fetched_at > self._fetched_at):
+            self._fetched_at = float(fetched_at)
+
+    async def _async_revalidate(self, priority: int) -> None:
+        if self._limiter is not None:
+            await self._limiter.async_acquire(priority)
+        headers = {"User-Agent": USER_AGENT}
+        if self.has_data:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        try:
+            async with self._session.get(self._url, headers=headers) as response:
+                if self._traffic is not None:
+                    body = await response.read()
+                    self._traffic.record("GET", self._url, None, response.status, response.headers, body)
+                if response.status == 304 and self.has_data:
+                    self.not_modified += 1
+                    self._mark_fresh()
+                    await self._async_persist_meta()
+                    return
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                payload = json.loads(await response.text())
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+            dynamic = payload.get("dynamicMessages", {})
+            if not self._apply(dynamic.get("bag_status"), dynamic.get("notification_mszs")):
+                raise ValueError("catalog payload has no usable sections")
+        except Exception as err:
+            # Keep integration resilient if static message lookup fails: serve the stale copy.
+            _LOGGER.debug("Dynamic messages catalog refresh failed: %s", err)
+            self.failed_downloads += 1
+            self._next_check = time.monotonic() + self._retry_seconds
+            return
+
+        self.downloads += 1
+        self._etag = etag
+        self._last_modified = last_modified
+        self._mark_fresh()
+        await self._async_persist()
+
+    def _apply(self, bag_status: Any, notification: Any) -> bool:
+        if not isinstance(bag_status, dict) and not isinstance(notification, dict):
+            return False
+        self._bag_status = bag_status if isinstance(bag_status, dict) else {}
+        self._notification = notification if isinstance(notification, dict) else {}
+        self._index = build_status_index(self._bag_status, self._notification, previous=self._index)
+        self._states = build_tracing_status_states(self._index, self._state_overrides)
+        return True
+
+    def _mark_fresh(self) -> None:
+        self._fetched_at = time.time()
+        self._next_check = time.monotonic() + self._ttl_seconds
+
+    async def _async_persist_meta(self) -> None:
+        # Without a metadata store the whole catalog is the only place to keep the new fetch time.
+        if self._meta_store is None:
+            await self._async_persist()
+            return
+        try:
+            await self._meta_store.async_save(
+                {"etag": self._etag, "last_modified": self._last_modified, "fetched_at": self._fetched_at}
+            )
+        except Exception as err:
+            _LOGGER.debug("Could not persist dynamic messages catalog metadata: %s", err)
+
+    async def _async_persist(self) -> None:
+        if self._store is None:
+            return
+        try:
+            await self._store.async_save(
+                {
+                    "etag": self._etag,
+                    "last_modified": self._last_modified,
+                    "fetched_at": self._fetched_at,
+                    "bag_status": self._bag_status,
+                    "notification_mszs": self._notification,
+                }
+            )
+        except Exception as err:
+            _LOGGER.debug("Could not persist dynamic messages catalog: %s", err)
+
+
+def build_status_index(
+    bag_status: dict[str, Any],
+    notification: dict[str, Any],
+    previous: Mapping[str, StatusMessages] | None = None,
+) -> dict[str, StatusMessages]:
+    """Precompute status messages for every tracing status in the catalog.
+
+    The resulting tuples are immutable, so they are shared by every client and poll.
+    Equal step tuples are stored once; those already in ``previous`` (the index
+    being replaced) are reused, so statuses built from it keep sharing them.
+    """
+    shared_steps = {steps: steps for steps, _, _ in (previous or {}).values() if steps}
+    index: dict[str, StatusMessages] = {}
+    for tracing_status, status_entry in bag_status.items():
+        if isinstance(status_entry, dict):
+            index[tracing_status] = _build_status_messages(
+                status_entry, notification.get(tracing_status), shared_steps
+            )
+    return index
+
+
+def _build_status_messages(
+    status_entry: dict[str, Any],
+    notification_entry: Any,
+    shared_steps: dict[tuple[str, ...], tuple[str, ...]],
+) -> StatusMessages:
+    open_heads: list[tuple[int, str]] = []
+    for key, value in status_entry.items():
+        if not (key.startswith("BTS_ACCopen_") and key.endswith("_head")):
+            continue
+        if not isinstance(value, str) or not value.strip():
+            continue
+        match = _OPEN_HEAD_RE.search(key)
+        order = int(match.group(1)) if match else 999
+        open_heads.append((order, sys.intern(value.strip())))
+
+    open_heads.sort(key=lambda item: item[0])
+    steps: list[str] = []
+    for _, value in open_heads:
+        if value not in steps:
+            steps.append(value)
+
+    current_status_text = status_entry.get("BTS_ACCclose_head")
+    if isinstance(current_status_text, str):
+        current_status_text = sys.intern(current_status_text.strip()) or None
+    else:
+        current_status_text = None
+    if not current_status_text and steps:
+        current_status_text = steps[-1]
+
+    status_body = None
+    if isinstance(notification_entry, dict):
+        delayed = notification_entry.get("delayed")
+        if isinstance(delayed, dict):
+            status_body = delayed.get("body")
+    if isinstance(status_body, str):
+        status_body = sys.intern(status_body.strip()) or None
+    else:
+        status_body = None
+
+    status_steps = None
+    if steps:
+        status_steps = tuple(steps)
+        status_steps = shared_steps.setdefault(status_steps, status_steps)
+    return status_steps, current_status_text, status_body
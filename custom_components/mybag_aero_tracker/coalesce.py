@@ -0,0 +1,67 @@
+"""Single-flight coalescing of checks for the same file."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import time
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class RequestCoalescer(Generic[_T]):
+    """Collapses overlapping calls for the same key into one in-flight call.
+
+    Callers that arrive while a call for their key is running share its result, so
+    overlapping triggers (duplicate entries for the same file, a refresh during a
+    scheduled poll) cost a single request. A later call always makes its own
+    request unless ``window_seconds`` is set, in which case a successful result is
+    also handed out for that long after it finished. A cancelled caller never
+    cancels the shared call.
+    """
+
+    def __init__(self, window_seconds: float = 0) -> None:
+        self._window = window_seconds
+        self._in_flight: dict[Hashable, asyncio.Future[_T]] = {}
+        self._recent: dict[Hashable, tuple[float, _T]] = {}
+        self.calls = 0
+        self.joined = 0
+        self.reused = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Return how many calls were answered without a request of their own."""
+        return self.joined + self.reused
+
+    async def async_run(self, key: Hashable, call: Callable[[], Awaitable[_T]]) -> _T:
+        """Return the result of ``call``, shared with overlapping callers of the same key."""
+        if (recent := self._recent.get(key)) is not None:
+            if time.monotonic() - recent[0] < self._window:
+                self.reused += 1
+                return recent[1]
+            del self._recent[key]
+        if (flight := self._in_flight.get(key)) is not None:
+            self.joined += 1
+            return await asyncio.shield(flight)
+
+        self.calls += 1
+        flight = self._in_flight[key] = asyncio.ensure_future(call())
+        flight.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(flight)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return coalescing counters for diagnostics."""
+        return {
+            "window_seconds": self._window,
+            "calls": self.calls,
+            "joined": self.joined,
+            "reused": self.reused,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _finish(self, key: Hashable, flight: asyncio.Future[_T]) -> None:
+        self._in_flight.pop(key, None)
+        if not flight.cancelled() and flight.exception() is None and self._window > 0:
+            self._recent[key] = (time.monotonic(), flight.result())
@@ -65,6 +65,16 @@ class MyBagTrackerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a row the bulk import service has normalized and checked."""
+        await self.async_set_unique_id(f"{import_data[CONF_AIRLINE]}_{import_data[CONF_REFERENCE_NUMBER]}")
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=f"{import_data[CONF_AIRLINE].title()} {import_data[CONF_REFERENCE_NUMBER]}",
+            data=import_data,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
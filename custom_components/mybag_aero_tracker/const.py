@@ -13,6 +13,15 @@ CONF_SCAN_INTERVAL_MINUTES = "scan_interval_minutes"
 
 DEFAULT_SCAN_INTERVAL_MINUTES = 60
 DEFAULT_TIMEOUT_SECONDS = 90
+DEFAULT_MAX_CONCURRENT_CHECKS = 4
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_REQUEST_BURST = 10
+
+CONF_MAX_CONCURRENT_CHECKS = "max_concurrent_checks"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+CONF_REQUEST_BURST = "request_burst"
+CONF_API_BASE_URL = "api_base_url"
+CONF_DYNAMIC_MESSAGES_URL = "dynamic_messages_url"
 
 SEARCHING_TEXT = "SEARCHING FOR YOUR BAGGAGE"
 NO_RECORD_TEXT = "NO RECORD WAS FOUND"
@@ -22,6 +31,81 @@ MANAGE_LOGIN_ENDPOINT = "/manageLogin"
 API_KEY = "P"
 DYNAMIC_MESSAGES_URL = "https://mybag.aero/baggage/assets/static/common-dynamic-messages/en-gb.json"
 
+# Integration-owned HTTP session shared by all entries.
+DATA_SESSION = f"{DOMAIN}_session"
+SESSION_KEEPALIVE_SECONDS = 60
+SESSION_DNS_CACHE_SECONDS = 300
+
+# Opt-in capture of complete API exchanges, or replay of a capture instead of the network.
+CONF_TRAFFIC_MODE = "traffic_mode"
+CONF_TRAFFIC_MAX_MB = "traffic_max_mb"
+TRAFFIC_MODE_OFF = "off"
+TRAFFIC_MODE_RECORD = "record"
+TRAFFIC_MODE_REPLAY = "replay"
+DATA_TRAFFIC = f"{DOMAIN}_traffic"
+TRAFFIC_DIRECTORY = f"{DOMAIN}_traffic"
+DEFAULT_TRAFFIC_MAX_MB = 20
+TRAFFIC_SEGMENTS = 8
+
+# Shared dynamic-messages catalog (one per Home Assistant instance).
+DATA_CATALOG = f"{DOMAIN}_catalog"
+DATA_CONFIG = f"{DOMAIN}_config"
+DATA_LIMITER = f"{DOMAIN}_limiter"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+CATALOG_STORAGE_KEY = f"{DOMAIN}.catalog"
+CATALOG_STORAGE_VERSION = 1
+# Validators and age of the saved catalog, rewritten alone when a revalidation returns 304.
+CATALOG_META_STORAGE_KEY = f"{DOMAIN}.catalog_meta"
+CATALOG_TTL_SECONDS = 12 * 60 * 60
+CATALOG_RETRY_SECONDS = 5 * 60
+
+# Last known status per entry, restored at startup.
+DATA_STATUS_STORE = f"{DOMAIN}_status_store"
+STATUS_STORAGE_KEY = f"{DOMAIN}.status"
+STATUS_STORAGE_VERSION = 1
+STATUS_SAVE_DELAY_SECONDS = 10
+
+# Refresh service; overlapping checks of the same file share one request.
+SERVICE_REFRESH = "refresh"
+ATTR_ENTRY_ID = "entry_id"
+DATA_COALESCER = f"{DOMAIN}_coalescer"
+
+# Bulk import service; statuses fetched while validating seed the new entries.
+SERVICE_IMPORT = "import_files"
+ATTR_CSV = "csv"
+ATTR_ROWS = "rows"
+DATA_IMPORT_SEEDS = f"{DOMAIN}_import_seeds"
+
+# Transition timeline per entry and the event fired for each transition.
+DATA_TIMELINE_STORE = f"{DOMAIN}_timeline_store"
+TIMELINE_STORAGE_KEY = f"{DOMAIN}.timeline"
+TIMELINE_STORAGE_VERSION = 1
+TIMELINE_MAX_ENTRIES = 20
+TIMELINE_SAVE_DELAY_SECONDS = 10
+EVENT_STATUS_CHANGED = f"{DOMAIN}_status_changed"
+
+# Remembered manageLogin validator per reference/airline.
+DATA_VALIDATORS = f"{DOMAIN}_validators"
+VALIDATOR_STORAGE_KEY = f"{DOMAIN}.validators"
+VALIDATOR_STORAGE_VERSION = 1
+VALIDATOR_SAVE_DELAY_SECONDS = 10
+# Consecutive successes with the other validator before an airline's default follows.
+VALIDATOR_AIRLINE_CONSENSUS = 3
+
+# State of each BTS tracingStatus family (the code without its letter suffix, BTS_5C -> BTS_5).
+# BTS_1 only gets here once the record was updated; untouched files are searching.
+TRACING_STATUS_FAMILY_STATES: dict[str, str] = {
+    "BTS_1": "located",
+    "BTS_2": "located",
+    "BTS_3": "received",
+    "BTS_4": "received",
+    "BTS_5": "scheduled_for_delivery",
+    "BTS_6": "delivered",
+}
+
+# Explicit tracingStatus -> state overrides, applied on top of the family table.
+TRACING_STATUS_STATES: dict[str, str] = {}
+
 AIRLINE_URLS = {
     "austrian": "https://mybag.aero/baggage/#/pax/austrian/en-gb/delayed/manage-bag",
     "lufthansa": "https://mybag.aero/baggage/#/pax/lufthansa/en-gb/delayed/manage-bag",
@@ -36,6 +120,32 @@ AIRLINE_CODES = {
 
 UPDATE_INTERVAL = timedelta(minutes=DEFAULT_SCAN_INTERVAL_MINUTES)
 
+# Retries and circuit breaking for the mybag API.
+DATA_BREAKERS = f"{DOMAIN}_breakers"
+RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY_SECONDS = 2.0
+RETRY_MAX_DELAY_SECONDS = 60.0
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 5 * 60
+
+# Adaptive polling: the scan interval is scaled by the last known state.
+STATE_POLL_FACTORS: dict[str, float] = {
+    "searching": 2.0,
+    "located": 1.0,
+    "received": 1.0,
+    "scheduled_for_delivery": 0.5,
+    "error": 1.0,
+}
+MIN_POLL_INTERVAL = timedelta(minutes=5)
+MAX_POLL_INTERVAL = timedelta(hours=24)
+TERMINAL_POLL_INTERVAL = timedelta(hours=24)
+DELIVERY_WINDOW = timedelta(hours=2)
+DELIVERY_WINDOW_POLL_INTERVAL = timedelta(minutes=15)
+
+# Staggered start: each entry polls at a stable phase of its interval, plus a little jitter.
+PHASE_MAX_JITTER_SECONDS = 30.0
+PHASE_JITTER_FRACTION = 0.05
+
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
@@ -2,29 +2,158 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from dataclasses import replace
+from datetime import datetime, timedelta
 import logging
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from .api import MyBagApiClient
+from .const import EVENT_STATUS_CHANGED
 from .models import BaggageStatus
+from .policy import PollDecision, decide_next_poll
+from .ratelimit import PRIORITY_USER
+from .scheduler import MyBagFleetScheduler, first_poll_delay
+from .state import STATE_ERROR
+from .status_store import MyBagStatusStore, MyBagTimelineStore
+from .timeline import TimelineEntry
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class MyBagDataUpdateCoordinator(DataUpdateCoordinator[BaggageStatus]):
-    """Data update coordinator for MyBag Tracker."""
+    """Data update coordinator for MyBag Tracker.
 
-    def __init__(self, hass: HomeAssistant, client: MyBagApiClient, interval_minutes: int) -> None:
+    Polling is driven by the shared fleet scheduler rather than a per-entry timer;
+    scheduled results arrive through ``async_handle_status``. The delay before
+    each next check comes from the adaptive polling policy.
+
+    ``status_version`` moves when the content digest of the status (or the update
+    success) changed; status entities only write their state when it did.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: MyBagApiClient,
+        interval_minutes: int,
+        scheduler: MyBagFleetScheduler,
+        key: str,
+        status_store: MyBagStatusStore,
+        timeline_store: MyBagTimelineStore,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name="Mybag.aero Baggage Tracker",
-            update_interval=timedelta(minutes=interval_minutes),
+            update_interval=None,
         )
         self.client = client
+        self.interval = timedelta(minutes=interval_minutes)
+        self._scheduler = scheduler
+        self._key = key
+        self._status_store = status_store
+        self._timeline_store = timeline_store
+        self.poll_decision: PollDecision | None = None
+        self.status_version = 0
+        self.unchanged_updates = 0
+        self._published_digest: str | None = None
+        self._published_success = True
+        scheduler.async_register(
+            key,
+            client,
+            self.interval.total_seconds(),
+            self.async_handle_status,
+            self._next_poll_delay,
+        )
+
+    @property
+    def timeline(self) -> list[TimelineEntry]:
+        """Return the recorded transitions, oldest first."""
+        return self._timeline_store.get(self._key)
+
+    @callback
+    def async_restore(self, status: BaggageStatus) -> None:
+        """Publish a saved status without contacting the API.
+
+        The next scheduled check follows the poll decision made for the saved status,
+        counted from when it was checked. An overdue entry waits for its phase slot,
+        but no longer than it is already overdue, so a restart does not check every
+        stale entry at once.
+        """
+        self.client.restore_status(status)
+        # Seeds the timeline of entries saved before timelines were kept; no event for it.
+        self._timeline_store.async_add(self._key, status)
+        now = dt_util.utcnow()
+        decision = self._decide(status, status.checked_at)
+        if (delay := (decision.next_check_at - now).total_seconds()) <= 0:
+            delay = min(-delay, first_poll_delay(self._key, decision.interval.total_seconds()))
+        self.poll_decision = replace(decision, next_check_at=now + timedelta(seconds=delay))
+        self._scheduler.async_reschedule(self._key, delay)
+        self.async_set_updated_data(status)
+
+    @callback
+    def async_handle_status(self, status: BaggageStatus) -> None:
+        """Publish a status delivered by the scheduler."""
+        self._async_remember(status)
+        self.async_set_updated_data(status)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Move the status version when the status changed, then update listeners."""
+        digest = self.data.content_digest() if self.data is not None else None
+        if digest != self._published_digest or self.last_update_success != self._published_success:
+            self._published_digest = digest
+            self._published_success = self.last_update_success
+            self.status_version += 1
+        else:
+            self.unchanged_updates += 1
+        super().async_update_listeners()
+
+    def async_unregister(self) -> None:
+        """Stop scheduled checks for this entry."""
+        self._scheduler.async_unregister(self._key)
 
     async def _async_update_data(self) -> BaggageStatus:
-        return await self.client.async_check_status()
+        # First and user-requested refreshes; scheduled polls bypass this path.
+        status = await self._scheduler.async_check(self._key, PRIORITY_USER)
+        self._async_remember(status)
+        return status
+
+    @callback
+    def _async_remember(self, status: BaggageStatus) -> None:
+        if status.state == STATE_ERROR:
+            return
+        self._status_store.async_save_status(self._key, status)
+        timeline = self._timeline_store.get(self._key)
+        previous = timeline[-1] if timeline else None
+        if (entry := self._timeline_store.async_add(self._key, status)) is None or previous is None:
+            return
+        self.hass.bus.async_fire(
+            EVENT_STATUS_CHANGED,
+            {
+                "entry_id": self._key,
+                "airline": status.airline,
+                "reference_number": status.reference_number,
+                "old_state": previous.state,
+                "new_state": entry.state,
+                "old_tracing_status": previous.tracing_status,
+                "new_tracing_status": entry.tracing_status,
+                "headline": entry.headline,
+                "checked_at": entry.at,
+            },
+        )
+
+    def _next_poll_delay(self, status: BaggageStatus) -> float:
+        self.poll_decision = self._decide(status, dt_util.utcnow())
+        return self.poll_decision.interval.total_seconds()
+
+    def _decide(self, status: BaggageStatus, now: datetime) -> PollDecision:
+        return decide_next_poll(
+            status,
+            self.interval,
+            now=now,
+            local_tz=dt_util.get_time_zone(self.hass.config.time_zone) or dt_util.UTC,
+        )
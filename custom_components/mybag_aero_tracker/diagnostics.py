@@ -0,0 +1,61 @@
+"""Diagnostics support for MyBag Tracker."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_FAMILY_NAME,
+    DATA_CATALOG,
+    DATA_COALESCER,
+    DATA_LIMITER,
+    DATA_SCHEDULER,
+    DATA_TRAFFIC,
+    DOMAIN,
+)
+from .coordinator import MyBagDataUpdateCoordinator
+
+TO_REDACT = {
+    CONF_FAMILY_NAME,
+    "passenger_name",
+    "telephone_number",
+    "delivery_address",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry, with personal data redacted."""
+    coordinator: MyBagDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    shared = {
+        name: helper.as_dict()
+        for name, key in (
+            ("catalog", DATA_CATALOG),
+            ("scheduler", DATA_SCHEDULER),
+            ("rate_limiter", DATA_LIMITER),
+            ("coalescer", DATA_COALESCER),
+            ("traffic", DATA_TRAFFIC),
+        )
+        if (helper := hass.data.get(key)) is not None
+    }
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "status": async_redact_data(coordinator.data.as_dict(), TO_REDACT) if coordinator.data else None,
+        "poll_decision": coordinator.poll_decision.as_attributes() if coordinator.poll_decision else None,
+        "unchanged_updates": coordinator.unchanged_updates,
+        "timeline": [entry.as_dict() for entry in coordinator.timeline],
+        "client": {
+            "login_requests": client.login_requests,
+            "validator": client.last_validator,
+            "validator_retries": client.validator_retries,
+            "http_retries": client.http_retries,
+            "rate_limit_wait_seconds": round(client.last_rate_limit_wait, 3),
+            "circuit_breaker": client.circuit_breaker.as_dict(),
+            **client.metrics.as_dict(),
+        },
+        **shared,
+    }
@@ -0,0 +1,30 @@
+"""Base entity for MyBag Tracker."""
+
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import MyBagDataUpdateCoordinator
+
+
+class MyBagStatusEntity(CoordinatorEntity[MyBagDataUpdateCoordinator]):
+    """Entity showing the baggage status.
+
+    Its state is only written when the coordinator's status version moved, so a poll
+    that returns the same record does not write a new state.
+    """
+
+    _written_version: int | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the status version of the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written_version = self.coordinator.status_version
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.coordinator.status_version == self._written_version:
+            return
+        self._written_version = self.coordinator.status_version
+        super()._handle_coordinator_update()
@@ -0,0 +1,109 @@
+"""Low-overhead timing and error counters for status checks."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, deque
+import math
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended.
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+ROLLING_WINDOW = 100
+
+PHASE_CONNECT = "connect"
+PHASE_TTFB = "ttfb"
+PHASE_BODY = "body"
+PHASE_PARSE = "parse"
+PHASE_CHECK = "check"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with a rolling window for percentiles."""
+
+    def __init__(self) -> None:
+        self._buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self._recent: deque[float] = deque(maxlen=ROLLING_WINDOW)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+
+    def record(self, seconds: float) -> None:
+        """Add one observation."""
+        self._buckets[bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+        self._recent.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a percentile (0..1) of the recent observations, in seconds."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percentile) - 1)]
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the histogram for diagnostics."""
+        labels = [f"le_{bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + ["inf"]
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "buckets": dict(zip(labels, self._buckets, strict=True)),
+        }
+
+
+class CheckMetrics:
+    """Per-client timings (per request phase), outcome counters and the failure streak."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, LatencyHistogram] = {}
+        self.errors: Counter[str] = Counter()
+        self.checks = 0
+        self.failures = 0
+        self.failure_streak = 0
+
+    @property
+    def last_check_duration(self) -> float | None:
+        """Return the duration of the last check in seconds."""
+        histogram = self.phases.get(PHASE_CHECK)
+        return histogram.last if histogram is not None else None
+
+    @property
+    def check_duration_p95(self) -> float | None:
+        """Return the rolling p95 check duration in seconds."""
+        histogram = self.phases.get(PHASE_CHECK)
+        return histogram.percentile(0.95) if histogram is not None else None
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        """Record the duration of one request phase."""
+        if (histogram := self.phases.get(phase)) is None:
+            histogram = self.phases[phase] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_error(self, kind: str) -> None:
+        """Count an error by kind (e.g. ``http_503``, ``timeout``)."""
+        self.errors[kind] += 1
+
+    def record_check(self, seconds: float, failed: bool) -> None:
+        """Record a finished check."""
+        self.record_phase(PHASE_CHECK, seconds)
+        self.checks += 1
+        if failed:
+            self.failures += 1
+            self.failure_streak += 1
+        else:
+            self.failure_streak = 0
+
+    def as_dict(self) -> dict[str, object]:
+        """Return all counters and histograms for diagnostics."""
+        return {
+            "checks": self.checks,
+            "failures": self.failures,
+            "failure_streak": self.failure_streak,
+            "errors": dict(self.errors),
+            "phases": {phase: histogram.as_dict() for phase, histogram in self.phases.items()},
+        }
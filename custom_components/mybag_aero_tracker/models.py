@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime
+import hashlib
+import json
+import sys
+from typing import Any
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BaggageStatus:
-    """Structured status returned by the tracker client."""
+    """Structured status returned by the tracker client.
+
+    Immutable, so catalog texts and unchanged sub-objects can be shared between
+    polls and entries instead of being copied.
+    """
 
     state: str
     checked_at: datetime
@@ -20,12 +28,51 @@ class BaggageStatus:
     bag_title: str | None = None
     headline: str | None = None
     details: str | None = None
-    tracing_statuses: list[str] | None = None
+    tracing_statuses: tuple[str, ...] | None = None
     primary_tracing_status: str | None = None
-    status_steps: list[str] | None = None
+    status_steps: tuple[str, ...] | None = None
     current_status_text: str | None = None
     status_body: str | None = None
     delivery_details: dict | None = None
+    bags: tuple[dict, ...] | None = None
     no_of_bags_updated: int | None = None
     record_status: str | None = None
     raw_excerpt: str | None = None
+
+    def content_digest(self) -> str:
+        """Return a stable digest of what the status says about the bag.
+
+        ``checked_at`` and ``raw_excerpt`` change on every poll and are left out, so two
+        polls of an unchanged record have the same digest.
+        """
+        content = [getattr(self, name) for name in _CONTENT_FIELDS]
+        encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable copy for storage (without the debug excerpt)."""
+        data = asdict(self)
+        data["checked_at"] = self.checked_at.isoformat()
+        data.pop("raw_excerpt")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BaggageStatus:
+        """Rebuild a status saved with as_dict."""
+        known = {field.name for field in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        values["checked_at"] = datetime.fromisoformat(values["checked_at"])
+        for key in ("tracing_statuses", "status_steps"):
+            if values.get(key) is not None:
+                values[key] = tuple(sys.intern(item) for item in values[key])
+        for key in ("current_status_text", "status_body"):
+            if isinstance(values.get(key), str):
+                values[key] = sys.intern(values[key])
+        if values.get("bags") is not None:
+            values["bags"] = tuple(values["bags"])
+        return cls(**values)
+
+
+_CONTENT_FIELDS = tuple(
+    field.name for field in fields(BaggageStatus) if field.name not in ("checked_at", "raw_excerpt")
+)
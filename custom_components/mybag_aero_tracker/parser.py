@@ -0,0 +1,256 @@
+"""Single-pass parser for WTR_DelayedBagRecReadRS records."""
+
+from __future__ import annotations
+
+import re
+import sys
+from typing import Any, NamedTuple
+
+from .state import classify_delivery_status
+
+_DD_RE = re.compile(r"\.DD\s+([A-Z0-9]+)")
+_BAG_TYPE_RE = re.compile(r"Bag\s*-\s*\d+\s*Type\s*\d+\s*:\s*(.+)", re.IGNORECASE)
+_CREATED_BY_RE = re.compile(r"Baggage Delivery Order Created by\s+([^\n]+)", re.IGNORECASE)
+
+_DELIVERY_ORDER_MARKER = "Baggage Delivery Order Created"
+_NOTE_MARKER = "ADVICE TO CUSTOMER - PLEASE NOTE"
+_DELIVERED_KEYS = ("Delivered", "DeliveryComplete", "DeliveredToCustomer")
+
+COLOUR_NAMES = {
+    "GY": "Grey",
+    "BL": "Blue",
+    "BK": "Black",
+    "RD": "Red",
+    "WH": "White",
+}
+COUNTRY_NAMES = {"DE": "Germany", "AT": "Austria", "CH": "Switzerland"}
+
+
+class BagRecord(NamedTuple):
+    """Compact view of one DelayedBag entry."""
+
+    seq: Any = None
+    tag_airline: str | None = None
+    tag_sequence: str | None = None
+    colour: str | None = None
+    tracing_status: str | None = None
+    pickup_datetime_local: str | None = None
+    scheduled_delivery_local: str | None = None
+    delivered_datetime_local: str | None = None
+    delivery_state: str | None = None
+
+    @property
+    def tag(self) -> str | None:
+        """Return the full bag tag (airline code + sequence)."""
+        if self.tag_airline and self.tag_sequence:
+            return f"{self.tag_airline}{self.tag_sequence}"
+        return None
+
+    @property
+    def title(self) -> str | None:
+        """Return the bag title as shown by mybag.aero."""
+        if self.tag_sequence is None:
+            return None
+        tag_text = self.tag_sequence.zfill(10) if self.tag_sequence.isdigit() else self.tag_sequence
+        if self.seq is None:
+            return f"DELAYED BAGGAGE - {tag_text}"
+        return f"DELAYED BAGGAGE {self.seq} - {tag_text}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the non-empty fields for state attributes."""
+        data = {
+            "seq": self.seq,
+            "tag": self.tag,
+            "colour": self.colour,
+            "tracing_status": self.tracing_status,
+            "pickup_datetime_local": self.pickup_datetime_local,
+            "scheduled_delivery_local": self.scheduled_delivery_local,
+            "delivered_datetime_local": self.delivered_datetime_local,
+        }
+        return {key: value for key, value in data.items() if value is not None}
+
+
+class DelayedBagRecord(NamedTuple):
+    """Everything the client uses from one delayed baggage record."""
+
+    record_status: str | None
+    no_of_bags_updated: int
+    bags: tuple[BagRecord, ...]
+    delivery_details: dict[str, str] | None
+
+    @property
+    def tracing_statuses(self) -> tuple[str, ...]:
+        """Return the tracing status of every bag that has one."""
+        return tuple(bag.tracing_status for bag in self.bags if bag.tracing_status)
+
+
+def parse_delayed_record(delayed_record: dict[str, Any]) -> DelayedBagRecord:
+    """Walk a WTR_DelayedBagRecReadRS record once and extract all bags and delivery details."""
+    delayed_bags = _dict(_dict(delayed_record.get("DelayedBagGroup")).get("DelayedBags"))
+    bag_items = delayed_bags.get("DelayedBag")
+    bags = (
+        tuple(_parse_bag(item) for item in bag_items if isinstance(item, dict)) if isinstance(bag_items, list) else ()
+    )
+
+    no_of_bags_updated = delayed_bags.get("noOfBagsUpdated", 0)
+    if not isinstance(no_of_bags_updated, int):
+        try:
+            no_of_bags_updated = int(no_of_bags_updated)
+        except (TypeError, ValueError):
+            no_of_bags_updated = 0
+
+    record_status = delayed_record.get("RecordStatus")
+    return DelayedBagRecord(
+        record_status=record_status if isinstance(record_status, str) else None,
+        no_of_bags_updated=no_of_bags_updated,
+        bags=bags,
+        delivery_details=_build_delivery_details(delayed_record, bags),
+    )
+
+
+def _parse_bag(item: dict[str, Any]) -> BagRecord:
+    status = _dict(_dict(item.get("BagDelivery")).get("Status"))
+
+    delivered = None
+    for key in _DELIVERED_KEYS:
+        if delivered := _value(status.get(key)):
+            break
+    if not delivered:
+        # Fallback: different airlines/environments may expose delivered time under
+        # another key in BagDelivery.Status.
+        for key, value in status.items():
+            if "delivered" in str(key).lower() and (delivered := _value(value)):
+                break
+
+    tag = _dict(item.get("BagTag"))
+    tag_sequence = tag.get("TagSequence")
+    colour_code = _value(_dict(item.get("ColorTypeDesc")), "ColorCode").upper()
+    tracing_status = item.get("tracingStatus")
+    return BagRecord(
+        seq=item.get("Seq"),
+        tag_airline=_value(tag, "AirlineCode") or None,
+        tag_sequence=str(tag_sequence).strip() if tag_sequence is not None else None,
+        colour=COLOUR_NAMES.get(colour_code, colour_code) or None,
+        # Interned: the same few codes recur in every record of every entry.
+        tracing_status=(sys.intern(tracing_status.strip()) or None) if isinstance(tracing_status, str) else None,
+        pickup_datetime_local=_value(status.get("TrackingUpdate")) or None,
+        scheduled_delivery_local=_value(status.get("OutForDelivery")) or None,
+        delivered_datetime_local=delivered or None,
+        delivery_state=classify_delivery_status((status,)) if status else None,
+    )
+
+
+def _build_delivery_details(delayed_record: dict[str, Any], bags: tuple[BagRecord, ...]) -> dict[str, str] | None:
+    details: dict[str, str] = {}
+    first_bag = bags[0] if bags else None
+
+    # Structured bag delivery timestamps
+    if first_bag is not None:
+        if first_bag.pickup_datetime_local:
+            details["pickup_datetime_local"] = first_bag.pickup_datetime_local
+        if first_bag.scheduled_delivery_local:
+            details["scheduled_delivery_local"] = first_bag.scheduled_delivery_local
+        if first_bag.delivered_datetime_local:
+            details["delivered_datetime_local"] = first_bag.delivered_datetime_local
+
+    # Passenger/contact details
+    passenger = _dict(delayed_record.get("Passengers"))
+    contact = _dict(passenger.get("ContactInfo"))
+    permanent = _dict(contact.get("PermanentAddress"))
+    if last_name := _value(_first(_dict(passenger.get("Names")).get("Name"))):
+        details["passenger_name"] = last_name
+    if phone := _value(_first(_dict(contact.get("CellPhones")).get("Phone"))):
+        details["telephone_number"] = phone
+
+    country_obj = _dict(permanent.get("Country"))
+    country = _value(country_obj)
+    country_code = _value(country_obj, "Code").upper()
+    if not country and country_code:
+        country = COUNTRY_NAMES.get(country_code, country_code)
+    address_parts = [
+        part
+        for part in (
+            _value(_first(permanent.get("AddressLine"))),
+            _value(permanent.get("City")),
+            _value(permanent.get("State")),
+            _value(permanent.get("PostalCode")),
+            country,
+        )
+        if part
+    ]
+    if address_parts:
+        details["delivery_address"] = ", ".join(address_parts)
+
+    # Bag details
+    if first_bag is not None:
+        if tag := first_bag.tag:
+            details["tag_details"] = tag
+        if first_bag.colour:
+            details["baggage_colour"] = first_bag.colour
+    if bags:
+        details["number_of_baggage_in_delivery"] = str(len(bags))
+
+    # Encoded delivery details block (source for courier website and commission date)
+    delivery_info = _dict(_dict(delayed_record.get("AdditionalInfo")).get("DeliveryInfo"))
+    delivery_info_text = _value(_first(delivery_info.get("Text")))
+    for line in delivery_info_text.splitlines():
+        line = line.strip()
+        if line.startswith("DS "):
+            parts = [p.strip() for p in line[3:].split(" - ") if p.strip()]
+            if len(parts) >= 2:
+                details["delivery_reference"] = parts[0]
+                details["delivery_service"] = parts[1]
+        elif line.startswith("CW "):
+            site = line[3:].strip().replace("/D/", ".").strip("/")
+            if site:
+                details["courier_website"] = site
+                details["courier_tracking_url"] = (
+                    site if site.lower().startswith(("http://", "https://")) else f"https://{site}"
+                )
+        elif line.startswith("ZP "):
+            # Example: ZP 14476 .DD 18FEB .DW ...
+            if match := _DD_RE.search(line):
+                details["commission_date"] = match.group(1).strip()
+        elif line.startswith("CT01 ") and "baggage_type" not in details:
+            details["baggage_type"] = line[5:].strip()
+
+    # Email fallback for human-readable baggage type and note text.
+    text_items = _dict(delayed_record.get("EmailInfo")).get("Text")
+    candidate = None
+    if isinstance(text_items, list):
+        for item in reversed(text_items):
+            value = item.get("value") if isinstance(item, dict) else None
+            if isinstance(value, str) and _DELIVERY_ORDER_MARKER in value:
+                candidate = value
+                break
+
+    if candidate:
+        if _NOTE_MARKER in candidate and "note" not in details:
+            details["note"] = candidate.split(_NOTE_MARKER, 1)[1].strip()
+        if "baggage_type" not in details and (bag_type_match := _BAG_TYPE_RE.search(candidate)):
+            details["baggage_type"] = bag_type_match.group(1).strip()
+        if created_match := _CREATED_BY_RE.search(candidate):
+            details["created_by"] = created_match.group(1).strip()
+
+    cleaned = {k: v for k, v in details.items() if v}
+    return cleaned or None
+
+
+_EMPTY: dict[str, Any] = {}
+
+
+def _dict(value: Any) -> dict[str, Any]:
+    """Return value if it is a dict, else a shared empty dict (never mutated)."""
+    return value if isinstance(value, dict) else _EMPTY
+
+
+def _first(value: Any) -> Any:
+    return value[0] if isinstance(value, list) and value else None
+
+
+def _value(node: Any, key: str = "value") -> str:
+    """Return the stripped string stored under key of a ``{"value": ...}`` node."""
+    if not isinstance(node, dict):
+        return ""
+    value = node.get(key)
+    return value.strip() if isinstance(value, str) else ""
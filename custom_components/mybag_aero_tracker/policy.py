@@ -0,0 +1,97 @@
+"""Adaptive polling policy driven by the last baggage state."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta, tzinfo
+
+from .const import (
+    DELIVERY_WINDOW,
+    DELIVERY_WINDOW_POLL_INTERVAL,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    STATE_POLL_FACTORS,
+    TERMINAL_POLL_INTERVAL,
+)
+from .models import BaggageStatus
+from .state import STATE_DELIVERED, STATE_NOT_FOUND
+
+_LOCAL_DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%d%b%Y %H:%M",
+    "%d %b %Y %H:%M",
+    "%d%b%y %H%M",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PollDecision:
+    """When the next check runs and why."""
+
+    interval: timedelta
+    next_check_at: datetime
+    reason: str
+
+    def as_attributes(self) -> dict[str, str | int]:
+        """Return the decision as state attributes."""
+        return {
+            "poll_policy": self.reason,
+            "poll_interval_minutes": round(self.interval.total_seconds() / 60),
+            "next_check_at": self.next_check_at.isoformat(),
+        }
+
+
+def decide_next_poll(
+    status: BaggageStatus,
+    base_interval: timedelta,
+    *,
+    now: datetime,
+    local_tz: tzinfo,
+) -> PollDecision:
+    """Pick the delay until the next check for the given status."""
+    if status.state in (STATE_DELIVERED, STATE_NOT_FOUND):
+        return _decision(TERMINAL_POLL_INTERVAL, now, f"terminal_{status.state}")
+
+    factor = STATE_POLL_FACTORS.get(status.state, 1.0)
+    interval = min(max(base_interval * factor, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+    reason = f"state_{status.state}"
+
+    scheduled = parse_local_datetime((status.delivery_details or {}).get("scheduled_delivery_local"), local_tz)
+    if scheduled is not None:
+        if abs(scheduled - now) <= DELIVERY_WINDOW and DELIVERY_WINDOW_POLL_INTERVAL < interval:
+            interval = DELIVERY_WINDOW_POLL_INTERVAL
+            reason = "delivery_window"
+        if now < scheduled < now + interval:
+            # Wake up exactly when the delivery is due.
+            return PollDecision(interval=scheduled - now, next_check_at=scheduled, reason="delivery_wakeup")
+
+    return _decision(interval, now, reason)
+
+
+def parse_local_datetime(value: str | None, local_tz: tzinfo) -> datetime | None:
+    """Parse a mybag.aero local timestamp into an aware UTC datetime."""
+    if not value:
+        return None
+    text = value.strip()
+    parsed: datetime | None = None
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        for fmt in _LOCAL_DATETIME_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            break
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=local_tz)
+    return parsed.astimezone(UTC)
+
+
+def _decision(interval: timedelta, now: datetime, reason: str) -> PollDecision:
+    return PollDecision(interval=interval, next_check_at=now + interval, reason=reason)
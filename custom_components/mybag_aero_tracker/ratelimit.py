@@ -0,0 +1,110 @@
+"""Domain-wide outbound request budget for mybag.aero."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from .const import DEFAULT_REQUEST_BURST, DEFAULT_REQUESTS_PER_MINUTE
+
+# Lanes: lower values are served first.
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+
+
+class TokenBucketLimiter:
+    """Token bucket shared by every outbound request of the integration.
+
+    Tokens refill at ``requests_per_minute`` up to ``burst``. When the bucket is
+    empty, callers queue per priority lane and are released in lane order (FIFO
+    within a lane), so a user-triggered refresh overtakes queued background polls.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        burst: int = DEFAULT_REQUEST_BURST,
+    ) -> None:
+        self._rate = max(requests_per_minute, 0.001) / 60
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.granted = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of callers waiting for a token."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    async def async_acquire(self, priority: int = PRIORITY_BACKGROUND) -> float:
+        """Wait for a token and return how long the caller waited (seconds)."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.granted += 1
+            return 0.0
+
+        started = time.monotonic()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._schedule_drain()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The token was handed over just before the cancellation; give it back.
+                self._tokens = min(self._burst, self._tokens + 1)
+                self._schedule_drain()
+            raise
+
+        waited = time.monotonic() - started
+        self.granted += 1
+        self.delayed += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return limiter metrics."""
+        return {
+            "requests_per_minute": round(self._rate * 60, 3),
+            "burst": self._burst,
+            "queue_depth": self.queue_depth,
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "average_wait_seconds": round(self.total_wait / self.delayed, 3) if self.delayed else 0.0,
+            "max_wait_seconds": round(self.max_wait, 3),
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _drain(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+        self._schedule_drain()
+
+    def _schedule_drain(self) -> None:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if not self._waiters or self._timer is not None:
+            return
+        self._refill()
+        delay = max(0.0, (1 - self._tokens) / self._rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._drain)
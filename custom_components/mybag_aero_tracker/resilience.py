@@ -0,0 +1,162 @@
+"""Retry backoff and circuit breaking for mybag.aero hosts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Responses that say something about the host rather than the request.
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is short-circuited by an open breaker."""
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After."""
+
+    attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY_SECONDS
+    max_delay: float = RETRY_MAX_DELAY_SECONDS
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the delay before retry number ``attempt`` (0-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and rejects
+    requests for ``reset_seconds``, or for as long as the server asked with
+    Retry-After. Then a single probe request is let through (half-open); its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ) -> None:
+        self.host = host
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._state = BREAKER_CLOSED
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._state == BREAKER_OPEN and time.monotonic() >= self._opened_until:
+            return BREAKER_HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return True
+        if state == BREAKER_HALF_OPEN and not self._probe_in_flight:
+            self._state = BREAKER_HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a healthy response."""
+        if self._state != BREAKER_CLOSED:
+            _LOGGER.info("mybag API at %s recovered, closing circuit breaker", self.host)
+        self._state = BREAKER_CLOSED
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+
+    def release_probe(self) -> None:
+        """Let another request probe when the current one ended without an outcome."""
+        self._probe_in_flight = False
+
+    def record_failure(self, cooldown: float | None = None) -> None:
+        """Count a failure; open the breaker at the threshold, or for ``cooldown`` when the server imposed one."""
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if cooldown:
+            self._open(cooldown)
+        elif self._state == BREAKER_HALF_OPEN or self.consecutive_failures >= self._failure_threshold:
+            self._open(self._reset_seconds)
+
+    def as_dict(self) -> dict[str, str | int]:
+        """Return the breaker state for monitoring."""
+        return {
+            "host": self.host,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+
+    def _open(self, seconds: float) -> None:
+        if self._state != BREAKER_OPEN:
+            self.times_opened += 1
+            _LOGGER.warning("mybag API at %s keeps failing, pausing requests for %.0f s", self.host, seconds)
+        self._state = BREAKER_OPEN
+        self._opened_until = time.monotonic() + seconds
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per host, shared by every client."""
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        """Return the breaker for a host, creating it on first use."""
+        if (breaker := self._breakers.get(host)) is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def as_dict(self) -> dict[str, dict[str, str | int]]:
+        """Return the state of every breaker."""
+        return {host: breaker.as_dict() for host, breaker in self._breakers.items()}
@@ -0,0 +1,244 @@
+"""Fleet scheduler running the status checks of all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import hashlib
+import itertools
+import logging
+import random
+import time
+
+from .api import MyBagApiClient
+from .const import DEFAULT_MAX_CONCURRENT_CHECKS, PHASE_JITTER_FRACTION, PHASE_MAX_JITTER_SECONDS
+from .models import BaggageStatus
+from .ratelimit import PRIORITY_BACKGROUND, PRIORITY_USER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def stable_phase(key: str, interval_seconds: float) -> float:
+    """Return the fixed offset (0..interval) at which ``key`` polls within each interval.
+
+    Derived from a hash of the key, so it is the same across restarts and reloads.
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64 * interval_seconds
+
+
+def first_poll_delay(key: str, interval_seconds: float, *, now: float | None = None) -> float:
+    """Return the delay until the key's next phase slot on the wall clock, plus bounded jitter."""
+    if interval_seconds <= 0:
+        return 0.0
+    now = time.time() if now is None else now
+    delay = (stable_phase(key, interval_seconds) - now) % interval_seconds
+    jitter = min(PHASE_MAX_JITTER_SECONDS, interval_seconds * PHASE_JITTER_FRACTION)
+    return delay + random.uniform(0, jitter)
+
+
+@dataclass
+class _ScheduledCheck:
+    """Book-keeping for one registered client."""
+
+    client: MyBagApiClient
+    interval: float
+    on_result: Callable[[BaggageStatus], None]
+    next_delay: Callable[[BaggageStatus], float] | None
+    next_due: float
+    queued: bool = False
+    running: bool = False
+    priority: int = PRIORITY_BACKGROUND
+    waiters: list[asyncio.Future[BaggageStatus]] = field(default_factory=list)
+
+
+class MyBagFleetScheduler:
+    """Owns every MyBagApiClient and runs due checks through a bounded worker pool.
+
+    A single timer tracks the earliest due check. Due checks are queued and executed
+    by at most ``max_concurrency`` workers, so the number of simultaneous requests
+    stays fixed no matter how many entries are registered. Results are handed to the
+    per-entry callback (usually the coordinator's ``async_set_updated_data``).
+    On-demand checks are queued in the user lane and overtake background polls.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENT_CHECKS) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._checks: dict[str, _ScheduledCheck] = {}
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the worker pool size."""
+        return self._max_concurrency
+
+    @property
+    def queued(self) -> int:
+        """Return the number of checks waiting for a worker."""
+        return self._queue.qsize()
+
+    def as_dict(self) -> dict[str, int]:
+        """Return pool metrics."""
+        return {
+            "registered": len(self._checks),
+            "max_concurrency": self._max_concurrency,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+        }
+
+    def async_register(
+        self,
+        key: str,
+        client: MyBagApiClient,
+        interval_seconds: float,
+        on_result: Callable[[BaggageStatus], None],
+        next_delay: Callable[[BaggageStatus], float] | None = None,
+    ) -> None:
+        """Register a client; its first scheduled check falls on the key's stable phase.
+
+        Phases are spread over the interval by key, so entries set up together do
+        not poll in lockstep. ``next_delay`` may pick the delay after each result;
+        otherwise the fixed interval is used.
+        """
+        loop = asyncio.get_running_loop()
+        next_due = loop.time() + first_poll_delay(key, interval_seconds)
+        self._checks[key] = _ScheduledCheck(
+            client=client,
+            interval=interval_seconds,
+            on_result=on_result,
+            next_delay=next_delay,
+            next_due=next_due,
+        )
+        self._arm_timer(next_due)
+
+    def async_reschedule(self, key: str, delay: float) -> None:
+        """Move the next scheduled check of a registered client to ``delay`` seconds from now."""
+        check = self._checks[key]
+        check.next_due = asyncio.get_running_loop().time() + max(0.0, delay)
+        self._arm_timer(check.next_due)
+
+    def async_unregister(self, key: str) -> None:
+        """Forget a client; an in-flight check finishes but its result is dropped."""
+        check = self._checks.pop(key, None)
+        if check is not None:
+            for waiter in check.waiters:
+                if not waiter.done():
+                    waiter.cancel()
+
+    async def async_check(self, key: str, priority: int = PRIORITY_USER) -> BaggageStatus:
+        """Run a check for a registered client now (through the pool) and return it.
+
+        A check that is already running is joined instead of starting another one.
+        """
+        check = self._checks[key]
+        waiter: asyncio.Future[BaggageStatus] = asyncio.get_running_loop().create_future()
+        check.waiters.append(waiter)
+        self._enqueue(key, check, priority)
+        return await waiter
+
+    async def async_shutdown(self) -> None:
+        """Stop the timer and the workers."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def _enqueue(self, key: str, check: _ScheduledCheck, priority: int = PRIORITY_BACKGROUND) -> None:
+        if check.running or (check.queued and priority >= check.priority):
+            return
+        # Re-queueing at a better priority leaves a stale entry behind; workers skip it.
+        check.queued = True
+        check.priority = priority
+        self._queue.put_nowait((priority, next(self._sequence), key))
+        # Replace workers that died, so queued checks are never left without one.
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        if len(self._workers) < self._max_concurrency:
+            loop = asyncio.get_running_loop()
+            self._workers.extend(
+                loop.create_task(self._async_worker()) for _ in range(self._max_concurrency - len(self._workers))
+            )
+
+    def _arm_timer(self, when: float) -> None:
+        """Make sure the timer fires no later than ``when``."""
+        if self._timer is not None:
+            if self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_at(when, self._dispatch_due)
+
+    def _dispatch_due(self) -> None:
+        self._timer = None
+        now = asyncio.get_running_loop().time()
+        next_due: float | None = None
+        for key, check in list(self._checks.items()):
+            if check.queued or check.running:
+                continue
+            if check.next_due <= now:
+                self._enqueue(key, check)
+            elif next_due is None or check.next_due < next_due:
+                next_due = check.next_due
+        if next_due is not None:
+            self._arm_timer(next_due)
+
+    async def _async_worker(self) -> None:
+        while True:
+            priority, _, key = await self._queue.get()
+            try:
+                check = self._checks.get(key)
+                if check is not None and check.queued and check.priority == priority:
+                    await self._async_run(key, check)
+            except Exception:
+                _LOGGER.exception("Unexpected error running the check of %s", key)
+            finally:
+                self._queue.task_done()
+
+    async def _async_run(self, key: str, check: _ScheduledCheck) -> None:
+        check.queued = False
+        check.running = True
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        status: BaggageStatus | None = None
+        error: Exception | None = None
+        delay = check.interval
+        try:
+            status = await check.client.async_check_status(priority=check.priority)
+            if check.next_delay is not None:
+                delay = check.next_delay(status)
+        except Exception as err:
+            _LOGGER.exception("Unexpected error checking %s", key)
+            error = err
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            check.running = False
+            check.next_due = asyncio.get_running_loop().time() + delay
+
+        waiters, check.waiters = check.waiters, []
+        if self._checks.get(key) is not check:
+            return
+        try:
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if error is not None:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(status)
+            if not waiters and status is not None:
+                check.on_result(status)
+        except Exception:
+            _LOGGER.exception("Unexpected error handling the result of %s", key)
+        finally:
+            self._arm_timer(check.next_due)
@@ -2,14 +2,128 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import CONF_AIRLINE, CONF_REFERENCE_NUMBER, DOMAIN
 from .coordinator import MyBagDataUpdateCoordinator
+from .entity import MyBagStatusEntity
+from .metrics import CheckMetrics
+from .models import BaggageStatus
+from .policy import parse_local_datetime
+
+# Volatile or bulky attributes: shown in the UI but kept out of the recorder, so an
+# attributes row is only written when something worth keeping changes.
+STATUS_UNRECORDED_ATTRIBUTES = frozenset(
+    {
+        "checked_at",
+        "raw_excerpt",
+        "delivery_details",
+        "bags",
+        "status_steps",
+        "status_body",
+        "details",
+        "message",
+        "tracing_statuses",
+        "validator",
+        "login_requests",
+        "validator_retries",
+        "http_retries",
+        "api_circuit_breaker",
+        "rate_limit_wait_seconds",
+        "timeline",
+    }
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MyBagDeliverySensorDescription(SensorEntityDescription):
+    """Describes a sensor for one fact of the baggage status."""
+
+    value_fn: Callable[[BaggageStatus, tzinfo], StateType | datetime]
+
+
+def _delivery_time(key: str) -> Callable[[BaggageStatus, tzinfo], datetime | None]:
+    return lambda status, local_tz: parse_local_datetime((status.delivery_details or {}).get(key), local_tz)
+
+
+DELIVERY_SENSORS: tuple[MyBagDeliverySensorDescription, ...] = (
+    MyBagDeliverySensorDescription(
+        key="scheduled_delivery",
+        translation_key="scheduled_delivery",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_delivery_time("scheduled_delivery_local"),
+    ),
+    MyBagDeliverySensorDescription(
+        key="delivered_at",
+        translation_key="delivered_at",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_delivery_time("delivered_datetime_local"),
+    ),
+    MyBagDeliverySensorDescription(
+        key="courier",
+        translation_key="courier",
+        icon="mdi:truck-delivery-outline",
+        value_fn=lambda status, local_tz: (status.delivery_details or {}).get("delivery_service"),
+    ),
+    MyBagDeliverySensorDescription(
+        key="bag_count",
+        translation_key="bag_count",
+        icon="mdi:bag-suitcase-outline",
+        value_fn=lambda status, local_tz: len(status.bags) if status.bags else None,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MyBagDiagnosticSensorDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor fed from the client's check metrics."""
+
+    value_fn: Callable[[CheckMetrics], float | int | None]
+
+
+DIAGNOSTIC_SENSORS: tuple[MyBagDiagnosticSensorDescription, ...] = (
+    MyBagDiagnosticSensorDescription(
+        key="last_check_duration",
+        translation_key="last_check_duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.last_check_duration,
+    ),
+    MyBagDiagnosticSensorDescription(
+        key="check_duration_p95",
+        translation_key="check_duration_p95",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.check_duration_p95,
+    ),
+    MyBagDiagnosticSensorDescription(
+        key="failure_streak",
+        translation_key="failure_streak",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:alert-circle-outline",
+        value_fn=lambda metrics: metrics.failure_streak,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -19,15 +133,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up MyBag Tracker sensor from config entry."""
     coordinator: MyBagDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([MyBagStatusSensor(coordinator, entry)])
+    async_add_entities(
+        [
+            MyBagStatusSensor(coordinator, entry),
+            *(MyBagDeliverySensor(coordinator, entry, description) for description in DELIVERY_SENSORS),
+            MyBagNextCheckSensor(coordinator, entry),
+            *(MyBagDiagnosticSensor(coordinator, entry, description) for description in DIAGNOSTIC_SENSORS),
+        ]
+    )
 
 
-class MyBagStatusSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEntity):
+class MyBagStatusSensor(MyBagStatusEntity, SensorEntity):
     """Represents the delayed baggage status."""
 
     _attr_has_entity_name = True
     _attr_name = "Status"
     _attr_icon = "mdi:bag-checked"
+    _unrecorded_attributes = STATUS_UNRECORDED_ATTRIBUTES
 
     def __init__(self, coordinator: MyBagDataUpdateCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator)
@@ -35,6 +157,8 @@ class MyBagStatusSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEnt
         reference = self._entry.data[CONF_REFERENCE_NUMBER]
         self._attr_unique_id = f"{entry.entry_id}_status"
         self._attr_translation_key = "status"
+        self._status_attributes: dict = {}
+        self._status_attributes_version: int | None = None
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.entry_id)},
             "name": f"MyBag {reference}",
@@ -49,8 +173,25 @@ class MyBagStatusSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEnt
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Return structured status data."""
-        data = self.coordinator.data
+        """Return structured status data with the client's current counters."""
+        if self.coordinator.status_version != self._status_attributes_version:
+            self._status_attributes = self._build_status_attributes(self.coordinator.data)
+            self._status_attributes_version = self.coordinator.status_version
+        client = self.coordinator.client
+        # Client counters and the timeline are not part of the status digest; read them on each write.
+        return {
+            **self._status_attributes,
+            "validator": client.last_validator,
+            "login_requests": client.login_requests,
+            "validator_retries": client.validator_retries,
+            "http_retries": client.http_retries,
+            "api_circuit_breaker": client.circuit_breaker.state,
+            "rate_limit_wait_seconds": round(client.last_rate_limit_wait, 3),
+            "timeline": [entry.as_dict() for entry in self.coordinator.timeline],
+        }
+
+    @staticmethod
+    def _build_status_attributes(data: BaggageStatus) -> dict:
         return {
             "airline": data.airline,
             "reference_number": data.reference_number,
@@ -64,6 +205,7 @@ class MyBagStatusSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEnt
             "current_status_text": data.current_status_text,
             "status_body": data.status_body,
             "delivery_details": data.delivery_details,
+            "bags": data.bags,
             "no_of_bags_updated": data.no_of_bags_updated,
             "record_status": data.record_status,
             "message": data.message,
@@ -71,3 +213,93 @@ class MyBagStatusSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEnt
             "source_url": data.url,
             "raw_excerpt": data.raw_excerpt,
         }
+
+
+class MyBagDeliverySensor(MyBagStatusEntity, SensorEntity):
+    """One fact of the baggage status (delivery time, courier, bag count) as its own sensor."""
+
+    _attr_has_entity_name = True
+    entity_description: MyBagDeliverySensorDescription
+
+    def __init__(
+        self,
+        coordinator: MyBagDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: MyBagDeliverySensorDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+        }
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the value taken from the current status."""
+        local_tz = dt_util.get_time_zone(self.hass.config.time_zone) or dt_util.UTC
+        return self.entity_description.value_fn(self.coordinator.data, local_tz)
+
+
+class MyBagDiagnosticSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEntity):
+    """Check timing or failure metric of one tracked file (disabled by default)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    entity_description: MyBagDiagnosticSensorDescription
+
+    def __init__(
+        self,
+        coordinator: MyBagDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: MyBagDiagnosticSensorDescription,
+    ) -> None:
+        # Written after every check: the metrics change even when the status does not.
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+        }
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator.client.metrics)
+
+
+class MyBagNextCheckSensor(CoordinatorEntity[MyBagDataUpdateCoordinator], SensorEntity):
+    """When the next check runs, and the polling policy that chose it (disabled by default)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:timer-sync-outline"
+    _attr_translation_key = "next_check"
+
+    def __init__(self, coordinator: MyBagDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        # Written after every check: each one makes a new decision, even when the status does not change.
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_next_check"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+        }
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time of the next scheduled check."""
+        decision = self.coordinator.poll_decision
+        return decision.next_check_at if decision is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str | int] | None:
+        """Return the policy and interval behind the next check."""
+        decision = self.coordinator.poll_decision
+        if decision is None:
+            return None
+        attributes = decision.as_attributes()
+        # Already the state.
+        del attributes["next_check_at"]
+        return attributes
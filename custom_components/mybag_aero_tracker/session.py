@@ -0,0 +1,61 @@
+"""Connection pool for the mybag.aero endpoints."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig, TraceConnectionCreateEndParams
+
+from .const import (
+    DEFAULT_MAX_CONCURRENT_CHECKS,
+    DEFAULT_TIMEOUT_SECONDS,
+    SESSION_DNS_CACHE_SECONDS,
+    SESSION_KEEPALIVE_SECONDS,
+)
+from .metrics import PHASE_CONNECT, CheckMetrics
+
+
+def create_session(
+    *,
+    limit_per_host: int = DEFAULT_MAX_CONCURRENT_CHECKS,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    **connector_kwargs: Any,
+) -> ClientSession:
+    """Create a keep-alive session for wtss-api.mybag.aero and mybag.aero.
+
+    Connections are kept open between polls and DNS answers are cached, so
+    staggered checks reuse an established TLS connection instead of opening a new
+    one each time. ``limit_per_host`` should match the number of concurrent checks.
+    Requests that pass a CheckMetrics as ``trace_request_ctx`` get the time spent
+    opening new connections recorded as the ``connect`` phase.
+    """
+    connector = TCPConnector(
+        limit_per_host=max(1, limit_per_host),
+        keepalive_timeout=SESSION_KEEPALIVE_SECONDS,
+        ttl_dns_cache=SESSION_DNS_CACHE_SECONDS,
+        **connector_kwargs,
+    )
+    return ClientSession(
+        connector=connector,
+        timeout=ClientTimeout(total=timeout_seconds),
+        trace_configs=[_connect_timing()],
+    )
+
+
+def _connect_timing() -> TraceConfig:
+    trace = TraceConfig()
+
+    async def on_connection_create_start(session: ClientSession, context: SimpleNamespace, params: Any) -> None:
+        context.connect_started = time.perf_counter()
+
+    async def on_connection_create_end(
+        session: ClientSession, context: SimpleNamespace, params: TraceConnectionCreateEndParams
+    ) -> None:
+        if isinstance(context.trace_request_ctx, CheckMetrics):
+            context.trace_request_ctx.record_phase(PHASE_CONNECT, time.perf_counter() - context.connect_started)
+
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    return trace
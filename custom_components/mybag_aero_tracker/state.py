@@ -0,0 +1,112 @@
+"""Table-driven classification of mybag.aero tracing data into tracker states."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import re
+from typing import Any
+
+from .const import TRACING_STATUS_FAMILY_STATES
+
+STATE_SEARCHING = "searching"
+STATE_LOCATED = "located"
+STATE_RECEIVED = "received"
+STATE_SCHEDULED_FOR_DELIVERY = "scheduled_for_delivery"
+STATE_DELIVERED = "delivered"
+STATE_NOT_FOUND = "not_found"
+STATE_ERROR = "error"
+
+# Progress order of the tracking states; a later state wins when signals disagree.
+STATE_RANK = {
+    STATE_SEARCHING: 0,
+    STATE_LOCATED: 1,
+    STATE_RECEIVED: 2,
+    STATE_SCHEDULED_FOR_DELIVERY: 3,
+    STATE_DELIVERED: 4,
+}
+
+# BagDelivery.Status keys that carry a timestamp once the step has happened.
+DEFAULT_DELIVERY_STATUS_STATES: dict[str, str] = {
+    "OutForDelivery": STATE_SCHEDULED_FOR_DELIVERY,
+    "Delivered": STATE_DELIVERED,
+    "DeliveryComplete": STATE_DELIVERED,
+    "DeliveredToCustomer": STATE_DELIVERED,
+}
+
+_TRACING_FAMILY_RE = re.compile(r"[A-Z]+_\d+")
+
+# English catalog wording, only used for codes outside the known tracing-status families.
+_TEXT_RULES: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("DELIVERED",), STATE_DELIVERED),
+    (("SCHEDULED FOR DELIVERY", "OUT FOR DELIVERY"), STATE_SCHEDULED_FOR_DELIVERY),
+    (("WE HAVE RECEIVED YOUR BAGGAGE",), STATE_RECEIVED),
+    (("HAS BEEN LOCATED",), STATE_LOCATED),
+)
+
+
+def classify_text(current_status_text: str | None, status_body: str | None) -> str:
+    """Classify catalog texts with the legacy substring heuristics."""
+    text = " ".join(
+        [part.strip().upper() for part in [current_status_text or "", status_body or ""] if part and part.strip()]
+    )
+    for needles, state in _TEXT_RULES:
+        if any(needle in text for needle in needles):
+            return state
+    # Non-searching but unmatched detailed text.
+    return STATE_LOCATED
+
+
+def tracing_status_state(
+    tracing_status: str, families: Mapping[str, str] = TRACING_STATUS_FAMILY_STATES
+) -> str | None:
+    """Return the state of a tracingStatus code from its family, if the family is known."""
+    match = _TRACING_FAMILY_RE.match(tracing_status)
+    return families.get(match.group()) if match else None
+
+
+def build_tracing_status_states(
+    index: Mapping[str, tuple[Any, str | None, str | None]],
+    overrides: Mapping[str, str] | None = None,
+) -> dict[str, str]:
+    """Precompute the tracingStatus -> state table for a catalog index.
+
+    Codes are mapped by their family; only codes outside the known families are
+    classified from their catalog texts. ``overrides`` take precedence and may also
+    add codes the catalog does not know.
+    """
+    table: dict[str, str] = {}
+    for tracing_status, (_, current_status_text, status_body) in index.items():
+        state = tracing_status_state(tracing_status)
+        table[tracing_status] = state if state is not None else classify_text(current_status_text, status_body)
+    if overrides:
+        table.update(overrides)
+    return table
+
+
+def classify_delivery_status(
+    statuses: Iterable[Mapping[str, Any]],
+    table: Mapping[str, str] = DEFAULT_DELIVERY_STATUS_STATES,
+) -> str | None:
+    """Return the most advanced state implied by BagDelivery.Status timestamps."""
+    best: str | None = None
+    for status in statuses:
+        for key, value in status.items():
+            state = table.get(key)
+            if state is None:
+                # Different airlines/environments may expose delivered time under another key.
+                if "delivered" not in key.lower():
+                    continue
+                state = STATE_DELIVERED
+            if not isinstance(value, dict) or not str(value.get("value") or "").strip():
+                continue
+            best = most_advanced(best, state)
+    return best
+
+
+def most_advanced(first: str | None, second: str | None) -> str | None:
+    """Return whichever of two tracking states is further along."""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return second if STATE_RANK.get(second, -1) > STATE_RANK.get(first, -1) else first
@@ -0,0 +1,129 @@
+"""Persisted last-known status and transition timeline per config entry."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    STATUS_SAVE_DELAY_SECONDS,
+    STATUS_STORAGE_KEY,
+    STATUS_STORAGE_VERSION,
+    TIMELINE_MAX_ENTRIES,
+    TIMELINE_SAVE_DELAY_SECONDS,
+    TIMELINE_STORAGE_KEY,
+    TIMELINE_STORAGE_VERSION,
+)
+from .models import BaggageStatus
+from .timeline import TimelineEntry, append_transition
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MyBagStatusStore:
+    """Keeps the last good BaggageStatus of every entry in one storage file.
+
+    Writes are coalesced with a delayed save, so a poll storm results in a single
+    write; Home Assistant flushes pending saves on shutdown.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, dict[str, Any]]] = Store(hass, STATUS_STORAGE_VERSION, STATUS_STORAGE_KEY)
+        self._statuses: dict[str, dict[str, Any]] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load saved statuses once."""
+        async with self._lock:
+            if self._statuses is not None:
+                return
+            stored = await self._store.async_load()
+            self._statuses = stored if isinstance(stored, dict) else {}
+
+    def get(self, entry_id: str) -> BaggageStatus | None:
+        """Return the saved status of an entry, if any."""
+        data = (self._statuses or {}).get(entry_id)
+        if data is None:
+            return None
+        try:
+            return BaggageStatus.from_dict(data)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring unreadable saved status for %s: %s", entry_id, err)
+            return None
+
+    @callback
+    def async_save_status(self, entry_id: str, status: BaggageStatus) -> None:
+        """Remember a status and schedule a write."""
+        if self._statuses is None:
+            return
+        self._statuses[entry_id] = status.as_dict()
+        self._store.async_delay_save(self._data_to_save, STATUS_SAVE_DELAY_SECONDS)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the status of a removed entry."""
+        if self._statuses is not None and self._statuses.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STATUS_SAVE_DELAY_SECONDS)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        return self._statuses or {}
+
+
+class MyBagTimelineStore:
+    """Keeps the transition timeline of every entry in one storage file.
+
+    Only transitions are stored (at most TIMELINE_MAX_ENTRIES per entry), so the
+    file changes when a bag moves on, not on every poll.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, list[dict[str, str]]]] = Store(
+            hass, TIMELINE_STORAGE_VERSION, TIMELINE_STORAGE_KEY
+        )
+        self._timelines: dict[str, list[TimelineEntry]] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load saved timelines once."""
+        async with self._lock:
+            if self._timelines is not None:
+                return
+            stored = await self._store.async_load()
+            self._timelines = {}
+            for entry_id, entries in (stored if isinstance(stored, dict) else {}).items():
+                try:
+                    self._timelines[entry_id] = [TimelineEntry.from_dict(entry) for entry in entries]
+                except (KeyError, TypeError) as err:
+                    _LOGGER.debug("Ignoring unreadable saved timeline for %s: %s", entry_id, err)
+
+    def get(self, entry_id: str) -> list[TimelineEntry]:
+        """Return the timeline of an entry, oldest first."""
+        return (self._timelines or {}).get(entry_id, [])
+
+    @callback
+    def async_add(self, entry_id: str, status: BaggageStatus) -> TimelineEntry | None:
+        """Record the status if it is a transition; return the new entry."""
+        if self._timelines is None:
+            return None
+        timeline = self._timelines.setdefault(entry_id, [])
+        entry = append_transition(timeline, status, TIMELINE_MAX_ENTRIES)
+        if entry is not None:
+            self._store.async_delay_save(self._data_to_save, TIMELINE_SAVE_DELAY_SECONDS)
+        return entry
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the timeline of a removed entry."""
+        if self._timelines is not None and self._timelines.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, TIMELINE_SAVE_DELAY_SECONDS)
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[dict[str, str]]]:
+        return {
+            entry_id: [entry.as_dict() for entry in timeline] for entry_id, timeline in (self._timelines or {}).items()
+        }
@@ -0,0 +1,53 @@
+"""Deduplicated, size-bounded timeline of status transitions."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+from .models import BaggageStatus
+from .state import STATE_ERROR
+
+
+class TimelineEntry(NamedTuple):
+    """One state or tracing-status transition, as first seen by a check."""
+
+    at: str
+    state: str
+    tracing_status: str | None = None
+    headline: str | None = None
+
+    @classmethod
+    def from_status(cls, status: BaggageStatus) -> TimelineEntry:
+        """Return the timeline entry describing a status."""
+        return cls(status.checked_at.isoformat(), status.state, status.primary_tracing_status, status.headline)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TimelineEntry:
+        """Rebuild an entry saved with as_dict."""
+        return cls(data["at"], data["state"], data.get("tracing_status"), data.get("headline"))
+
+    def as_dict(self) -> dict[str, str]:
+        """Return the non-empty fields, for storage and state attributes."""
+        return {key: value for key, value in self._asdict().items() if value is not None}
+
+    def same_step(self, other: TimelineEntry) -> bool:
+        """Return whether both entries describe the same state and tracing status."""
+        return self.state == other.state and self.tracing_status == other.tracing_status
+
+
+def append_transition(
+    timeline: list[TimelineEntry], status: BaggageStatus, max_entries: int
+) -> TimelineEntry | None:
+    """Append ``status`` when it is a transition from the last entry; return the new entry.
+
+    Error statuses say nothing about the bag and are never recorded. The oldest
+    entries are dropped once the timeline holds more than ``max_entries``.
+    """
+    if status.state == STATE_ERROR:
+        return None
+    entry = TimelineEntry.from_status(status)
+    if timeline and timeline[-1].same_step(entry):
+        return None
+    timeline.append(entry)
+    del timeline[:-max_entries]
+    return entry
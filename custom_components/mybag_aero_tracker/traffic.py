@@ -0,0 +1,272 @@
+"""Record and replay of complete mybag.aero request/response pairs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable, Mapping
+import gzip
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .const import DEFAULT_TRAFFIC_MAX_MB, TRAFFIC_SEGMENTS
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = "traffic-*.jsonl.gz"
+# Only headers the client acts on are kept.
+_RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+# Request fields that change between checks of the same file without changing the answer.
+_VOLATILE_REQUEST_FIELDS = frozenset({"Validator", "captchaResponse"})
+# The catalog is the only resource fetched with GET; its URL differs between hosts and locales.
+_CATALOG_RESOURCE = "catalog"
+
+
+class TrafficArchive:
+    """Size-capped rolling archive of request/response pairs on disk.
+
+    Every exchange becomes one JSON line in a gzip segment. A new segment is
+    started once the current one reaches ``max_bytes / segments``, and the oldest
+    segments are deleted to keep the directory under ``max_bytes``. Exchanges are
+    buffered and written in the default executor, so recording never blocks the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int = DEFAULT_TRAFFIC_MAX_MB * 1024 * 1024,
+        segments: int = TRAFFIC_SEGMENTS,
+    ) -> None:
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._segment_bytes = max(1, max_bytes // max(1, segments))
+        self._segment: Path | None = None
+        self._pending: list[dict[str, Any]] = []
+        self._flush_task: asyncio.Task | None = None
+        self.recorded = 0
+        self.write_errors = 0
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        request_json: Any,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> None:
+        """Queue one exchange for writing."""
+        self._pending.append(
+            {
+                "time": time.time(),
+                "method": method,
+                "url": url,
+                "request": request_json,
+                "status": status,
+                "headers": {name: headers[name] for name in _RECORDED_HEADERS if name in headers},
+                "body": body.decode("utf-8", errors="replace"),
+            }
+        )
+        self.recorded += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._async_write_pending())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return recording counters for diagnostics."""
+        return {
+            "recorded": self.recorded,
+            "pending": len(self._pending),
+            "write_errors": self.write_errors,
+            "max_bytes": self._max_bytes,
+        }
+
+    async def async_flush(self) -> None:
+        """Wait until every queued exchange is on disk."""
+        if self._flush_task is not None:
+            await self._flush_task
+
+    async def _async_write_pending(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            exchanges, self._pending = self._pending, []
+            try:
+                await loop.run_in_executor(None, self._write, exchanges)
+            except OSError as err:
+                self.write_errors += 1
+                _LOGGER.warning("Could not write %d recorded exchanges: %s", len(exchanges), err)
+
+    def _write(self, exchanges: list[dict[str, Any]]) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        segments = sorted(self._directory.glob(SEGMENT_PATTERN))
+        if self._segment is None and segments:
+            self._segment = segments[-1]
+        if self._segment is None or not self._segment.exists() or self._segment.stat().st_size >= self._segment_bytes:
+            self._segment = self._directory / f"traffic-{time.time_ns():020d}.jsonl.gz"
+            segments.append(self._segment)
+
+        data = "".join(json.dumps(exchange, ensure_ascii=False) + "\n" for exchange in exchanges)
+        # Each batch is appended as its own gzip member; readers see one continuous stream.
+        with gzip.open(self._segment, "at", encoding="utf-8") as segment:
+            segment.write(data)
+
+        sizes = {path: path.stat().st_size for path in segments if path.exists()}
+        total = sum(sizes.values())
+        for path in sorted(sizes):
+            if total <= self._max_bytes or path == self._segment:
+                break
+            path.unlink(missing_ok=True)
+            total -= sizes[path]
+
+
+def load_exchanges(directory: str | Path) -> list[dict[str, Any]]:
+    """Return every exchange in an archive directory, oldest first (blocking I/O)."""
+    exchanges: list[dict[str, Any]] = []
+    for path in sorted(Path(directory).glob(SEGMENT_PATTERN)):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as segment:
+                exchanges.extend(json.loads(line) for line in segment if line.strip())
+        except (OSError, EOFError, ValueError) as err:
+            # The newest segment may end in a partial write.
+            _LOGGER.warning("Skipping the unreadable rest of %s: %s", path.name, err)
+    return exchanges
+
+
+class ReplaySession:
+    """Answers the client's requests from a recorded archive instead of the network.
+
+    Implements the small part of ClientSession that MyBagApiClient and the catalog
+    use. Logins match on URL path and JSON body, so a capture taken against one
+    host replays against any other; when no recording has the exact body (e.g. the
+    remembered validator changed since), any recorded answer for the same file is
+    used. Catalog fetches match by resource, whatever their URL. Several responses
+    recorded for the same request (e.g. a 503 and then its retry) are served in
+    order and the last one repeats. A request missing from the archive gets a 404.
+    304 responses are skipped because they have no body to serve.
+    """
+
+    def __init__(self, directory: str | Path | None = None, exchanges: Iterable[dict[str, Any]] | None = None) -> None:
+        self._directory = directory
+        self._responses: dict[tuple[str, str, str], deque[dict[str, Any]]] | None = None
+        self._stable_responses: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}
+        self._logins: list[dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self.closed = False
+        self.served = 0
+        self.missed = 0
+        if exchanges is not None:
+            self._index(exchanges)
+
+    async def async_load(self) -> None:
+        """Read the archive once, in the default executor."""
+        async with self._lock:
+            if self._responses is None:
+                exchanges = await asyncio.get_running_loop().run_in_executor(
+                    None, load_exchanges, self._directory or "."
+                )
+                self._index(exchanges)
+
+    def references(self) -> list[tuple[str, str, str]]:
+        """Return ``(airline code, file reference, family name)`` of every recorded check."""
+        seen: dict[tuple[str, str, str], None] = {}
+        for request in self._logins:
+            try:
+                reference = request["WTR_ReadRecordRQ"]["RecordID"]["RecordReference"]
+                airline_code = reference["AirlineCode"]
+                file_reference = f"{reference['StationCode']}{airline_code}{reference['ReferenceNumber']}"
+                seen[(airline_code, file_reference, reference["LastName"])] = None
+            except (KeyError, TypeError):
+                continue
+        return list(seen)
+
+    def get(self, url: str, **kwargs: Any) -> _ReplayRequest:
+        """Replay a GET request."""
+        return _ReplayRequest(self, "GET", url, None)
+
+    def post(self, url: str, *, json: Any = None, **kwargs: Any) -> _ReplayRequest:
+        """Replay a POST request."""
+        return _ReplayRequest(self, "POST", url, json)
+
+    async def close(self) -> None:
+        """Mark the session closed."""
+        self.closed = True
+
+    async def _async_respond(self, method: str, url: str, request_json: Any) -> _ReplayResponse:
+        await self.async_load()
+        queue = (self._responses or {}).get(_request_key(method, url, request_json))
+        if not queue:
+            queue = self._stable_responses.get(_request_key(method, url, request_json, stable=True))
+        if not queue:
+            self.missed += 1
+            return _ReplayResponse(404, {}, b"Not in the recorded archive")
+        exchange = queue.popleft() if len(queue) > 1 else queue[0]
+        self.served += 1
+        return _ReplayResponse(exchange["status"], exchange.get("headers") or {}, exchange["body"].encode())
+
+    def _index(self, exchanges: Iterable[dict[str, Any]]) -> None:
+        responses: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}
+        stable_responses: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}
+        for exchange in exchanges:
+            if exchange.get("status") == 304:
+                continue
+            method, url, request_json = exchange["method"], exchange["url"], exchange.get("request")
+            responses.setdefault(_request_key(method, url, request_json), deque()).append(exchange)
+            stable_responses.setdefault(_request_key(method, url, request_json, stable=True), deque()).append(exchange)
+            if exchange["method"] == "POST" and isinstance(exchange.get("request"), dict):
+                self._logins.append(exchange["request"])
+        self._responses = responses
+        self._stable_responses = stable_responses
+
+
+class _ReplayRequest:
+    """Async context manager returned by ReplaySession.get/post."""
+
+    def __init__(self, session: ReplaySession, method: str, url: str, request_json: Any) -> None:
+        self._session = session
+        self._method = method
+        self._url = url
+        self._request_json = request_json
+
+    async def __aenter__(self) -> _ReplayResponse:
+        return await self._session._async_respond(self._method, self._url, self._request_json)
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class _ReplayResponse:
+    """Recorded response with the ClientResponse attributes the integration reads."""
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes) -> None:
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode("utf-8", errors="replace")
+
+
+def _request_key(method: str, url: str, request_json: Any, *, stable: bool = False) -> tuple[str, str, str]:
+    if method == "GET":
+        return method, _CATALOG_RESOURCE, ""
+    if stable:
+        request_json = _without_volatile_fields(request_json)
+    return method, urlsplit(url).path, json.dumps(request_json, sort_keys=True, separators=(",", ":"))
+
+
+def _without_volatile_fields(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _without_volatile_fields(item) for key, item in value.items() if key not in _VOLATILE_REQUEST_FIELDS
+        }
+    return value
@@ -0,0 +1,126 @@
+"""Memory of which manageLogin validator works per reference and airline."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from .catalog import DataStore
+from .const import VALIDATOR_AIRLINE_CONSENSUS, VALIDATOR_SAVE_DELAY_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_VALIDATOR_ORDER = (1, 0)
+
+
+class ValidatorMemory:
+    """Remembers the validator that last succeeded, shared by all clients.
+
+    A reference-specific memory wins over the airline-wide one; both fall back to
+    the default order. A reference follows its latest success, so a stale preference
+    costs at most one extra round trip. The airline default only moves after
+    ``consensus`` consecutive successes with the other validator, so references that
+    disagree do not make it swing. Changes are written with a delayed save.
+    """
+
+    def __init__(
+        self,
+        store: DataStore | None = None,
+        *,
+        consensus: int = VALIDATOR_AIRLINE_CONSENSUS,
+        save_delay: float = VALIDATOR_SAVE_DELAY_SECONDS,
+    ) -> None:
+        self._store = store
+        self._consensus = max(1, consensus)
+        self._save_delay = save_delay
+        self._references: dict[str, int] = {}
+        self._airlines: dict[str, int] = {}
+        self._streaks: dict[str, tuple[int, int]] = {}
+        self._dirty = False
+        self._loaded = store is None
+        self._lock = asyncio.Lock()
+
+    async def async_order(self, airline: str, reference_number: str) -> tuple[int, int]:
+        """Return the validators to try, best candidate first."""
+        if not self._loaded:
+            await self._async_load()
+        preferred = self._references.get(_reference_key(airline, reference_number), self._airlines.get(airline))
+        if preferred is None or preferred == DEFAULT_VALIDATOR_ORDER[0]:
+            return DEFAULT_VALIDATOR_ORDER
+        return DEFAULT_VALIDATOR_ORDER[::-1]
+
+    def remember(self, airline: str, reference_number: str, validator: int) -> None:
+        """Record the validator that just succeeded."""
+        changed = self._remember_reference(_reference_key(airline, reference_number), validator)
+        changed = self._remember_airline(airline, validator) or changed
+        if changed:
+            self._schedule_save()
+
+    async def async_forget(self, airline: str, reference_number: str) -> None:
+        """Drop the memory of a reference that is no longer tracked."""
+        if not self._loaded:
+            await self._async_load()
+        if self._references.pop(_reference_key(airline, reference_number), None) is not None:
+            self._schedule_save()
+
+    async def async_flush(self) -> None:
+        """Write pending changes now, before the memory is released."""
+        if self._store is None or not self._dirty:
+            return
+        try:
+            await self._store.async_save(self._data_to_save())
+        except Exception as err:
+            _LOGGER.debug("Could not persist validator memory: %s", err)
+
+    def _remember_reference(self, key: str, validator: int) -> bool:
+        if self._references.get(key) == validator:
+            return False
+        self._references[key] = validator
+        return True
+
+    def _remember_airline(self, airline: str, validator: int) -> bool:
+        if self._airlines.get(airline) == validator:
+            self._streaks.pop(airline, None)
+            return False
+        streak_validator, streak = self._streaks.get(airline, (validator, 0))
+        streak = streak + 1 if streak_validator == validator else 1
+        if streak < self._consensus:
+            self._streaks[airline] = (validator, streak)
+            return False
+        self._streaks.pop(airline, None)
+        self._airlines[airline] = validator
+        return True
+
+    def _schedule_save(self) -> None:
+        if self._store is not None:
+            self._dirty = True
+            self._store.async_delay_save(self._data_to_save, self._save_delay)
+
+    def _data_to_save(self) -> dict[str, dict[str, int]]:
+        # Also called by the store when a delayed save runs; after that a flush has nothing to write.
+        self._dirty = False
+        return {"references": self._references, "airlines": self._airlines}
+
+    async def _async_load(self) -> None:
+        async with self._lock:
+            if self._loaded or self._store is None:
+                return
+            try:
+                stored = await self._store.async_load()
+            except Exception as err:
+                _LOGGER.debug("Could not restore validator memory: %s", err)
+                stored = None
+            if isinstance(stored, dict):
+                self._references = _validator_map(stored.get("references"))
+                self._airlines = _validator_map(stored.get("airlines"))
+            self._loaded = True
+
+
+def _reference_key(airline: str, reference_number: str) -> str:
+    return f"{airline}:{reference_number}"
+
+
+def _validator_map(value: object) -> dict[str, int]:
+    if not isinstance(value, dict):
+        return {}
+    return {key: validator for key, validator in value.items() if validator in DEFAULT_VALIDATOR_ORDER}
@@ -0,0 +1,72 @@
+"""Tests for the MyBag Tracker integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from custom_components.mybag_aero_tracker.const import (
+    AIRLINE_URLS,
+    CONF_AIRLINE,
+    CONF_FAMILY_NAME,
+    CONF_REFERENCE_NUMBER,
+    CONF_SCAN_INTERVAL_MINUTES,
+    DOMAIN,
+    STATUS_STORAGE_KEY,
+    STATUS_STORAGE_VERSION,
+)
+from custom_components.mybag_aero_tracker.models import BaggageStatus
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+REFERENCE = "VIEOS12345"
+
+
+def make_status(state: str, age: timedelta = timedelta(), **fields: Any) -> BaggageStatus:
+    """Return a status of the test file, checked ``age`` ago."""
+    return BaggageStatus(
+        state=state,
+        checked_at=dt_util.utcnow() - age,
+        airline="austrian",
+        reference_number=REFERENCE,
+        family_name="DOE",
+        url=AIRLINE_URLS["austrian"],
+        message="",
+        **fields,
+    )
+
+
+def add_config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Add the config entry of the test file, without setting it up."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Austrian {REFERENCE}",
+        unique_id=f"austrian_{REFERENCE}",
+        data={
+            CONF_AIRLINE: "austrian",
+            CONF_REFERENCE_NUMBER: REFERENCE,
+            CONF_FAMILY_NAME: "DOE",
+            CONF_SCAN_INTERVAL_MINUTES: 60,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+def save_status(hass_storage: dict[str, Any], entry: MockConfigEntry, status: BaggageStatus) -> None:
+    """Store ``status`` as the entry's last known status, as if saved before a restart."""
+    hass_storage[STATUS_STORAGE_KEY] = {
+        "version": STATUS_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STATUS_STORAGE_KEY,
+        "data": {entry.entry_id: status.as_dict()},
+    }
+
+
+def entity_id_for(hass: HomeAssistant, entry: MockConfigEntry, key: str, platform: str = "sensor") -> str:
+    """Return the entity ID of one of the entry's entities."""
+    entity_id = er.async_get(hass).async_get_entity_id(platform, DOMAIN, f"{entry.entry_id}_{key}")
+    assert entity_id is not None
+    return entity_id
@@ -0,0 +1,11 @@
+"""Shared fixtures for the MyBag Tracker tests."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Let Home Assistant load the integration from custom_components."""
+    yield
@@ -0,0 +1,193 @@
+"""Tests for the shared dynamic-messages catalog."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import json
+import time
+from typing import Any
+
+from custom_components.mybag_aero_tracker.catalog import MyBagStatusCatalog, build_status_index
+
+CATALOG = {
+    "dynamicMessages": {
+        "bag_status": {
+            "BTS_2A": {
+                "BTS_ACCopen_1_head": "SEARCHING FOR YOUR BAGGAGE",
+                "BTS_ACCopen_2_head": "YOUR BAGGAGE HAS BEEN LOCATED",
+                "BTS_ACCclose_head": "YOUR BAGGAGE HAS BEEN LOCATED",
+            },
+        },
+        "notification_mszs": {"BTS_2A": {"delayed": {"body": "Your bag is on its way to the airport."}}},
+    }
+}
+LOCATED = (
+    ("SEARCHING FOR YOUR BAGGAGE", "YOUR BAGGAGE HAS BEEN LOCATED"),
+    "YOUR BAGGAGE HAS BEEN LOCATED",
+    "Your bag is on its way to the airport.",
+)
+
+
+class _Response:
+    def __init__(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode()
+
+
+class _Session:
+    """Session stand-in serving scripted responses and recording request headers."""
+
+    def __init__(self, *responses: _Response) -> None:
+        self.responses = list(responses)
+        self.requests: list[dict[str, str]] = []
+
+    @asynccontextmanager
+    async def get(self, url: str, headers: dict[str, str]) -> AsyncIterator[_Response]:
+        self.requests.append(headers)
+        yield self.responses.pop(0)
+
+
+class _Store:
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        self.data = data
+
+    async def async_load(self) -> dict[str, Any] | None:
+        return self.data
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        self.data = data
+
+
+def _download(etag: str = '"v1"') -> _Response:
+    headers = {"ETag": etag, "Last-Modified": "Wed, 18 Feb 2026 10:00:00 GMT"}
+    return _Response(200, json.dumps(CATALOG).encode(), headers)
+
+
+async def test_download_is_reused_within_the_ttl() -> None:
+    """A fresh catalog answers every lookup without another request."""
+    session = _Session(_download())
+    catalog = MyBagStatusCatalog(session, ttl_seconds=3600)
+
+    await catalog.async_ensure_loaded()
+    await catalog.async_ensure_loaded()
+
+    assert len(session.requests) == 1
+    assert "If-None-Match" not in session.requests[0]
+    assert catalog.cache_hits == 1
+    assert catalog.resolve("BTS_2A") == LOCATED
+
+
+async def test_stale_copy_is_served_while_it_revalidates() -> None:
+    """After the TTL the cached copy is used and revalidated with its validators."""
+    session = _Session(_download(), _Response(304))
+    store, meta_store = _Store(), _Store()
+    catalog = MyBagStatusCatalog(session, store=store, meta_store=meta_store, ttl_seconds=0)
+    await catalog.async_ensure_loaded()
+    saved = store.data
+
+    await catalog.async_ensure_loaded()
+    assert catalog.resolve("BTS_2A") == LOCATED
+    await catalog._refresh_task
+
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert session.requests[1]["If-Modified-Since"] == "Wed, 18 Feb 2026 10:00:00 GMT"
+    assert (catalog.downloads, catalog.not_modified) == (1, 1)
+    assert catalog.resolve("BTS_2A") == LOCATED
+    assert store.data is saved and saved["etag"] == '"v1"'
+    assert meta_store.data is not None and meta_store.data["etag"] == '"v1"'
+    assert meta_store.data["fetched_at"] >= saved["fetched_at"]
+
+
+async def test_failed_revalidation_keeps_the_cached_copy() -> None:
+    """A failed download keeps serving the previous catalog."""
+    session = _Session(_download(), _Response(503))
+    catalog = MyBagStatusCatalog(session, ttl_seconds=0, retry_seconds=3600)
+    await catalog.async_ensure_loaded()
+
+    await catalog.async_ensure_loaded()
+    await catalog._refresh_task
+
+    assert catalog.failed_downloads == 1
+    assert catalog.resolve("BTS_2A") == LOCATED
+
+
+async def test_restored_copy_follows_its_saved_age() -> None:
+    """A saved copy within the TTL is used as is; an expired one is revalidated with its ETag."""
+    saved = {
+        "etag": '"v1"',
+        "last_modified": None,
+        "fetched_at": time.time(),
+        "bag_status": CATALOG["dynamicMessages"]["bag_status"],
+        "notification_mszs": CATALOG["dynamicMessages"]["notification_mszs"],
+    }
+    session = _Session()
+    catalog = MyBagStatusCatalog(session, store=_Store(saved), ttl_seconds=3600)
+    await catalog.async_ensure_loaded()
+    await catalog.async_ensure_loaded()
+    assert session.requests == []
+    assert catalog.resolve("BTS_2A") == LOCATED
+
+    session = _Session(_download('"v2"'))
+    catalog = MyBagStatusCatalog(session, store=_Store({**saved, "fetched_at": time.time() - 7200}), ttl_seconds=3600)
+    await catalog.async_ensure_loaded()
+    await catalog.async_ensure_loaded()
+    await catalog._refresh_task
+
+    assert session.requests[0]["If-None-Match"] == '"v1"'
+    assert catalog.downloads == 1
+
+
+async def test_restored_copy_takes_the_age_of_its_last_revalidation() -> None:
+    """A 304 saved after the catalog keeps it fresh; metadata of another copy is ignored."""
+    saved = {
+        "etag": '"v1"',
+        "last_modified": None,
+        "fetched_at": time.time() - 7200,
+        "bag_status": CATALOG["dynamicMessages"]["bag_status"],
+        "notification_mszs": CATALOG["dynamicMessages"]["notification_mszs"],
+    }
+    meta = {"etag": '"v1"', "last_modified": None, "fetched_at": time.time()}
+
+    session = _Session()
+    catalog = MyBagStatusCatalog(session, store=_Store(saved), meta_store=_Store(meta), ttl_seconds=3600)
+    await catalog.async_ensure_loaded()
+    await catalog.async_ensure_loaded()
+    assert session.requests == []
+
+    session = _Session(_Response(304))
+    meta_store = _Store({**meta, "etag": '"v0"'})
+    catalog = MyBagStatusCatalog(session, store=_Store(saved), meta_store=meta_store, ttl_seconds=3600)
+    await catalog.async_ensure_loaded()
+    await catalog.async_ensure_loaded()
+    await catalog._refresh_task
+    assert len(session.requests) == 1
+
+
+def _index(previous: dict | None = None) -> dict:
+    # A fresh parse, so no string object is shared with a previous build.
+    dynamic = json.loads(json.dumps(CATALOG))["dynamicMessages"]
+    return build_status_index(dynamic["bag_status"], dynamic["notification_mszs"], previous)
+
+
+def test_status_index_is_precomputed_per_tracing_status() -> None:
+    """Each tracing status resolves to its steps, current text and body."""
+    assert _index() == {"BTS_2A": LOCATED}
+
+
+def test_status_index_shares_texts_across_builds() -> None:
+    """Rebuilding the index from a new download reuses the same text and step objects."""
+    first_index = _index()
+    first, second = first_index["BTS_2A"], _index(first_index)["BTS_2A"]
+
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+    assert first[2] is second[2]
+    assert first[1] is first[0][-1]
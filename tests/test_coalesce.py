@@ -0,0 +1,58 @@
+"""Tests for coalescing checks of the same file."""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.mybag_aero_tracker.coalesce import RequestCoalescer
+
+
+class _Call:
+    """Counts calls and finishes them only when released."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        self.count += 1
+        await self.release.wait()
+        return self.count
+
+
+async def test_overlapping_calls_share_one_request() -> None:
+    """Callers that arrive while a call is in flight get its result."""
+    coalescer: RequestCoalescer[int] = RequestCoalescer()
+    call = _Call()
+
+    first = asyncio.create_task(coalescer.async_run("file", call))
+    second = asyncio.create_task(coalescer.async_run("file", call))
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await asyncio.gather(first, second) == [1, 1]
+    assert call.count == 1
+    assert coalescer.joined == 1
+
+
+async def test_later_call_makes_its_own_request() -> None:
+    """Without a reuse window a finished result is never handed out again."""
+    coalescer: RequestCoalescer[int] = RequestCoalescer()
+    call = _Call()
+    call.release.set()
+
+    assert await coalescer.async_run("file", call) == 1
+    assert await coalescer.async_run("file", call) == 2
+    assert coalescer.coalesced == 0
+
+
+async def test_reuse_window_is_opt_in() -> None:
+    """With a window, a recent result answers the next call."""
+    coalescer: RequestCoalescer[int] = RequestCoalescer(window_seconds=60)
+    call = _Call()
+    call.release.set()
+
+    assert await coalescer.async_run("file", call) == 1
+    assert await coalescer.async_run("file", call) == 1
+    assert call.count == 1
+    assert coalescer.reused == 1
@@ -0,0 +1,59 @@
+"""Tests for the MyBag Tracker coordinator."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from custom_components.mybag_aero_tracker.api import MyBagApiClient
+from custom_components.mybag_aero_tracker.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from . import add_config_entry, entity_id_for, make_status, save_status
+
+
+async def test_unchanged_check_only_updates_the_next_check(hass: HomeAssistant, freezer) -> None:
+    """A check with the same content leaves the status alone but shows the new poll decision."""
+    entry = add_config_entry(hass)
+    # The next check sensor is disabled by default; register it enabled.
+    er.async_get(hass).async_get_or_create("sensor", DOMAIN, f"{entry.entry_id}_next_check", config_entry=entry)
+    check = AsyncMock(return_value=make_status("located"))
+    with patch.object(MyBagApiClient, "async_check_status", check):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        status_id = entity_id_for(hass, entry, "status")
+        next_check_id = entity_id_for(hass, entry, "next_check")
+        status_before = hass.states.get(status_id)
+        next_check_before = hass.states.get(next_check_id)
+        assert next_check_before.attributes["poll_policy"] == "state_located"
+
+        freezer.tick(timedelta(minutes=10))
+        check.return_value = make_status("located")
+        await hass.data[DOMAIN][entry.entry_id].async_refresh()
+        await hass.async_block_till_done()
+
+    assert check.await_count == 2
+    assert hass.states.get(status_id).last_updated == status_before.last_updated
+    next_check = hass.states.get(next_check_id)
+    assert next_check.state != next_check_before.state
+    assert next_check.attributes["poll_interval_minutes"] == 60
+    assert hass.data[DOMAIN][entry.entry_id].unchanged_updates == 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_restored_status_schedules_its_next_check_by_policy(hass: HomeAssistant, hass_storage: dict) -> None:
+    """After a restart a delivered file waits out its daily interval instead of the base interval."""
+    entry = add_config_entry(hass)
+    delivered = make_status("delivered", timedelta(minutes=30))
+    save_status(hass_storage, entry, delivered)
+
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock()) as check:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    decision = hass.data[DOMAIN][entry.entry_id].poll_decision
+    assert check.await_count == 0
+    assert decision.reason == "terminal_delivered"
+    assert decision.next_check_at == delivered.checked_at + timedelta(hours=24)
+    assert await hass.config_entries.async_unload(entry.entry_id)
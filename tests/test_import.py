@@ -0,0 +1,48 @@
+"""Tests for the bulk import service."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+from custom_components.mybag_aero_tracker.api import MyBagApiClient
+from custom_components.mybag_aero_tracker.const import DATA_IMPORT_SEEDS, DOMAIN, SERVICE_IMPORT
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from . import REFERENCE, make_status
+
+
+async def _async_import(hass: HomeAssistant, *rows: str) -> dict:
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_IMPORT, {"rows": list(rows)}, blocking=True, return_response=True
+    )
+
+
+async def test_imported_entries_start_from_the_import_check(hass: HomeAssistant) -> None:
+    """Each found file is checked once, by the import, and set up with that status."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock(return_value=make_status("located"))) as check:
+        response = await _async_import(hass, f"OS,{REFERENCE},Doe")
+        await hass.async_block_till_done()
+
+    assert response["summary"] == {"created": 1}
+    assert check.await_count == 1
+    assert DATA_IMPORT_SEEDS not in hass.data
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_import_keeps_the_seeds_of_an_overlapping_import(hass: HomeAssistant) -> None:
+    """Finishing one import leaves the pending seeds of another in place."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    pending = make_status("received")
+    hass.data[DATA_IMPORT_SEEDS] = {"austrian_VIEOS99999": pending}
+
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock(return_value=make_status("located"))):
+        await _async_import(hass, f"OS,{REFERENCE},Doe")
+        await hass.async_block_till_done()
+
+    assert hass.data[DATA_IMPORT_SEEDS] == {"austrian_VIEOS99999": pending}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        assert await hass.config_entries.async_unload(entry.entry_id)
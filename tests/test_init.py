@@ -0,0 +1,126 @@
+"""Tests for setting up MyBag Tracker entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.mybag_aero_tracker.api import MyBagApiClient
+from custom_components.mybag_aero_tracker.const import (
+    DATA_SCHEDULER,
+    DOMAIN,
+    PHASE_MAX_JITTER_SECONDS,
+    SERVICE_REFRESH,
+)
+from custom_components.mybag_aero_tracker.models import BaggageStatus
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from . import add_config_entry, entity_id_for, make_status, save_status
+
+
+def _status_state(hass: HomeAssistant, entry: MockConfigEntry) -> str:
+    return hass.states.get(entity_id_for(hass, entry, "status")).state
+
+
+async def test_fresh_saved_status_is_published_without_a_check(hass: HomeAssistant, hass_storage: dict) -> None:
+    """An entry with a recent saved status comes up with it and waits for its slot."""
+    entry = add_config_entry(hass)
+    save_status(hass_storage, entry, make_status("located", timedelta(minutes=5)))
+
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock()) as check:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert check.await_count == 0
+    assert _status_state(hass, entry) == "located"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize(
+    ("age", "latest"),
+    [
+        # Five minutes overdue: checked within those five minutes.
+        (timedelta(minutes=65), timedelta(minutes=5)),
+        # Two hours overdue: checked at the entry's slot within the hour, not at startup.
+        (timedelta(hours=3), timedelta(hours=1, seconds=PHASE_MAX_JITTER_SECONDS)),
+    ],
+)
+async def test_stale_saved_status_is_checked_at_its_slot(
+    hass: HomeAssistant, hass_storage: dict, age: timedelta, latest: timedelta
+) -> None:
+    """An overdue saved status is shown and checked at its phase slot, no later than it is overdue."""
+    entry = add_config_entry(hass)
+    save_status(hass_storage, entry, make_status("located", age))
+
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock()) as check:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert check.await_count == 0
+    assert _status_state(hass, entry) == "located"
+    next_check_at = hass.data[DOMAIN][entry.entry_id].poll_decision.next_check_at
+    assert dt_util.utcnow() <= next_check_at <= dt_util.utcnow() + latest
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_does_not_wait_for_a_slow_check(hass: HomeAssistant, hass_storage: dict) -> None:
+    """With a saved status, setup returns and publishes it while mybag.aero has not answered yet."""
+    entry = add_config_entry(hass)
+    save_status(hass_storage, entry, make_status("located", timedelta(hours=3)))
+    started, answer = asyncio.Event(), asyncio.Event()
+
+    async def _slow_check(client: MyBagApiClient, *, priority: int) -> BaggageStatus:
+        started.set()
+        await answer.wait()
+        return make_status("received")
+
+    with patch.object(MyBagApiClient, "async_check_status", _slow_check):
+        loop = asyncio.get_running_loop()
+        setup_started = loop.time()
+        assert await asyncio.wait_for(hass.config_entries.async_setup(entry.entry_id), 5)
+        assert loop.time() - setup_started < 1
+        assert _status_state(hass, entry) == "located"
+
+        # Start the overdue check now; the restored state is kept until it answers.
+        hass.data[DATA_SCHEDULER].async_reschedule(entry.entry_id, 0)
+        await asyncio.wait_for(started.wait(), 5)
+        assert _status_state(hass, entry) == "located"
+
+        answer.set()
+        await hass.async_block_till_done()
+        for _ in range(10):
+            await asyncio.sleep(0)
+    assert _status_state(hass, entry) == "received"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_entry_without_saved_status_checks_during_setup(hass: HomeAssistant) -> None:
+    """Without a saved status the first check is part of setup."""
+    entry = add_config_entry(hass)
+
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock(return_value=make_status("delivered"))) as check:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert check.await_count == 1
+    assert _status_state(hass, entry) == "delivered"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_refresh_service_checks_right_after_setup(hass: HomeAssistant) -> None:
+    """A refresh call makes a live check even when the last one has just finished."""
+    entry = add_config_entry(hass)
+
+    with patch.object(MyBagApiClient, "_async_check", AsyncMock(return_value=make_status("delivered"))) as check:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+        await hass.async_block_till_done()
+
+    assert check.await_count == 2
+    assert await hass.config_entries.async_unload(entry.entry_id)
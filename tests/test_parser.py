@@ -0,0 +1,56 @@
+"""Tests for parsing delayed bag records."""
+
+from __future__ import annotations
+
+from aiohttp import ClientSession
+
+from benchmarks.corpus import load_records
+from benchmarks.stub import StubServer, reference_for
+from custom_components.mybag_aero_tracker.api import MyBagApiClient, _decode_login_response
+from custom_components.mybag_aero_tracker.catalog import MyBagStatusCatalog
+from custom_components.mybag_aero_tracker.parser import parse_delayed_record
+
+
+def test_every_bag_of_a_record_is_parsed() -> None:
+    """A record with several bags yields one entry per bag; delivery details follow the first."""
+    delayed_record, _ = _decode_login_response(load_records()["multi_bag"].body)
+
+    record = parse_delayed_record(delayed_record)
+
+    assert [(bag.tag, bag.colour, bag.tracing_status) for bag in record.bags] == [
+        ("OS123456", "Black", "BTS_5A"),
+        ("OS123457", "Blue", "BTS_3A"),
+        ("OS123458", "Red", "BTS_2A"),
+        ("OS123459", "Grey", "BTS_1A"),
+    ]
+    assert record.tracing_statuses == ("BTS_5A", "BTS_3A", "BTS_2A", "BTS_1A")
+    assert record.bags[0].delivery_state == "scheduled_for_delivery"
+    assert record.delivery_details["tag_details"] == "OS123456"
+    assert record.delivery_details["scheduled_delivery_local"] == "2026-02-18 14:00"
+    assert record.delivery_details["number_of_baggage_in_delivery"] == "4"
+
+
+async def test_status_lists_every_bag_with_its_own_state(socket_enabled: None) -> None:
+    """The client reports each bag of a multi-bag file; the overall state follows the first bag."""
+    index = list(load_records()).index("multi_bag")
+    async with StubServer() as server, ClientSession() as session:
+        catalog = MyBagStatusCatalog(session, url=server.catalog_url)
+        client = MyBagApiClient(
+            session,
+            "austrian",
+            reference_for(index),
+            "Doe",
+            "https://mybag.aero",
+            catalog=catalog,
+            api_base_url=server.base_url,
+        )
+        status = await client.async_check_status()
+        await catalog.async_close()
+
+    assert status.state == "scheduled_for_delivery"
+    assert [(bag["tag"], bag["state"]) for bag in status.bags] == [
+        ("OS123456", "scheduled_for_delivery"),
+        ("OS123457", "received"),
+        ("OS123458", "located"),
+        ("OS123459", "searching"),
+    ]
@@ -0,0 +1,54 @@
+"""Tests for retries and the shared circuit breaker."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from aiohttp import ClientSession
+
+from benchmarks.stub import StubServer
+from custom_components.mybag_aero_tracker.api import MyBagApiClient
+from custom_components.mybag_aero_tracker.catalog import MyBagStatusCatalog
+from custom_components.mybag_aero_tracker.resilience import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+)
+
+
+def test_breaker_pauses_for_the_requested_cooldown(freezer) -> None:
+    """A Retry-After cooldown opens the breaker for that long, not for the default reset time."""
+    breaker = CircuitBreaker("wtss-api.mybag.aero", reset_seconds=300)
+
+    breaker.record_failure(cooldown=61)
+    assert breaker.state == BREAKER_OPEN
+
+    freezer.tick(timedelta(seconds=62))
+    assert breaker.state == BREAKER_HALF_OPEN
+
+
+async def test_failing_file_counts_once_per_check(socket_enabled: None) -> None:
+    """Retries of one check are a single breaker failure, so one broken file does not open it."""
+    breaker = CircuitBreaker("stub", failure_threshold=3)
+    async with StubServer({"references": {"VIEOS00001": {"outcomes": [503]}}}) as server, ClientSession() as session:
+        catalog = MyBagStatusCatalog(session, url=server.catalog_url)
+        client = MyBagApiClient(
+            session,
+            "austrian",
+            "VIEOS00001",
+            "Doe",
+            "https://mybag.aero",
+            catalog=catalog,
+            api_base_url=server.base_url,
+            breaker=breaker,
+            retry=RetryPolicy(attempts=2, base_delay=0),
+        )
+        for _ in range(2):
+            await client.async_check_status()
+        await catalog.async_close()
+
+    assert server.login_requests == 6
+    assert breaker.consecutive_failures == 2
+    assert breaker.state == BREAKER_CLOSED
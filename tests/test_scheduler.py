@@ -0,0 +1,80 @@
+"""Tests for the fleet scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.mybag_aero_tracker.const import PHASE_MAX_JITTER_SECONDS
+from custom_components.mybag_aero_tracker.scheduler import MyBagFleetScheduler, first_poll_delay, stable_phase
+
+STATUS = object()
+
+
+class _Client:
+    """Client stand-in that answers every check at once."""
+
+    def __init__(self) -> None:
+        self.checks = 0
+
+    async def async_check_status(self, *, priority: int) -> object:
+        self.checks += 1
+        return STATUS
+
+
+def _raise(status: object) -> None:
+    raise RuntimeError("listener failed")
+
+
+async def test_failing_result_callback_keeps_the_pool_alive(caplog) -> None:
+    """A callback that raises is logged and later checks still run."""
+    scheduler = MyBagFleetScheduler(max_concurrency=1)
+    client = _Client()
+    # Interval 0 makes the first scheduled poll due at once; the next one is an hour away.
+    scheduler.async_register("entry", client, 0, _raise, next_delay=lambda status: 3600)
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert client.checks == 1
+    assert "Unexpected error handling the result of entry" in caplog.text
+    assert await asyncio.wait_for(scheduler.async_check("entry"), 1) is STATUS
+    await scheduler.async_shutdown()
+
+
+async def test_dead_workers_are_replaced() -> None:
+    """Workers that are gone are respawned by the next check."""
+    scheduler = MyBagFleetScheduler(max_concurrency=2)
+    client = _Client()
+    scheduler.async_register("entry", client, 3600, lambda status: None)
+    assert await asyncio.wait_for(scheduler.async_check("entry"), 1) is STATUS
+
+    for worker in scheduler._workers:
+        worker.cancel()
+    await asyncio.gather(*scheduler._workers, return_exceptions=True)
+
+    assert await asyncio.wait_for(scheduler.async_check("entry"), 1) is STATUS
+    assert client.checks == 2
+    await scheduler.async_shutdown()
+
+
+def test_stable_phase_is_fixed_per_key_and_spread_over_the_interval() -> None:
+    """The phase depends only on the key, and many keys cover the whole interval."""
+    interval = 1800.0
+    phases = [stable_phase(f"entry{index}", interval) for index in range(500)]
+
+    assert phases == [stable_phase(f"entry{index}", interval) for index in range(500)]
+    assert all(0 <= phase < interval for phase in phases)
+    bins = [0] * 10
+    for phase in phases:
+        bins[int(phase / interval * 10)] += 1
+    assert min(bins) > 25
+
+
+def test_first_poll_lands_on_the_phase_slot() -> None:
+    """The first poll waits for the key's next slot on the wall clock, plus bounded jitter."""
+    interval = 3600.0
+    phase = stable_phase("entry", interval)
+    now = 10 * interval + phase - 60
+
+    for _ in range(20):
+        assert 60 <= first_poll_delay("entry", interval, now=now) <= 60 + PHASE_MAX_JITTER_SECONDS
+    assert first_poll_delay("entry", 0) == 0
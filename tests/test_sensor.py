@@ -0,0 +1,132 @@
+"""Tests for the MyBag Tracker sensors."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from custom_components.mybag_aero_tracker.api import MyBagApiClient
+from custom_components.mybag_aero_tracker.const import DOMAIN
+from custom_components.mybag_aero_tracker.sensor import STATUS_UNRECORDED_ATTRIBUTES
+from homeassistant.const import ATTR_DEVICE_CLASS, EVENT_STATE_CHANGED, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
+
+from . import add_config_entry, entity_id_for, make_status
+
+SCHEDULED = make_status(
+    "scheduled_for_delivery",
+    bag_title="Black suitcase",
+    primary_tracing_status="BTS_5A",
+    tracing_statuses=("BTS_5A", "BTS_5A"),
+    delivery_details={"scheduled_delivery_local": "2026-02-18T15:00:00", "delivery_service": "SAMPLE COURIER"},
+    bags=({"tag": "OS123456"}, {"tag": "OS654321"}),
+    raw_excerpt="{...}",
+)
+
+
+async def _async_setup(hass: HomeAssistant) -> MockConfigEntry:
+    entry = add_config_entry(hass)
+    with patch.object(MyBagApiClient, "async_check_status", AsyncMock(return_value=SCHEDULED)):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+async def test_delivery_facts_are_typed_sensors(hass: HomeAssistant) -> None:
+    """Delivery time, courier and bag count get their own sensors with native types."""
+    hass.config.set_time_zone("Europe/Vienna")
+    entry = await _async_setup(hass)
+
+    scheduled = hass.states.get(entity_id_for(hass, entry, "scheduled_delivery"))
+    assert scheduled.state == "2026-02-18T14:00:00+00:00"
+    assert scheduled.attributes[ATTR_DEVICE_CLASS] == "timestamp"
+    assert hass.states.get(entity_id_for(hass, entry, "delivered_at")).state == STATE_UNKNOWN
+    assert hass.states.get(entity_id_for(hass, entry, "courier")).state == "SAMPLE COURIER"
+    assert hass.states.get(entity_id_for(hass, entry, "bag_count")).state == "2"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_volatile_status_attributes_are_not_recorded(hass: HomeAssistant) -> None:
+    """Only the stable status attributes reach the recorder; the rest stay in the UI."""
+    entry = await _async_setup(hass)
+
+    state = hass.states.get(entity_id_for(hass, entry, "status"))
+    unrecorded = state.state_info["unrecorded_attributes"]
+    assert STATUS_UNRECORDED_ATTRIBUTES <= unrecorded
+    assert {"checked_at", "bags", "raw_excerpt", "timeline"} <= state.attributes.keys()
+    assert {name for name in state.attributes if name not in unrecorded} == {
+        "airline",
+        "reference_number",
+        "family_name",
+        "bag_title",
+        "headline",
+        "primary_tracing_status",
+        "current_status_text",
+        "no_of_bags_updated",
+        "record_status",
+        "source_url",
+        "friendly_name",
+        "icon",
+    }
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_status_sensor_lists_every_bag(hass: HomeAssistant) -> None:
+    """The status sensor carries one ``bags`` entry per bag of the file."""
+    entry = await _async_setup(hass)
+
+    state = hass.states.get(entity_id_for(hass, entry, "status"))
+    assert [bag["tag"] for bag in state.attributes["bags"]] == ["OS123456", "OS654321"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_status_attributes_show_the_current_client_counters(hass: HomeAssistant) -> None:
+    """A state written for the same status object still carries the client's current counters."""
+    entry = await _async_setup(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    status_id = entity_id_for(hass, entry, "status")
+    assert hass.states.get(status_id).attributes["http_retries"] == 0
+
+    coordinator.client.http_retries = 3
+    coordinator.async_set_update_error(UpdateFailed("timeout"))
+    coordinator.async_set_updated_data(coordinator.data)
+
+    state = hass.states.get(status_id)
+    assert state.state == "scheduled_for_delivery"
+    assert state.attributes["http_retries"] == 3
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_next_check_sensor_is_disabled_by_default(hass: HomeAssistant) -> None:
+    """The next check changes on every poll, so its sensor is not recorded unless enabled."""
+    entry = await _async_setup(hass)
+
+    entity_id = entity_id_for(hass, entry, "next_check")
+    assert er.async_get(hass).async_get(entity_id).disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get(entity_id) is None
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_unchanged_polls_write_no_states(hass: HomeAssistant) -> None:
+    """Polling an unchanged file many times adds no states; only a real change is written."""
+    entry = await _async_setup(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for poll in range(1, 21):
+        coordinator.async_handle_status(replace(SCHEDULED, checked_at=SCHEDULED.checked_at + timedelta(minutes=poll)))
+    await hass.async_block_till_done()
+    assert events == []
+    assert coordinator.unchanged_updates == 20
+
+    coordinator.async_handle_status(replace(SCHEDULED, state="delivered"))
+    await hass.async_block_till_done()
+    # Status, found and the delivery sensors whose value changed; each written once.
+    changed = [event.data["entity_id"] for event in events]
+    assert len(changed) == len(set(changed))
+    assert entity_id_for(hass, entry, "status") in changed
+    assert await hass.config_entries.async_unload(entry.entry_id)
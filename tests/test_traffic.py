@@ -0,0 +1,96 @@
+"""Tests for recording and replaying mybag.aero traffic."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.mybag_aero_tracker.traffic import ReplaySession, TrafficArchive, load_exchanges
+
+LOGIN_URL = "https://wtss-api.mybag.aero/manageLogin"
+CATALOG_URL = "https://mybag.aero/baggage/assets/static/common-dynamic-messages/en-gb.json"
+
+
+def _login(validator: int, reference: str = "12345") -> dict[str, Any]:
+    return {
+        "WTR_ReadRecordRQ": {
+            "RecordID": {
+                "RecordType": "DELAYED",
+                "RecordReference": {
+                    "ReferenceNumber": reference,
+                    "StationCode": "VIE",
+                    "AirlineCode": "OS",
+                    "LastName": "DOE",
+                },
+            },
+            "Validator": validator,
+            "captchaResponse": "",
+        }
+    }
+
+
+def _exchange(method: str, url: str, request: Any, status: int, body: str) -> dict[str, Any]:
+    return {"method": method, "url": url, "request": request, "status": status, "headers": {}, "body": body}
+
+
+async def _replay(session: ReplaySession, method: str, url: str, request: Any = None) -> tuple[int, str]:
+    request_context = session.get(url) if method == "GET" else session.post(url, json=request)
+    async with request_context as response:
+        return response.status, await response.text()
+
+
+async def test_exact_request_is_preferred_and_served_in_order() -> None:
+    """Each validator gets its own recorded answers; the last one repeats."""
+    session = ReplaySession(
+        exchanges=[
+            _exchange("POST", LOGIN_URL, _login(1), 489, "wrong validator"),
+            _exchange("POST", LOGIN_URL, _login(0), 503, "busy"),
+            _exchange("POST", LOGIN_URL, _login(0), 200, "record"),
+        ]
+    )
+
+    assert await _replay(session, "POST", LOGIN_URL, _login(1)) == (489, "wrong validator")
+    assert await _replay(session, "POST", LOGIN_URL, _login(0)) == (503, "busy")
+    assert await _replay(session, "POST", LOGIN_URL, _login(0)) == (200, "record")
+    assert await _replay(session, "POST", LOGIN_URL, _login(0)) == (200, "record")
+
+
+async def test_login_with_another_validator_uses_the_same_file() -> None:
+    """A validator never recorded for the file still gets that file's answer, on any host."""
+    session = ReplaySession(exchanges=[_exchange("POST", LOGIN_URL, _login(1), 200, "record")])
+
+    assert await _replay(session, "POST", "http://127.0.0.1:8089/manageLogin", _login(0)) == (200, "record")
+    assert await _replay(session, "POST", LOGIN_URL, _login(0, reference="99999")) == (
+        404,
+        "Not in the recorded archive",
+    )
+    assert (session.served, session.missed) == (1, 1)
+
+
+async def test_catalog_matches_by_resource() -> None:
+    """The catalog recorded under one URL answers fetches of any other; 304s are skipped."""
+    session = ReplaySession(
+        exchanges=[
+            _exchange("GET", CATALOG_URL, None, 200, '{"dynamicMessages": {}}'),
+            _exchange("GET", CATALOG_URL, None, 304, ""),
+        ]
+    )
+
+    assert await _replay(session, "GET", "http://127.0.0.1:8089/dynamic-messages.json") == (
+        200,
+        '{"dynamicMessages": {}}',
+    )
+
+
+async def test_recorded_archive_replays(tmp_path) -> None:
+    """Exchanges written by the archive load back for replay, oldest first."""
+    archive = TrafficArchive(tmp_path)
+    archive.record("POST", LOGIN_URL, _login(1), 200, {"Content-Type": "application/json"}, b"record")
+    archive.record("GET", CATALOG_URL, None, 200, {"ETag": '"v1"'}, b"{}")
+    await archive.async_flush()
+
+    exchanges = load_exchanges(tmp_path)
+    assert [exchange["method"] for exchange in exchanges] == ["POST", "GET"]
+    session = ReplaySession(exchanges=exchanges)
+    async with session.get(CATALOG_URL) as response:
+        assert response.headers["etag"] == '"v1"'
+    assert session.references() == [("OS", "VIEOS12345", "DOE")]
@@ -0,0 +1,104 @@
+"""Tests for the manageLogin validator memory."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from custom_components.mybag_aero_tracker.validator import DEFAULT_VALIDATOR_ORDER, ValidatorMemory
+
+PREFERRED, FALLBACK = DEFAULT_VALIDATOR_ORDER
+
+
+class _Store:
+    """Store stand-in that records delayed saves instead of writing."""
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        self.data = data
+        self.delayed_saves: list[float] = []
+        self.saves = 0
+        self._data_func: Callable[[], dict[str, Any]] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        return self.data
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        self.saves += 1
+        self.data = data
+
+    def async_delay_save(self, data_func: Callable[[], dict[str, Any]], delay: float = 0) -> None:
+        self.delayed_saves.append(delay)
+        self._data_func = data_func
+
+    def flush(self) -> dict[str, Any]:
+        assert self._data_func is not None
+        return self._data_func()
+
+
+async def test_reference_follows_the_latest_success() -> None:
+    """A reference switches after one success; its order is the working validator first."""
+    memory = ValidatorMemory(_Store())
+    assert await memory.async_order("austrian", "VIEOS00001") == DEFAULT_VALIDATOR_ORDER
+
+    memory.remember("austrian", "VIEOS00001", FALLBACK)
+
+    assert await memory.async_order("austrian", "VIEOS00001") == (FALLBACK, PREFERRED)
+
+
+async def test_airline_default_needs_consecutive_agreement() -> None:
+    """One reference with the other validator does not move the airline default."""
+    memory = ValidatorMemory(_Store(), consensus=3)
+    await memory.async_order("austrian", "VIEOS00001")
+
+    memory.remember("austrian", "VIEOS00001", FALLBACK)
+    memory.remember("austrian", "VIEOS00002", FALLBACK)
+    memory.remember("austrian", "VIEOS00003", PREFERRED)
+    memory.remember("austrian", "VIEOS00004", FALLBACK)
+    assert await memory.async_order("austrian", "VIEOS00099") == DEFAULT_VALIDATOR_ORDER
+
+    memory.remember("austrian", "VIEOS00005", FALLBACK)
+    memory.remember("austrian", "VIEOS00006", FALLBACK)
+    assert await memory.async_order("austrian", "VIEOS00099") == (FALLBACK, PREFERRED)
+    assert await memory.async_order("swiss", "ZRHLX00001") == DEFAULT_VALIDATOR_ORDER
+
+
+async def test_changes_are_saved_with_a_delay() -> None:
+    """Outcomes never write directly; repeating the known validator schedules nothing."""
+    store = _Store()
+    memory = ValidatorMemory(store, consensus=1, save_delay=10)
+    await memory.async_order("austrian", "VIEOS00001")
+
+    memory.remember("austrian", "VIEOS00001", FALLBACK)
+    memory.remember("austrian", "VIEOS00001", FALLBACK)
+
+    assert store.saves == 0
+    assert store.delayed_saves == [10]
+    assert store.flush() == {"references": {"austrian:VIEOS00001": FALLBACK}, "airlines": {"austrian": FALLBACK}}
+
+
+async def test_flush_writes_only_unsaved_changes() -> None:
+    """After the delayed save ran, flushing on release writes nothing; a later change is written."""
+    store = _Store()
+    memory = ValidatorMemory(store, consensus=1)
+    await memory.async_order("austrian", "VIEOS00001")
+    memory.remember("austrian", "VIEOS00001", FALLBACK)
+
+    store.flush()
+    await memory.async_flush()
+    assert store.saves == 0
+
+    memory.remember("austrian", "VIEOS00002", FALLBACK)
+    await memory.async_flush()
+    assert store.saves == 1
+    assert store.data["references"] == {"austrian:VIEOS00001": FALLBACK, "austrian:VIEOS00002": FALLBACK}
+
+
+async def test_forget_drops_the_reference() -> None:
+    """A removed reference is pruned from the loaded memory and the next save."""
+    store = _Store({"references": {"austrian:VIEOS00001": FALLBACK, "austrian:VIEOS00002": FALLBACK}})
+    memory = ValidatorMemory(store)
+
+    await memory.async_forget("austrian", "VIEOS00001")
+
+    assert await memory.async_order("austrian", "VIEOS00001") == DEFAULT_VALIDATOR_ORDER
+    assert store.flush()["references"] == {"austrian:VIEOS00002": FALLBACK}
@@ -0,0 +1 @@
+"""Command-line tools that reuse the integration outside Home Assistant."""
@@ -0,0 +1,200 @@
+"""Check many mybag.aero file references from a CSV file, without Home Assistant.
+
+Usage (from the repository root; only aiohttp is required)::
+
+    python -m tools.batch_check references.csv
+    cat references.csv | python -m tools.batch_check - --concurrency 8 > results.jsonl
+
+Each input row holds airline (name or code), file reference and family name; a
+header row is optional. One JSON object per row is written to stdout as soon as
+its check finishes. ``--record DIR`` keeps every request/response pair in a
+traffic archive; ``--replay DIR`` answers from such an archive instead of the
+network (and checks every recorded file when no input is given), which makes it
+a quick offline regression run for parser changes.
+
+Exit status: 0 when every file was found, 1 when at least one reference has no
+record, 2 when at least one check failed or a row was invalid, 64 for unusable
+input.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import ExitStack
+import json
+from pathlib import Path
+import sys
+import types
+from typing import Any, TextIO
+from urllib.parse import urlparse
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "mybag_aero_tracker"
+INTEGRATION_PACKAGE = "mybag_aero_tracker"
+
+
+def load_integration() -> types.ModuleType:
+    """Make the integration's HA-free modules importable without running its ``__init__``.
+
+    The package ``__init__`` sets up Home Assistant platforms; the client, catalog and
+    helpers only need aiohttp, so they are imported from a bare package object.
+    """
+    if INTEGRATION_PACKAGE not in sys.modules:
+        package = types.ModuleType(INTEGRATION_PACKAGE)
+        package.__path__ = [str(INTEGRATION_DIR)]
+        sys.modules[INTEGRATION_PACKAGE] = package
+    return sys.modules[INTEGRATION_PACKAGE]
+
+
+load_integration()
+
+from mybag_aero_tracker.api import MyBagApiClient
+from mybag_aero_tracker.batch import BatchRow, async_check_rows, parse_batch_rows
+from mybag_aero_tracker.catalog import MyBagStatusCatalog
+from mybag_aero_tracker.const import (
+    AIRLINE_URLS,
+    API_BASE_URL,
+    DEFAULT_MAX_CONCURRENT_CHECKS,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TIMEOUT_SECONDS,
+    DYNAMIC_MESSAGES_URL,
+)
+from mybag_aero_tracker.models import BaggageStatus
+from mybag_aero_tracker.ratelimit import PRIORITY_USER, TokenBucketLimiter
+from mybag_aero_tracker.resilience import CircuitBreaker
+from mybag_aero_tracker.session import create_session
+from mybag_aero_tracker.traffic import ReplaySession, TrafficArchive
+from mybag_aero_tracker.validator import ValidatorMemory
+
+EXIT_OK = 0
+EXIT_NOT_FOUND = 1
+EXIT_FAILED = 2
+EXIT_USAGE = 64
+
+
+async def async_run(args: argparse.Namespace, source: Iterable[str] | None, output: TextIO) -> int:
+    """Check every row of ``source`` and stream the results to ``output``.
+
+    With ``args.replay`` the requests are answered from a recorded archive; without
+    a ``source`` every file found in that archive is checked.
+    """
+    replay = ReplaySession(args.replay) if args.replay else None
+    if source is None:
+        if replay is None:
+            print("error: an input file is required without --replay", file=sys.stderr)
+            return EXIT_USAGE
+        await replay.async_load()
+        source = [",".join(reference) for reference in replay.references()]
+
+    try:
+        rows, row_errors = parse_batch_rows(source)
+    except ValueError as err:
+        print(f"error: {err}", file=sys.stderr)
+        return EXIT_USAGE
+    if not rows and not row_errors:
+        print("error: no rows to check", file=sys.stderr)
+        return EXIT_USAGE
+
+    states: Counter[str] = Counter()
+    for row_error in row_errors:
+        states["invalid"] += 1
+        _write(
+            output, {"line": row_error.line, "input": row_error.text, "state": "invalid", "message": row_error.error}
+        )
+
+    api_base_url = args.api_base_url or API_BASE_URL
+    # Replayed answers cost nothing, so they are not rate limited.
+    limiter = TokenBucketLimiter(args.requests_per_minute, args.burst) if replay is None else None
+    traffic = TrafficArchive(args.record) if args.record else None
+    async with create_session(limit_per_host=args.concurrency, timeout_seconds=args.timeout) as network:
+        session: Any = replay or network
+        # One catalog download serves every row.
+        catalog = MyBagStatusCatalog(
+            session, url=args.dynamic_messages_url or DYNAMIC_MESSAGES_URL, limiter=limiter, traffic=traffic
+        )
+        await catalog.async_ensure_loaded(PRIORITY_USER)
+        validators = ValidatorMemory()
+        breaker = CircuitBreaker(urlparse(api_base_url).netloc)
+
+        async def _async_check(row: BatchRow) -> BaggageStatus:
+            client = MyBagApiClient(
+                session,
+                row.airline,
+                row.reference_number,
+                row.family_name,
+                AIRLINE_URLS[row.airline],
+                catalog=catalog,
+                validators=validators,
+                breaker=breaker,
+                limiter=limiter,
+                api_base_url=api_base_url,
+                traffic=traffic,
+            )
+            return await client.async_check_status()
+
+        async for row, status in async_check_rows(rows, _async_check, args.concurrency):
+            states[status.state] += 1
+            _write(output, {"line": row.line, **status.as_dict()})
+        await catalog.async_close()
+    if traffic is not None:
+        await traffic.async_flush()
+
+    print(", ".join(f"{state}: {count}" for state, count in sorted(states.items())), file=sys.stderr)
+    if states["error"] or states["invalid"]:
+        return EXIT_FAILED
+    if states["not_found"]:
+        return EXIT_NOT_FOUND
+    return EXIT_OK
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the batch check; return the exit status."""
+    parser = argparse.ArgumentParser(prog="python -m tools.batch_check", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "input",
+        nargs="?",
+        help="CSV file with airline, reference number and family name, or - for stdin (optional with --replay)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_MAX_CONCURRENT_CHECKS, help="checks at the same time"
+    )
+    parser.add_argument(
+        "--requests-per-minute", type=float, default=DEFAULT_REQUESTS_PER_MINUTE, help="request budget"
+    )
+    parser.add_argument("--burst", type=int, default=DEFAULT_REQUEST_BURST, help="requests allowed in a burst")
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS, help="per-request timeout in seconds"
+    )
+    parser.add_argument("--api-base-url", help="alternative manageLogin host, e.g. a local stand-in")
+    parser.add_argument("--dynamic-messages-url", help="alternative dynamic-messages catalog URL")
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument("--record", type=Path, metavar="DIR", help="write every exchange to a traffic archive")
+    traffic.add_argument("--replay", type=Path, metavar="DIR", help="answer requests from a traffic archive")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.input is None:
+            return asyncio.run(async_run(args, None, sys.stdout))
+        if args.input == "-":
+            return asyncio.run(async_run(args, sys.stdin, sys.stdout))
+        with ExitStack() as stack:
+            try:
+                source = stack.enter_context(open(args.input, encoding="utf-8-sig", newline=""))
+            except OSError as err:
+                print(f"error: {err}", file=sys.stderr)
+                return EXIT_USAGE
+            return asyncio.run(async_run(args, source, sys.stdout))
+    except KeyboardInterrupt:
+        return EXIT_FAILED
+
+
+def _write(output: TextIO, result: dict[str, Any]) -> None:
+    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    output.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())